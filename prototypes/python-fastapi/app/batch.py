@@ -0,0 +1,93 @@
+"""Parsing and validation of batch insight imports."""
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic import ValidationError
+
+from app.schemas import InsightCreate
+
+# Largest batch accepted in one request
+BATCH_MAX_ITEMS = 5000
+NDJSON_MEDIA_TYPES = frozenset(
+    {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+)
+INVALID_JSON = "Invalid JSON"
+
+# Placeholder for an NDJSON line that failed to parse
+_INVALID_LINE = object()
+
+
+class BatchBodyError(ValueError):
+    """Raised when a batch body is neither a JSON array nor NDJSON."""
+
+
+class BatchTooLargeError(BatchBodyError):
+    """Raised when a batch has more than BATCH_MAX_ITEMS items."""
+
+
+@dataclass
+class BatchItem:
+    """One entry of a batch, validated or with the reasons it was rejected."""
+
+    index: int
+    data: InsightCreate | None = None
+    errors: list[str] = field(default_factory=list)
+
+
+def is_ndjson(content_type: str) -> bool:
+    """True if the Content-Type names a newline-delimited JSON format."""
+    return content_type.split(";", 1)[0].strip().lower() in NDJSON_MEDIA_TYPES
+
+
+def _format_error(error: dict[str, Any]) -> str:
+    location = ".".join(str(part) for part in error["loc"])
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
+def _validate(index: int, raw: Any) -> BatchItem:
+    try:
+        return BatchItem(index=index, data=InsightCreate.model_validate(raw))
+    except ValidationError as exc:
+        return BatchItem(index=index, errors=[_format_error(e) for e in exc.errors()])
+
+
+def parse_batch(body: bytes, ndjson: bool) -> list[BatchItem]:
+    """Split a request body into items and validate each with InsightCreate.
+
+    A JSON body must be an array. In NDJSON each non-blank line is one item,
+    and a line that is not valid JSON only rejects that item.
+
+    Raises:
+        BatchBodyError: If the body cannot be split into items.
+        BatchTooLargeError: If it has more than BATCH_MAX_ITEMS items.
+    """
+    try:
+        text = body.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        raise BatchBodyError("Body is not valid UTF-8") from exc
+
+    if ndjson:
+        lines = [line for line in text.splitlines() if line.strip()]
+        raws: list[Any] = []
+        for line in lines:
+            try:
+                raws.append(json.loads(line))
+            except json.JSONDecodeError:
+                raws.append(_INVALID_LINE)
+    else:
+        try:
+            raws = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise BatchBodyError(INVALID_JSON) from exc
+        if not isinstance(raws, list):
+            raise BatchBodyError("Expected a JSON array of insights")
+
+    if len(raws) > BATCH_MAX_ITEMS:
+        raise BatchTooLargeError(f"Batch exceeds {BATCH_MAX_ITEMS} items")
+    return [
+        BatchItem(index=index, errors=[INVALID_JSON])
+        if raw is _INVALID_LINE
+        else _validate(index, raw)
+        for index, raw in enumerate(raws)
+    ]
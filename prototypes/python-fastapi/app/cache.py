@@ -0,0 +1,181 @@
+"""In-process caching primitives."""
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from app.metrics import Sample, registry
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters for a cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+    # Total sizeof() of the entries; 0 for caches without a sizeof
+    bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe LRU cache whose entries also expire after a TTL.
+
+    Entries are evicted least-recently-used first once ``maxsize`` is
+    reached, or once the entries' total ``sizeof`` exceeds ``maxbytes``
+    when both are given. Each entry expires ``ttl`` seconds after it was
+    stored unless a shorter per-entry ttl is passed to set(). Caches
+    created with a ``name`` are exported as metrics labelled with that name.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+        name: str | None = None,
+        sizeof: Callable[[V], int] | None = None,
+        maxbytes: int | None = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self._clock = clock
+        self._sizeof = sizeof
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._bytes = 0
+        if name is not None:
+            named_caches[name] = self
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                self._remove(key)
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store a value, optionally with a ttl shorter than the default."""
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        if lifetime <= 0 or self.maxsize <= 0:
+            return
+        size = self._sizeof(value) if self._sizeof else 0
+        if self.maxbytes is not None and size > self.maxbytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (self._clock() + lifetime, value)
+            self._bytes += size
+            while len(self._entries) > self.maxsize or (
+                self.maxbytes is not None and self._bytes > self.maxbytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key: K) -> None:
+        # Callers hold the lock
+        entry = self._entries.pop(key, None)
+        if entry is not None and self._sizeof:
+            self._bytes -= self._sizeof(entry[1])
+
+    def invalidate(self, key: K) -> None:
+        """Drop a single entry if present."""
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Drop every entry. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        """Return current hit/miss/eviction counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+                bytes=self._bytes,
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Caches exported through the metrics registry, by name
+named_caches: dict[str, TTLCache] = {}
+
+
+def _cache_samples(field_name: str) -> Callable[[], list[Sample]]:
+    def collect() -> list[Sample]:
+        return [
+            ({"cache": name}, getattr(cache.stats(), field_name))
+            for name, cache in sorted(named_caches.items())
+        ]
+
+    return collect
+
+
+registry.register_callback(
+    "insider_cache_hits_total",
+    "Cache lookups served from the cache.",
+    _cache_samples("hits"),
+    type_name="counter",
+)
+registry.register_callback(
+    "insider_cache_misses_total",
+    "Cache lookups that fell through to the source.",
+    _cache_samples("misses"),
+    type_name="counter",
+)
+registry.register_callback(
+    "insider_cache_evictions_total",
+    "Entries evicted to stay within the cache size limit.",
+    _cache_samples("evictions"),
+    type_name="counter",
+)
+registry.register_callback(
+    "insider_cache_entries",
+    "Entries currently held by the cache.",
+    _cache_samples("size"),
+)
+registry.register_callback(
+    "insider_cache_bytes",
+    "Size of the entries held by the cache, for caches that measure it.",
+    _cache_samples("bytes"),
+)
+registry.register_callback(
+    "insider_cache_hit_ratio",
+    "Fraction of cache lookups served from the cache since startup.",
+    _cache_samples("hit_ratio"),
+)
@@ -0,0 +1,106 @@
+"""HTTP conditional GET support: ETag and Last-Modified validators."""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from starlette import status
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+# Responses carry user data, and clients should revalidate before reuse
+CACHE_CONTROL = "private, no-cache"
+
+_CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+_WEAK_PREFIX = "W/"
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; they were stored as UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def is_conditional(headers: Headers) -> bool:
+    """True if the request carries If-None-Match or If-Modified-Since."""
+    return any(name in headers for name in _CONDITIONAL_HEADERS)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an If-None-Match header value."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix(_WEAK_PREFIX)
+    return any(
+        candidate.strip().removeprefix(_WEAK_PREFIX) == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def parse_http_date(value: str | None) -> datetime | None:
+    """Parse an HTTP date header, returning None if absent or malformed."""
+    if not value:
+        return None
+    try:
+        return _utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class Validators:
+    """ETag and Last-Modified of one representation."""
+
+    etag: str
+    last_modified: datetime | None = None
+
+    @classmethod
+    def for_insight(cls, updated_at: datetime) -> "Validators":
+        """Validators of a single insight, from its updated_at."""
+        updated_at = _utc(updated_at)
+        micros = int(updated_at.timestamp() * 1_000_000)
+        return cls(etag=f'"{micros:x}"', last_modified=updated_at)
+
+    @classmethod
+    def for_collection(
+        cls, version: int, modified_at: datetime | None
+    ) -> "Validators":
+        """Validators of an insight list, from the collection version.
+
+        The same version gives the same body for a given URL, and clients
+        only send an ETag back to the URL it came from, so the query string
+        need not be part of it.
+        """
+        return cls(
+            etag=f'"v{version}"',
+            last_modified=_utc(modified_at) if modified_at else None,
+        )
+
+    def headers(self) -> dict[str, str]:
+        """Response headers announcing these validators."""
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                self.last_modified, usegmt=True
+            )
+        return headers
+
+    def not_modified(self, request_headers: Headers) -> bool:
+        """True if the client's cached copy is still current.
+
+        If-None-Match takes precedence; If-Modified-Since is only used
+        without it, at the one-second resolution of HTTP dates.
+        """
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            return etag_matches(if_none_match, self.etag)
+        since = parse_http_date(request_headers.get("if-modified-since"))
+        if since is None or self.last_modified is None:
+            return False
+        return self.last_modified.replace(microsecond=0) <= since
+
+    def not_modified_response(self) -> Response:
+        """An empty 304 response carrying these validators."""
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers()
+        )
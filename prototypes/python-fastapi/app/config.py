@@ -0,0 +1,199 @@
+"""Application settings read from the environment."""
+import os
+from functools import lru_cache
+from typing import Literal
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy.engine import make_url
+
+# Async driver used when a URL names only the database backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    # psycopg 3 serves both the sync and async engines
+    "postgresql": "postgresql+psycopg",
+}
+
+# Sync driver used when a URL names only the database backend. SQLAlchemy
+# would pick psycopg2 for a bare postgresql:// URL, which is not installed.
+SYNC_DRIVERS = {
+    "postgresql": "postgresql+psycopg",
+}
+
+
+def _with_driver(url: str, drivers: dict[str, str]) -> str:
+    parsed = make_url(url)
+    driver = drivers.get(parsed.drivername)
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def async_url_for(url: str) -> str:
+    """Return ``url`` with the backend's async driver if it names none.
+
+    URLs with an explicit driver, such as ``postgresql+asyncpg``, are
+    returned unchanged.
+    """
+    return _with_driver(url, ASYNC_DRIVERS)
+
+
+def sync_url_for(url: str) -> str:
+    """Return ``url`` with the backend's sync driver if it names none.
+
+    Like async_url_for(), explicit drivers such as ``postgresql+psycopg2``
+    are kept.
+    """
+    return _with_driver(url, SYNC_DRIVERS)
+
+
+class DatabaseSettings(BaseSettings):
+    """Engine and SQLite tuning, from ``INSIDER_DB_*`` environment variables.
+
+    The defaults favour concurrent access: WAL lets readers run while a
+    write is in progress, synchronous=NORMAL drops the fsync on every
+    commit (WAL stays consistent; only the last commits before a power
+    loss can be lost), and busy_timeout makes a blocked writer wait for
+    the lock instead of failing at once.
+
+    cache_size_kib is per connection, not per process: each of the sync
+    and async engines (and their replicas) can hold pool_size +
+    max_overflow connections, so the defaults allow up to 30 page caches,
+    480 MiB. Pages read through mmap live in the shared OS page cache
+    instead, which is why the per-connection cache stays small.
+    """
+
+    model_config = SettingsConfigDict(env_prefix="INSIDER_DB_")
+
+    url: str = "sqlite:///./insider.db"
+    # Derived from url when unset
+    async_url: str | None = None
+    # Read replica for list and detail reads; unset sends everything to url
+    replica_url: str | None = None
+    replica_async_url: str | None = None
+
+    journal_mode: Literal["delete", "truncate", "persist", "memory", "wal"] = "wal"
+    synchronous: Literal["off", "normal", "full", "extra"] = "normal"
+    busy_timeout_ms: int = Field(default=5000, ge=0)
+    # Page cache per connection, in KiB
+    cache_size_kib: int = Field(default=16 * 1024, ge=0)
+    # Bytes of the database file read through mmap; 0 disables it
+    mmap_size: int = Field(default=256 * 1024 * 1024, ge=0)
+
+    pool_size: int = Field(default=5, ge=1)
+    max_overflow: int = Field(default=10, ge=0)
+    pool_timeout: float = Field(default=30.0, gt=0)
+    # Seconds after which a pooled connection is replaced; -1 never
+    pool_recycle: int = -1
+    # Test server connections on checkout; ignored for SQLite files
+    pool_pre_ping: bool = True
+
+    @property
+    def resolved_async_url(self) -> str:
+        """URL for the async engine, deriving it from url if unset."""
+        return self.async_url or async_url_for(self.url)
+
+    @property
+    def resolved_replica_async_url(self) -> str | None:
+        """URL for the async replica engine, if a replica is configured."""
+        if self.replica_async_url:
+            return self.replica_async_url
+        return async_url_for(self.replica_url) if self.replica_url else None
+
+    def pragmas(self) -> dict[str, str | int]:
+        """PRAGMA statements to run on every new SQLite connection."""
+        return {
+            "journal_mode": self.journal_mode,
+            "synchronous": self.synchronous,
+            "busy_timeout": self.busy_timeout_ms,
+            # A negative cache_size is a size in KiB rather than pages
+            "cache_size": -self.cache_size_kib,
+            "mmap_size": self.mmap_size,
+        }
+
+
+@lru_cache
+def get_database_settings() -> DatabaseSettings:
+    """Load database settings once per process."""
+    return DatabaseSettings()
+
+
+class LoggingSettings(BaseSettings):
+    """Request log sampling, from ``INSIDER_LOG_*`` environment variables.
+
+    Successful requests are logged one in ``sample_rate``; errors, non-2xx
+    responses and requests slower than ``slow_request_ms`` always are.
+    """
+
+    model_config = SettingsConfigDict(env_prefix="INSIDER_LOG_")
+
+    sample_rate: int = Field(default=1, ge=1)
+    # JSON object such as {"GET /api/v1/insights/{insight_id}": 100}
+    route_sample_rates: dict[str, int] = Field(default_factory=dict)
+    slow_request_ms: float = Field(default=1000.0, gt=0)
+
+
+@lru_cache
+def get_logging_settings() -> LoggingSettings:
+    """Load request logging settings once per process."""
+    return LoggingSettings()
+
+
+# Most SQL statements each insight route may run: the worst case of linking
+# products and tags, plus the user lookup of a cold user cache and the
+# author lookup of a rejected write. Reads include the validator lookup of
+# a conditional GET; writes include the collection version bump.
+ROUTE_QUERY_BUDGETS = {
+    "GET /api/v1/insights": 6,
+    "POST /api/v1/insights": 9,
+    "GET /api/v1/insights/{insight_id}": 5,
+    "PUT /api/v1/insights/{insight_id}": 11,
+    "DELETE /api/v1/insights/{insight_id}": 5,
+}
+
+
+class QueryBudgetSettings(BaseSettings):
+    """Per-request SQL budgets, from ``INSIDER_QUERY_BUDGET_*`` variables.
+
+    A debugging aid, off by default: every request counts its statements,
+    which costs a little on each query.
+    """
+
+    model_config = SettingsConfigDict(env_prefix="INSIDER_QUERY_BUDGET_")
+
+    enabled: bool = False
+    # Raise instead of logging a warning when a request goes over budget
+    strict: bool = False
+    # JSON object such as {"PUT /api/v1/insights/{insight_id}": 10}
+    routes: dict[str, int] = Field(default_factory=lambda: dict(ROUTE_QUERY_BUDGETS))
+    # Budget for routes not in ``routes``; unset leaves them unchecked
+    default: int | None = Field(default=None, ge=0)
+    # Identical SELECTs in one request reported as a possible N+1
+    repeat_threshold: int = Field(default=5, ge=2)
+
+
+@lru_cache
+def get_query_budget_settings() -> QueryBudgetSettings:
+    """Load query budget settings once per process."""
+    return QueryBudgetSettings()
+
+
+DEFAULT_BCRYPT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+
+class PasswordHashSettings(BaseSettings):
+    """Password hashing pool, from ``INSIDER_BCRYPT_*`` environment variables.
+
+    Each worker hashes on its own core while bcrypt releases the GIL, so
+    more workers than cores only lengthens every hash.
+    """
+
+    model_config = SettingsConfigDict(env_prefix="INSIDER_BCRYPT_")
+
+    max_workers: int = Field(default=DEFAULT_BCRYPT_MAX_WORKERS, ge=1)
+
+
+@lru_cache
+def get_password_hash_settings() -> PasswordHashSettings:
+    """Load password hashing settings once per process."""
+    return PasswordHashSettings()
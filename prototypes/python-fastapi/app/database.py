@@ -1,16 +1,163 @@
 """Database configuration and session management."""
-from collections.abc import Generator
+import time
+from collections.abc import AsyncGenerator, Generator
 
-from sqlalchemy import create_engine
+from fastapi import Depends
+from sqlalchemy import create_engine, event, inspect, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
-DATABASE_URL = "sqlite:///./insider.db"
+from app.config import DatabaseSettings, get_database_settings, sync_url_for
+from app.metrics import registry
+from app.routing import RoutingSession
+from app.search import install_search_index
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def engine_options(url: str, settings: DatabaseSettings) -> dict:
+    """Pool and driver arguments shared by the sync and async engines."""
+    options: dict = {}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        # In-memory databases live in one connection; they get no pool
+        if parsed.database in (None, "", ":memory:"):
+            return options
+    else:
+        # Server connections can be dropped while idle in the pool
+        options["pool_pre_ping"] = settings.pool_pre_ping
+    # SQLAlchemy picks QueuePool (AsyncAdaptedQueuePool when async) for
+    # file and server databases; these size it
+    options.update(
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.pool_timeout,
+        pool_recycle=settings.pool_recycle,
+    )
+    return options
+
+
+def install_sqlite_pragmas(engine: Engine, settings: DatabaseSettings) -> None:
+    """Apply the configured PRAGMAs to every new connection of ``engine``.
+
+    Pass ``AsyncEngine.sync_engine`` for async engines. Does nothing for
+    other dialects.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = settings.pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
+def create_database_engine(
+    settings: DatabaseSettings, url: str | None = None
+) -> Engine:
+    """Create a sync engine for ``url`` (the primary by default)."""
+    url = sync_url_for(url or settings.url)
+    engine = create_engine(url, **engine_options(url, settings))
+    install_sqlite_pragmas(engine, settings)
+    return engine
+
+
+def create_async_database_engine(
+    settings: DatabaseSettings, url: str | None = None
+) -> AsyncEngine:
+    """Create an async engine for ``url`` (the primary by default)."""
+    url = url or settings.resolved_async_url
+    async_engine = create_async_engine(url, **engine_options(url, settings))
+    install_sqlite_pragmas(async_engine.sync_engine, settings)
+    return async_engine
+
+
+settings = get_database_settings()
+DATABASE_URL = sync_url_for(settings.url)
+ASYNC_DATABASE_URL = settings.resolved_async_url
+
+engine = create_database_engine(settings)
+replica_engine = (
+    create_database_engine(settings, settings.replica_url)
+    if settings.replica_url
+    else None
+)
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    class_=RoutingSession,
+    replica_bind=replica_engine,
+)
+
+async_engine = create_async_database_engine(settings)
+async_replica_engine = (
+    create_async_database_engine(settings, settings.resolved_replica_async_url)
+    if settings.replica_url or settings.replica_async_url
+    else None
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+    replica_bind=async_replica_engine,
+)
 
 Base = declarative_base()
 
+# Statement verbs reported as-is; anything else is counted as OTHER
+QUERY_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"})
+_QUERY_START_TIMES = "query_start_times"
+
+db_queries_total = registry.counter(
+    "insider_db_queries_total",
+    "SQL statements executed, by operation.",
+    ("operation",),
+)
+db_query_duration_seconds = registry.histogram(
+    "insider_db_query_duration_seconds",
+    "SQL statement execution time in seconds, by operation.",
+    ("operation",),
+)
+
+
+def query_operation(statement: str) -> str:
+    """Return the leading SQL verb of a statement for metric labels."""
+    words = statement.split(None, 1)
+    verb = words[0].upper() if words else ""
+    return verb if verb in QUERY_OPERATIONS else "OTHER"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_QUERY_START_TIMES, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info[_QUERY_START_TIMES].pop()
+    operation = query_operation(statement)
+    db_queries_total.inc(operation=operation)
+    db_query_duration_seconds.observe(duration, operation=operation)
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_query_timer(exception_context) -> None:
+    conn = exception_context.connection
+    if conn is not None and conn.info.get(_QUERY_START_TIMES):
+        conn.info[_QUERY_START_TIMES].pop()
+
 
 def get_db() -> Generator[Session, None, None]:
     """Dependency that provides a database session."""
@@ -21,6 +168,46 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Dependency that provides the async session factory."""
+    return AsyncSessionLocal
+
+
+async def get_async_db(
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_async_session_factory
+    ),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that provides an async database session."""
+    async with session_factory() as db:
+        yield db
+
+
 def create_tables() -> None:
-    """Create all database tables."""
+    """Create all database tables and the insight search index."""
     Base.metadata.create_all(bind=engine)
+    # create_all() skips existing tables, so add the index to older databases
+    with engine.begin() as connection:
+        install_search_index(connection)
+
+
+def find_missing_indexes(bind: Engine | None = None) -> list[str]:
+    """Return names of declared indexes that are absent from the database.
+
+    create_all() skips tables that already exist, so databases created
+    before an index was declared never get it. Tables that do not exist yet
+    are ignored since create_all() will build them with their indexes.
+    """
+    inspector = inspect(bind or engine)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        missing.extend(
+            f"{table.name}.{index.name}"
+            for index in table.indexes
+            if index.name not in present
+        )
+    return missing
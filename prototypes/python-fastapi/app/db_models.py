@@ -2,17 +2,158 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, Text
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    event,
+    insert,
+    text,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
-from app.models import Insight, Role, Source, User
+from app.models import Insight, Product, Role, Source, Tag, User
+from app.search import drop_search_index, install_search_index
+
+
+# Junction tables. The primary key (insight_id, x_id) serves loading an
+# insight's links; the reverse composite index serves filtering insights by
+# product or tag without touching the insights table.
+insight_products = Table(
+    "insight_products",
+    Base.metadata,
+    Column(
+        "insight_id",
+        String(36),
+        ForeignKey("insights.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "product_id",
+        String(36),
+        ForeignKey("products.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Index("ix_insight_products_product_id_insight_id", "product_id", "insight_id"),
+)
+
+insight_tags = Table(
+    "insight_tags",
+    Base.metadata,
+    Column(
+        "insight_id",
+        String(36),
+        ForeignKey("insights.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "tag_id",
+        String(36),
+        ForeignKey("tags.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Index("ix_insight_tags_tag_id_insight_id", "tag_id", "insight_id"),
+)
+
+
+class ProductDB(Base):
+    """SQLAlchemy model for products table."""
+
+    __tablename__ = "products"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        default=lambda: datetime.now(timezone.utc)
+    )
+
+    def __init__(self, id: uuid.UUID, name: str, description: str | None = None):
+        self.id = str(id)
+        self.name = name
+        self.description = description
+
+    def to_domain(self) -> Product:
+        """Convert to domain model."""
+        return Product(
+            id=uuid.UUID(self.id),
+            name=self.name,
+            description=self.description,
+            created_at=self.created_at,
+        )
+
+
+class ProductInsightCountDB(Base):
+    """Number of insights linked to each product.
+
+    Maintained incrementally by the insight repository in the same
+    transaction as the link change, so listing products by insight count
+    never aggregates insight_products. app.maintenance rebuilds it.
+    """
+
+    __tablename__ = "product_insight_counts"
+    __table_args__ = (
+        Index(
+            "ix_product_insight_counts_insight_count",
+            text("insight_count DESC"),
+            "product_id",
+        ),
+    )
+
+    product_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    insight_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __init__(self, product_id: str, insight_count: int = 0):
+        self.product_id = product_id
+        self.insight_count = insight_count
+
+
+@event.listens_for(ProductDB, "after_insert")
+def _create_product_insight_count(mapper, connection, target: ProductDB) -> None:
+    """Start every new product with a zero count row."""
+    connection.execute(
+        insert(ProductInsightCountDB).values(product_id=target.id, insight_count=0)
+    )
+
+
+class TagDB(Base):
+    """SQLAlchemy model for tags table."""
+
+    __tablename__ = "tags"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    name: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        default=lambda: datetime.now(timezone.utc)
+    )
+
+    def __init__(self, id: uuid.UUID, name: str):
+        self.id = str(id)
+        self.name = name
+
+    def to_domain(self) -> Tag:
+        """Convert to domain model."""
+        return Tag(id=uuid.UUID(self.id), name=self.name, created_at=self.created_at)
 
 
 class InsightDB(Base):
     """SQLAlchemy model for insights table."""
 
     __tablename__ = "insights"
+    __table_args__ = (
+        Index("ix_insights_author_id", "author_id"),
+        Index("ix_insights_source", "source"),
+        # Serves ORDER BY created_at DESC, id for offset and keyset paging,
+        # and any created_at range filter via its leading column.
+        Index("ix_insights_created_at_id", text("created_at DESC"), "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     author_id: Mapped[str] = mapped_column(String(36), nullable=False)
@@ -26,6 +167,13 @@ class InsightDB(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+    # Loaded with one batched SELECT ... IN per page rather than per insight
+    products: Mapped[list[ProductDB]] = relationship(
+        secondary=insight_products, lazy="selectin", order_by=ProductDB.name
+    )
+    tags: Mapped[list[TagDB]] = relationship(
+        secondary=insight_tags, lazy="selectin", order_by=TagDB.name
+    )
 
     def __init__(
         self,
@@ -49,6 +197,8 @@ class InsightDB(Base):
             title=self.title,
             description=self.description,
             source=Source(self.source) if self.source else None,
+            products=[product.to_domain() for product in self.products],
+            tags=[tag.to_domain() for tag in self.tags],
             created_at=self.created_at,
             updated_at=self.updated_at,
         )
@@ -65,6 +215,54 @@ class InsightDB(Base):
         )
 
 
+class InsightCollectionVersionDB(Base):
+    """Version of the insight collection as a whole, for list ETags.
+
+    A single row that the insight repository bumps right after every
+    insight write commits, so list responses get their validators from
+    one primary key read instead of scanning insights. Unlike
+    max(updated_at) it also changes when an insight is deleted.
+    """
+
+    __tablename__ = "insight_collection_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    modified_at: Mapped[datetime] = mapped_column(
+        default=lambda: datetime.now(timezone.utc)
+    )
+
+
+# The single row of insight_collection_version
+COLLECTION_VERSION_ID = 1
+
+
+@event.listens_for(InsightCollectionVersionDB.__table__, "after_create")
+def _create_collection_version(target, connection, **kw) -> None:
+    """Start the collection at version 0."""
+    connection.execute(
+        insert(target).values(
+            id=COLLECTION_VERSION_ID,
+            version=0,
+            modified_at=datetime.now(timezone.utc),
+        )
+    )
+
+
+# The FTS5 search index lives outside the ORM metadata; build and drop it
+# together with the insights table.
+event.listen(
+    InsightDB.__table__,
+    "after_create",
+    lambda target, connection, **kw: install_search_index(connection),
+)
+event.listen(
+    InsightDB.__table__,
+    "before_drop",
+    lambda target, connection, **kw: drop_search_index(connection),
+)
+
+
 class UserDB(Base):
     """SQLAlchemy model for users table."""
 
@@ -1,38 +1,429 @@
 """Database repository for insights."""
+import functools
+import itertools
 import uuid
+from collections import Counter
+from collections.abc import AsyncIterator, Callable, Sequence
 from datetime import datetime, timezone
+from typing import TypeVar
 
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    and_,
+    column,
+    desc,
+    func,
+    insert,
+    literal_column,
+    or_,
+    delete,
+    event,
+    select,
+    table,
+    text,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, lazyload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.db_models import InsightDB
+from app.db_models import (
+    COLLECTION_VERSION_ID,
+    InsightCollectionVersionDB,
+    InsightDB,
+    ProductDB,
+    TagDB,
+    insight_products,
+    insight_tags,
+)
 from app.logging_config import get_logger
-from app.models import Insight
+from app.models import Insight, InsightFilters, InsightSearchHit, Source
+from app.pagination import TotalMode, insight_count_cache
+from app.product_repository import adjust_product_insight_counts
+from app.response_cache import mark_insights_changed
+from app.routing import replica_reads
+from app.search import (
+    DESCRIPTION_WEIGHT,
+    ELLIPSIS,
+    FTS_ROWID_TABLE,
+    FTS_TABLE,
+    HIGHLIGHT_END,
+    HIGHLIGHT_START,
+    SNIPPET_WORDS,
+    TITLE_WEIGHT,
+    highlight,
+    match_expression,
+    search_terms,
+    snippet,
+)
 
 logger = get_logger("app.repository.insight")
 
+T = TypeVar("T")
+
+# Rows per executemany statement in create_many
+BATCH_CHUNK_SIZE = 500
+# Rows fetched from the cursor at a time by stream_all
+EXPORT_BATCH_SIZE = 1000
+
+# An insight to create with the product ids and tag names to link it to
+NewInsight = tuple[Insight, Sequence[uuid.UUID], Sequence[str]]
+
+_fts = table(FTS_TABLE, column("rowid"))
+_fts_ref = literal_column(FTS_TABLE)
+_fts_rowids = table(FTS_ROWID_TABLE, column("rowid"), column("insight_id"))
+
+
+class UnknownProductError(ValueError):
+    """Raised when an insight is linked to product ids that do not exist."""
+
+    def __init__(self, product_ids: Sequence[str]):
+        super().__init__(f"Unknown product ids: {', '.join(product_ids)}")
+        self.product_ids = list(product_ids)
+
+
+class InsightNotOwnedError(PermissionError):
+    """Raised when a conditional write targets an insight by another author."""
+
+    def __init__(self, insight_id: uuid.UUID, author_id: uuid.UUID):
+        super().__init__(f"Insight {insight_id} is owned by {author_id}")
+        self.insight_id = insight_id
+        self.author_id = author_id
+
+
+def _filter_conditions(filters: InsightFilters | None) -> list:
+    """Translate filters into WHERE conditions on insights.
+
+    Product and tag filters are IN (subquery) semi-joins answered from the
+    junction tables' (product_id, insight_id) and (tag_id, insight_id)
+    indexes, so no join fans out the insight rows.
+    """
+    if filters is None:
+        return []
+    conditions = []
+    if filters.source is not None:
+        conditions.append(InsightDB.source == filters.source.value)
+    if filters.product_ids:
+        conditions.append(
+            InsightDB.id.in_(
+                select(insight_products.c.insight_id).where(
+                    insight_products.c.product_id.in_(
+                        [str(product_id) for product_id in filters.product_ids]
+                    )
+                )
+            )
+        )
+    if filters.tags:
+        conditions.append(
+            InsightDB.id.in_(
+                select(insight_tags.c.insight_id)
+                .join(TagDB, TagDB.id == insight_tags.c.tag_id)
+                .where(TagDB.name.in_(filters.tags))
+            )
+        )
+    return conditions
+
+
+def _product_ids(product_ids: Sequence[uuid.UUID]) -> list[str]:
+    return list(dict.fromkeys(str(product_id) for product_id in product_ids))
+
+
+# INSERT constructs that support ON CONFLICT DO NOTHING
+_DIALECT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _tag_names(names: Sequence[str]) -> list[str]:
+    return list(dict.fromkeys(n.strip().lower() for n in names if n.strip()))
+
+
+# Session.info key set when a transaction changes the insight collection
+_COLLECTION_CHANGED = "insight_collection_changed"
+
+
+def _mark_collection_changed(session: Session) -> None:
+    """Bump the collection version once the session's transaction commits.
+
+    The bump runs after the commit, in its own one-statement transaction,
+    so the single version row is locked only for that UPDATE rather than
+    for the whole write; concurrent writers no longer queue on it. Between
+    the commit and the bump, readers can still see the old version with
+    the new rows, and a process that dies in that window leaves the
+    version behind until the next write.
+    """
+    mark_insights_changed(session)
+    session.info[_COLLECTION_CHANGED] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_collection_version(session: Session) -> None:
+    if not session.info.pop(_COLLECTION_CHANGED, False):
+        return
+    try:
+        with session.get_bind().begin() as connection:
+            connection.execute(
+                update(InsightCollectionVersionDB)
+                .where(InsightCollectionVersionDB.id == COLLECTION_VERSION_ID)
+                .values(
+                    version=InsightCollectionVersionDB.version + 1,
+                    modified_at=datetime.now(timezone.utc),
+                )
+            )
+    except SQLAlchemyError:
+        # The write itself committed; only list validators lag behind
+        logger.exception("Could not bump the insight collection version")
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_collection_change(session: Session, previous_transaction) -> None:
+    session.info.pop(_COLLECTION_CHANGED, None)
+
+
+def _replica_read(method: Callable[..., T]) -> Callable[..., T]:
+    """Run a read-only repository method with replica_reads()."""
+
+    @functools.wraps(method)
+    def wrapper(self: "InsightDBRepository", *args, **kwargs) -> T:
+        with replica_reads(self._session):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
 
 class InsightDBRepository:
-    """Database repository for insights."""
+    """Database repository for insights.
+
+    List, search and detail reads may be served by a read replica when the
+    session is a RoutingSession; see app.routing.
+    """
 
     def __init__(self, session: Session):
         self._session = session
 
-    def get_all(self, limit: int = 20, offset: int = 0) -> tuple[list[Insight], int]:
-        """Get all insights with pagination."""
-        logger.debug("get_all: limit=%d offset=%d", limit, offset)
-        total = self._session.query(InsightDB).count()
+    @_replica_read
+    def get_all(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        after: tuple[datetime, uuid.UUID] | None = None,
+        total_mode: TotalMode = TotalMode.EXACT,
+        filters: InsightFilters | None = None,
+    ) -> tuple[list[Insight], int | None]:
+        """Get all insights with pagination.
+
+        Insights are ordered by (created_at DESC, id). When ``after`` is
+        given it is used as a keyset position and ``offset`` is ignored, so
+        deep pages cost the same as the first one. ``total_mode`` selects how
+        the total is computed; TotalMode.NONE returns None without counting.
+        Products and tags of the page are loaded in one batch each.
+        """
+        logger.debug(
+            "get_all: limit=%d offset=%d after=%s total_mode=%s filters=%s",
+            limit,
+            offset,
+            after,
+            total_mode.value,
+            filters,
+        )
+        total = self.count(total_mode, filters)
+
+        query = (
+            self._session.query(InsightDB)
+            .filter(*_filter_conditions(filters))
+            .order_by(desc(InsightDB.created_at), InsightDB.id)
+        )
+        if after is not None:
+            created_at, insight_id = after
+            query = query.filter(
+                or_(
+                    InsightDB.created_at < created_at,
+                    and_(
+                        InsightDB.created_at == created_at,
+                        InsightDB.id > str(insight_id),
+                    ),
+                )
+            )
+        else:
+            query = query.offset(offset)
+
+        db_insights = query.limit(limit).all()
+
+        return [i.to_domain() for i in db_insights], total
+
+    def count(
+        self,
+        mode: TotalMode = TotalMode.EXACT,
+        filters: InsightFilters | None = None,
+    ) -> int | None:
+        """Count insights using the requested strategy.
+
+        Cached and estimated counts only exist for the whole table, so a
+        filtered count is always exact.
+        """
+        if mode is TotalMode.NONE:
+            return None
+        if filters is not None and not filters.is_empty():
+            return self._exact_count(_filter_conditions(filters))
+        if mode is TotalMode.CACHED:
+            engine = self._session.get_bind()
+            cached = insight_count_cache.get(engine)
+            if cached is None:
+                cached = self._exact_count()
+                insight_count_cache.set(engine, cached)
+            return cached
+        if mode is TotalMode.ESTIMATE:
+            estimate = self._estimated_count()
+            if estimate is not None:
+                return estimate
+        return self._exact_count()
+
+    def _exact_count(self, conditions: Sequence = ()) -> int:
+        return self._session.scalar(
+            select(func.count()).select_from(InsightDB).where(*conditions)
+        )
+
+    def _estimated_count(self) -> int | None:
+        """Cheap row estimate from planner statistics, if the dialect has one.
+
+        SQLite answers max(rowid) from the b-tree edge; it overcounts after
+        deletes but never scans the table. The implicit rowid of insights
+        is not stable, VACUUM may renumber it, which only brings the
+        estimate closer to the true count. Nothing else relies on it.
+        """
+        dialect = self._session.get_bind().dialect.name
+        if dialect == "sqlite":
+            return self._session.scalar(
+                select(
+                    func.coalesce(func.max(literal_column("rowid")), 0)
+                ).select_from(InsightDB)
+            )
+        if dialect == "postgresql":
+            estimate = self._session.scalar(
+                text("SELECT reltuples::bigint FROM pg_class WHERE relname = :t"),
+                {"t": InsightDB.__tablename__},
+            )
+            if estimate is not None and estimate >= 0:
+                return estimate
+        return None
+
+    @_replica_read
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        with_total: bool = True,
+        filters: InsightFilters | None = None,
+    ) -> tuple[list[InsightSearchHit], int | None]:
+        """Full-text search over title and description, best match first.
 
+        Every word of ``query`` must match. On SQLite the FTS5 index ranks
+        results with bm25, weighting title matches above description
+        matches. Other dialects fall back to LIKE filtering by recency.
+        """
+        logger.debug(
+            "search: query=%r limit=%d offset=%d filters=%s",
+            query,
+            limit,
+            offset,
+            filters,
+        )
+        terms = search_terms(query)
+        if not terms:
+            return [], 0 if with_total else None
+        conditions = _filter_conditions(filters)
+        if self._session.get_bind().dialect.name != "sqlite":
+            return self._like_search(terms, conditions, limit, offset, with_total)
+
+        match = _fts_ref.op("MATCH")(match_expression(terms))
+        rank = func.bm25(_fts_ref, TITLE_WEIGHT, DESCRIPTION_WEIGHT).label("rank")
+        matches = _fts.join(
+            _fts_rowids, _fts_rowids.c.rowid == _fts.c.rowid
+        ).join(InsightDB, InsightDB.id == _fts_rowids.c.insight_id)
+        rows = self._session.execute(
+            select(
+                InsightDB,
+                rank,
+                func.highlight(_fts_ref, 0, HIGHLIGHT_START, HIGHLIGHT_END),
+                func.snippet(
+                    _fts_ref,
+                    1,
+                    HIGHLIGHT_START,
+                    HIGHLIGHT_END,
+                    ELLIPSIS,
+                    SNIPPET_WORDS,
+                ),
+            )
+            .select_from(matches)
+            .where(match, *conditions)
+            .order_by(rank, InsightDB.id)
+            .limit(limit)
+            .offset(offset)
+        ).all()
+        total = None
+        if with_total:
+            query_total = select(func.count()).where(match)
+            if conditions:
+                query_total = query_total.select_from(matches).where(*conditions)
+            else:
+                query_total = query_total.select_from(_fts)
+            total = self._session.scalar(query_total)
+
+        # bm25 is lower-is-better; negate it so higher scores rank first
+        hits = [
+            InsightSearchHit(
+                insight=db_insight.to_domain(),
+                score=-bm25,
+                title_highlight=title_highlight,
+                snippet=description_snippet,
+            )
+            for db_insight, bm25, title_highlight, description_snippet in rows
+        ]
+        return hits, total
+
+    def _like_search(
+        self,
+        terms: list[str],
+        conditions: list,
+        limit: int,
+        offset: int,
+        with_total: bool,
+    ) -> tuple[list[InsightSearchHit], int | None]:
+        condition = and_(
+            *(
+                or_(
+                    InsightDB.title.icontains(term, autoescape=True),
+                    InsightDB.description.icontains(term, autoescape=True),
+                )
+                for term in terms
+            ),
+            *conditions,
+        )
         db_insights = (
             self._session.query(InsightDB)
-            .order_by(desc(InsightDB.created_at))
+            .filter(condition)
+            .order_by(desc(InsightDB.created_at), InsightDB.id)
             .offset(offset)
             .limit(limit)
             .all()
         )
+        total = None
+        if with_total:
+            total = self._session.scalar(
+                select(func.count()).select_from(InsightDB).where(condition)
+            )
+        hits = [
+            InsightSearchHit(
+                insight=db_insight.to_domain(),
+                score=0.0,
+                title_highlight=highlight(db_insight.title, terms),
+                snippet=snippet(db_insight.description, terms),
+            )
+            for db_insight in db_insights
+        ]
+        return hits, total
 
-        return [i.to_domain() for i in db_insights], total
-
+    @_replica_read
     def get_by_id(self, insight_id: uuid.UUID) -> Insight | None:
         """Get an insight by ID."""
         logger.debug("get_by_id: insight_id=%s", insight_id)
@@ -47,51 +438,513 @@ class InsightDBRepository:
 
         return db_insight.to_domain()
 
-    def create(self, insight: Insight) -> Insight:
-        """Create a new insight."""
+    @_replica_read
+    def get_updated_at(self, insight_id: uuid.UUID) -> datetime | None:
+        """Get when an insight last changed, without loading it."""
+        return self._session.scalar(
+            select(InsightDB.updated_at).where(InsightDB.id == str(insight_id))
+        )
+
+    @_replica_read
+    def collection_version(self) -> tuple[int, datetime | None]:
+        """Get the insight collection version and when it last changed.
+
+        Returns (0, None) if the version row is missing.
+        """
+        row = self._session.execute(
+            select(
+                InsightCollectionVersionDB.version,
+                InsightCollectionVersionDB.modified_at,
+            ).where(InsightCollectionVersionDB.id == COLLECTION_VERSION_ID)
+        ).one_or_none()
+        return tuple(row) if row else (0, None)
+
+    def _products(self, product_ids: Sequence[uuid.UUID]) -> list[ProductDB]:
+        """Load products by id, raising UnknownProductError for any missing."""
+        ids = _product_ids(product_ids)
+        if not ids:
+            return []
+        products = self._session.scalars(
+            select(ProductDB).where(ProductDB.id.in_(ids))
+        ).all()
+        found = {product.id for product in products}
+        missing = [product_id for product_id in ids if product_id not in found]
+        if missing:
+            raise UnknownProductError(missing)
+        return list(products)
+
+    def _tags(self, names: Sequence[str]) -> list[TagDB]:
+        """Load tags by name, creating the ones that do not exist yet.
+
+        Missing tags are inserted with ON CONFLICT DO NOTHING, and any that
+        a concurrent request created first are read back, so creating the
+        same tag twice at once cannot fail on the unique name.
+        """
+        names = _tag_names(names)
+        if not names:
+            return []
+        tags = {
+            tag.name: tag
+            for tag in self._session.scalars(
+                select(TagDB).where(TagDB.name.in_(names))
+            )
+        }
+        missing = [name for name in names if name not in tags]
+        if missing:
+            dialect = self._session.get_bind().dialect.name
+            created = self._session.scalars(
+                _DIALECT_INSERTS[dialect](TagDB)
+                .on_conflict_do_nothing(index_elements=[TagDB.name])
+                .returning(TagDB),
+                [{"id": str(uuid.uuid4()), "name": name} for name in missing],
+            )
+            tags.update((tag.name, tag) for tag in created)
+        # Names another transaction created first were skipped by the insert
+        raced = [name for name in missing if name not in tags]
+        if raced:
+            tags.update(
+                (tag.name, tag)
+                for tag in self._session.scalars(
+                    select(TagDB).where(TagDB.name.in_(raced))
+                )
+            )
+        return [tags[name] for name in names]
+
+    def create(
+        self,
+        insight: Insight,
+        product_ids: Sequence[uuid.UUID] = (),
+        tags: Sequence[str] = (),
+    ) -> Insight:
+        """Create a new insight linked to products and tags.
+
+        Raises:
+            UnknownProductError: If a product id does not exist.
+        """
         logger.debug("create: insight_id=%s", insight.id)
         db_insight = InsightDB.from_domain(insight)
+        db_insight.products = self._products(product_ids)
+        db_insight.tags = self._tags(tags)
         self._session.add(db_insight)
+        adjust_product_insight_counts(
+            self._session, {product.id: 1 for product in db_insight.products}
+        )
+        _mark_collection_changed(self._session)
+        # Flushing fills in the column defaults; the commit would expire them
+        self._session.flush()
+        created = db_insight.to_domain()
         self._session.commit()
-        self._session.refresh(db_insight)
-        return db_insight.to_domain()
+        insight_count_cache.adjust(self._session.get_bind(), 1)
+        return created
 
-    def update(self, insight_id: uuid.UUID, **kwargs) -> Insight | None:
-        """Update an insight."""
-        logger.debug("update: insight_id=%s", insight_id)
-        db_insight = (
-            self._session.query(InsightDB)
-            .filter(InsightDB.id == str(insight_id))
-            .first()
+    def missing_product_ids(
+        self, product_ids: Sequence[uuid.UUID]
+    ) -> set[uuid.UUID]:
+        """Return the ids among ``product_ids`` that match no product."""
+        ids = _product_ids(product_ids)
+        if not ids:
+            return set()
+        found = set(
+            self._session.scalars(select(ProductDB.id).where(ProductDB.id.in_(ids)))
+        )
+        return {uuid.UUID(pid) for pid in ids if pid not in found}
+
+    def create_many(
+        self, items: Sequence[NewInsight], chunk_size: int = BATCH_CHUNK_SIZE
+    ) -> list[Insight]:
+        """Create many insights in one transaction.
+
+        Insights and their links are inserted with executemany,
+        ``chunk_size`` rows per statement, instead of an add, commit and
+        refresh per insight. Products and tags are resolved with one query
+        each for the whole batch.
+
+        Raises:
+            UnknownProductError: If any product id does not exist.
+        """
+        logger.debug("create_many: count=%d", len(items))
+        if not items:
+            return []
+        products = {
+            product.id: product
+            for product in self._products(
+                [pid for _, product_ids, _ in items for pid in product_ids]
+            )
+        }
+        tags = {
+            tag.name: tag
+            for tag in self._tags([name for _, _, names in items for name in names])
+        }
+        # New tags must exist before link rows reference them
+        self._session.flush()
+
+        insight_rows, product_rows, tag_rows = [], [], []
+        product_deltas: Counter[str] = Counter()
+        created = []
+        for insight, product_ids, tag_names in items:
+            linked_products = [products[pid] for pid in _product_ids(product_ids)]
+            linked_tags = [tags[name] for name in _tag_names(tag_names)]
+            insight_rows.append(
+                {
+                    "id": str(insight.id),
+                    "author_id": str(insight.author_id),
+                    "title": insight.title,
+                    "description": insight.description,
+                    "source": insight.source.value if insight.source else None,
+                    "created_at": insight.created_at,
+                    "updated_at": insight.updated_at,
+                }
+            )
+            product_rows.extend(
+                {"insight_id": str(insight.id), "product_id": product.id}
+                for product in linked_products
+            )
+            tag_rows.extend(
+                {"insight_id": str(insight.id), "tag_id": tag.id}
+                for tag in linked_tags
+            )
+            product_deltas.update(product.id for product in linked_products)
+            created.append(
+                insight.model_copy(
+                    update={
+                        "products": [p.to_domain() for p in linked_products],
+                        "tags": [t.to_domain() for t in linked_tags],
+                    }
+                )
+            )
+
+        for statement, rows in (
+            (insert(InsightDB), insight_rows),
+            (insert(insight_products), product_rows),
+            (insert(insight_tags), tag_rows),
+        ):
+            for chunk in itertools.batched(rows, chunk_size):
+                self._session.execute(statement, list(chunk))
+        adjust_product_insight_counts(self._session, product_deltas)
+        _mark_collection_changed(self._session)
+        self._session.commit()
+        insight_count_cache.adjust(self._session.get_bind(), len(items))
+        return created
+
+    def _ownership_failure(
+        self, insight_id: uuid.UUID, owner_id: uuid.UUID | None
+    ) -> None:
+        """Explain why a conditional write matched no row.
+
+        Returns if the insight does not exist.
+
+        Raises:
+            InsightNotOwnedError: If it exists but belongs to another author.
+        """
+        if owner_id is None:
+            return
+        author_id = self._session.scalar(
+            select(InsightDB.author_id).where(InsightDB.id == str(insight_id))
+        )
+        if author_id is not None:
+            raise InsightNotOwnedError(insight_id, uuid.UUID(author_id))
+
+    def _write_conditions(
+        self, insight_id: uuid.UUID, owner_id: uuid.UUID | None
+    ) -> list:
+        conditions = [InsightDB.id == str(insight_id)]
+        if owner_id is not None:
+            conditions.append(InsightDB.author_id == str(owner_id))
+        return conditions
+
+    def update(
+        self,
+        insight_id: uuid.UUID,
+        owner_id: uuid.UUID | None = None,
+        **kwargs,
+    ) -> Insight | None:
+        """Update an insight.
+
+        The row is changed with a single UPDATE ... RETURNING, and only if
+        it was written by ``owner_id`` when one is given, so callers need
+        no prior lookup. The author is only read back when nothing matched,
+        to tell a missing insight from one owned by someone else.
+
+        ``product_ids`` and ``tags``, when given, replace the insight's
+        current links. A replaced collection is never loaded: its link rows
+        are deleted and the new ones inserted, and the product ids the
+        delete returns give the insight count changes. A collection left
+        alone is loaded for the returned insight.
+
+        Returns None if the insight does not exist.
+
+        Raises:
+            InsightNotOwnedError: If ``owner_id`` is not the author.
+            UnknownProductError: If a product id does not exist.
+        """
+        logger.debug("update: insight_id=%s owner_id=%s", insight_id, owner_id)
+        product_ids = kwargs.pop("product_ids", None)
+        tags = kwargs.pop("tags", None)
+        values = {
+            key: value.value if isinstance(value, Source) else value
+            for key, value in kwargs.items()
+            if value is not None and key in InsightDB.__table__.c
+        }
+        values["updated_at"] = datetime.now(timezone.utc)
+        replaced = [
+            relationship
+            for relationship, given in (
+                (InsightDB.products, product_ids),
+                (InsightDB.tags, tags),
+            )
+            if given is not None
+        ]
+        db_insight = self._session.scalar(
+            update(InsightDB)
+            .where(*self._write_conditions(insight_id, owner_id))
+            .values(**values)
+            .returning(InsightDB)
+            .options(*(lazyload(relationship) for relationship in replaced))
+            .execution_options(populate_existing=True)
         )
 
         if not db_insight:
+            self._ownership_failure(insight_id, owner_id)
             return None
 
-        for key, value in kwargs.items():
-            if value is not None and hasattr(db_insight, key):
-                if key == "source":
-                    setattr(db_insight, key, value.value if value else None)
-                else:
-                    setattr(db_insight, key, value)
+        try:
+            if product_ids is not None:
+                self._replace_products(db_insight, self._products(product_ids))
+            if tags is not None:
+                self._replace_tags(db_insight, self._tags(tags))
+        except UnknownProductError:
+            self._session.rollback()
+            raise
 
-        db_insight.updated_at = datetime.now(timezone.utc)
+        _mark_collection_changed(self._session)
+        self._session.flush()
+        updated = db_insight.to_domain()
         self._session.commit()
-        self._session.refresh(db_insight)
-        return db_insight.to_domain()
+        return updated
 
-    def delete(self, insight_id: uuid.UUID) -> bool:
-        """Delete an insight. Returns True if deleted, False if not found."""
-        logger.debug("delete: insight_id=%s", insight_id)
-        db_insight = (
-            self._session.query(InsightDB)
-            .filter(InsightDB.id == str(insight_id))
-            .first()
+    def _replace_products(
+        self, db_insight: InsightDB, products: list[ProductDB]
+    ) -> None:
+        old_ids = set(
+            self._session.scalars(
+                delete(insight_products)
+                .where(insight_products.c.insight_id == db_insight.id)
+                .returning(insight_products.c.product_id)
+            )
+        )
+        if products:
+            self._session.execute(
+                insert(insight_products),
+                [
+                    {"insight_id": db_insight.id, "product_id": product.id}
+                    for product in products
+                ],
+            )
+        new_ids = {product.id for product in products}
+        adjust_product_insight_counts(
+            self._session,
+            {
+                **{product_id: -1 for product_id in old_ids - new_ids},
+                **{product_id: 1 for product_id in new_ids - old_ids},
+            },
+        )
+        set_committed_value(
+            db_insight, "products", sorted(products, key=lambda p: p.name)
         )
 
-        if not db_insight:
+    def _replace_tags(self, db_insight: InsightDB, tags: list[TagDB]) -> None:
+        self._session.execute(
+            delete(insight_tags).where(insight_tags.c.insight_id == db_insight.id)
+        )
+        if tags:
+            self._session.execute(
+                insert(insight_tags),
+                [{"insight_id": db_insight.id, "tag_id": tag.id} for tag in tags],
+            )
+        set_committed_value(db_insight, "tags", sorted(tags, key=lambda t: t.name))
+
+    def delete(
+        self, insight_id: uuid.UUID, owner_id: uuid.UUID | None = None
+    ) -> bool:
+        """Delete an insight. Returns True if deleted, False if not found.
+
+        Like update(), the delete only matches if ``owner_id`` (when given)
+        is the author, and the insight is never loaded. Link rows are
+        deleted first under the same condition, returning the product ids
+        whose insight counts drop.
+
+        Raises:
+            InsightNotOwnedError: If ``owner_id`` is not the author.
+        """
+        logger.debug("delete: insight_id=%s owner_id=%s", insight_id, owner_id)
+        conditions = self._write_conditions(insight_id, owner_id)
+        target = select(InsightDB.id).where(*conditions)
+        product_ids = self._session.scalars(
+            delete(insight_products)
+            .where(insight_products.c.insight_id.in_(target))
+            .returning(insight_products.c.product_id)
+        ).all()
+        self._session.execute(
+            delete(insight_tags).where(insight_tags.c.insight_id.in_(target))
+        )
+        deleted = self._session.scalar(
+            delete(InsightDB)
+            .where(*conditions)
+            .returning(InsightDB.id)
+            .execution_options(synchronize_session=False)
+        )
+
+        if deleted is None:
+            self._session.rollback()
+            self._ownership_failure(insight_id, owner_id)
             return False
 
-        self._session.delete(db_insight)
+        adjust_product_insight_counts(
+            self._session, {product_id: -1 for product_id in product_ids}
+        )
+        _mark_collection_changed(self._session)
         self._session.commit()
+        insight_count_cache.adjust(self._session.get_bind(), -1)
         return True
+
+
+class AsyncInsightDBRepository:
+    """Async database repository for insights.
+
+    Each call runs the synchronous repository through AsyncSession.run_sync,
+    so queries go through the async driver without blocking the event loop
+    and both repositories share one implementation.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def _run(self, fn: Callable[[InsightDBRepository], T]) -> T:
+        return await self._session.run_sync(
+            lambda session: fn(InsightDBRepository(session))
+        )
+
+    async def get_all(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        after: tuple[datetime, uuid.UUID] | None = None,
+        total_mode: TotalMode = TotalMode.EXACT,
+        filters: InsightFilters | None = None,
+    ) -> tuple[list[Insight], int | None]:
+        """Get all insights with pagination."""
+        return await self._run(
+            lambda repo: repo.get_all(
+                limit=limit,
+                offset=offset,
+                after=after,
+                total_mode=total_mode,
+                filters=filters,
+            )
+        )
+
+    async def stream_all(
+        self,
+        filters: InsightFilters | None = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> AsyncIterator[list[Insight]]:
+        """Yield every matching insight in batches of ``batch_size``.
+
+        Rows come from a server-side cursor with yield_per, in the same
+        (created_at DESC, id) order as get_all, and each batch is expunged
+        once converted, so memory stays flat however many rows there are.
+        Products and tags are loaded once per batch.
+        """
+        logger.debug("stream_all: batch_size=%d filters=%s", batch_size, filters)
+        result = await self._session.stream_scalars(
+            select(InsightDB)
+            .where(*_filter_conditions(filters))
+            .order_by(desc(InsightDB.created_at), InsightDB.id)
+            .execution_options(yield_per=batch_size)
+        )
+        try:
+            async for partition in result.partitions():
+                yield [db_insight.to_domain() for db_insight in partition]
+                for db_insight in partition:
+                    self._session.expunge(db_insight)
+        finally:
+            await result.close()
+
+    async def count(
+        self,
+        mode: TotalMode = TotalMode.EXACT,
+        filters: InsightFilters | None = None,
+    ) -> int | None:
+        """Count insights using the requested strategy."""
+        return await self._run(lambda repo: repo.count(mode, filters))
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        with_total: bool = True,
+        filters: InsightFilters | None = None,
+    ) -> tuple[list[InsightSearchHit], int | None]:
+        """Full-text search over title and description, best match first."""
+        return await self._run(
+            lambda repo: repo.search(
+                query,
+                limit=limit,
+                offset=offset,
+                with_total=with_total,
+                filters=filters,
+            )
+        )
+
+    async def get_by_id(self, insight_id: uuid.UUID) -> Insight | None:
+        """Get an insight by ID."""
+        return await self._run(lambda repo: repo.get_by_id(insight_id))
+
+    async def get_updated_at(self, insight_id: uuid.UUID) -> datetime | None:
+        """Get when an insight last changed, without loading it."""
+        return await self._run(lambda repo: repo.get_updated_at(insight_id))
+
+    async def collection_version(self) -> tuple[int, datetime | None]:
+        """Get the insight collection version and when it last changed."""
+        return await self._run(lambda repo: repo.collection_version())
+
+    async def create(
+        self,
+        insight: Insight,
+        product_ids: Sequence[uuid.UUID] = (),
+        tags: Sequence[str] = (),
+    ) -> Insight:
+        """Create a new insight linked to products and tags."""
+        return await self._run(
+            lambda repo: repo.create(insight, product_ids=product_ids, tags=tags)
+        )
+
+    async def missing_product_ids(
+        self, product_ids: Sequence[uuid.UUID]
+    ) -> set[uuid.UUID]:
+        """Return the ids among ``product_ids`` that match no product."""
+        return await self._run(lambda repo: repo.missing_product_ids(product_ids))
+
+    async def create_many(
+        self, items: Sequence[NewInsight], chunk_size: int = BATCH_CHUNK_SIZE
+    ) -> list[Insight]:
+        """Create many insights in one transaction."""
+        return await self._run(lambda repo: repo.create_many(items, chunk_size))
+
+    async def update(
+        self,
+        insight_id: uuid.UUID,
+        owner_id: uuid.UUID | None = None,
+        **kwargs,
+    ) -> Insight | None:
+        """Update an insight, optionally only if ``owner_id`` is the author."""
+        return await self._run(
+            lambda repo: repo.update(insight_id, owner_id, **kwargs)
+        )
+
+    async def delete(
+        self, insight_id: uuid.UUID, owner_id: uuid.UUID | None = None
+    ) -> bool:
+        """Delete an insight. Returns True if deleted, False if not found."""
+        return await self._run(lambda repo: repo.delete(insight_id, owner_id))
@@ -2,13 +2,13 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app.logging_config import get_logger
 from app.models import User
 from app.security import decode_token
-from app.user_repository import UserDBRepository
+from app.user_repository import AsyncUserDBRepository, user_cache
 
 logger = get_logger("app.security")
 
@@ -18,9 +18,9 @@ security = HTTPBearer()
 CREDENTIALS_EXCEPTION_DETAIL = "Could not validate credentials"
 
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> User:
     """Dependency that returns the current authenticated user."""
     credentials_exception = HTTPException(
@@ -39,10 +39,15 @@ def get_current_user(
         logger.warning("Invalid or expired JWT token")
         raise credentials_exception
 
-    user_repo = UserDBRepository(db)
-    user = user_repo.get_by_email(email)
+    user = user_cache.get(email)
+    if user is not None:
+        return user
+
+    user_repo = AsyncUserDBRepository(db)
+    user = await user_repo.get_by_email(email)
     if user is None:
         logger.warning("User not found for email in JWT: %s", email)
         raise credentials_exception
 
+    user_cache.set(email, user)
     return user
@@ -0,0 +1,83 @@
+"""Serialisation of insights for bulk export."""
+import csv
+import io
+from collections.abc import AsyncIterator, Sequence
+from enum import Enum
+
+from app.models import Insight
+from app.schemas import InsightResponse
+
+
+class ExportFormat(str, Enum):
+    """Formats supported by the insights export."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+CSV_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "source",
+    "products",
+    "tags",
+    "created_at",
+    "updated_at",
+)
+# Separator for the product and tag names in one CSV cell
+CSV_LIST_SEPARATOR = "; "
+# Leading characters a spreadsheet would evaluate as a formula
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value: str) -> str:
+    """Quote a cell a spreadsheet would otherwise run as a formula."""
+    return f"'{value}" if value.startswith(_FORMULA_PREFIXES) else value
+
+
+def _csv_row(insight: Insight) -> list[str]:
+    return [
+        str(insight.id),
+        _csv_cell(insight.title),
+        _csv_cell(insight.description),
+        insight.source.value if insight.source else "",
+        _csv_cell(CSV_LIST_SEPARATOR.join(p.name for p in insight.products)),
+        _csv_cell(CSV_LIST_SEPARATOR.join(t.name for t in insight.tags)),
+        insight.created_at.isoformat(),
+        insight.updated_at.isoformat(),
+    ]
+
+
+def _ndjson_line(insight: Insight) -> str:
+    """One insight as a JSON line, shaped like an insights list item."""
+    return InsightResponse(**insight.model_dump()).model_dump_json() + "\n"
+
+
+async def render_export(
+    batches: AsyncIterator[Sequence[Insight]], export_format: ExportFormat
+) -> AsyncIterator[str]:
+    """Render batches of insights as text chunks, one chunk per batch.
+
+    CSV output starts with a header row, so an empty export is still a
+    valid file.
+    """
+    if export_format is ExportFormat.NDJSON:
+        async for batch in batches:
+            yield "".join(_ndjson_line(insight) for insight in batch)
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    yield buffer.getvalue()
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(_csv_row(insight) for insight in batch)
+        yield buffer.getvalue()
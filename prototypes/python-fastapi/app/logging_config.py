@@ -1,10 +1,26 @@
 """Logging configuration with JSON formatting and correlation ID support."""
+import atexit
 import logging
+import queue
 import sys
+import threading
+from enum import Enum
+from logging.handlers import QueueHandler, QueueListener
 
 from pythonjsonlogger.json import JsonFormatter
 
 from app.correlation import get_correlation_id
+from app.metrics import registry
+
+# Maximum records waiting for the writer thread
+LOG_QUEUE_SIZE = 10_000
+
+
+class OverflowPolicy(str, Enum):
+    """What to do with a log record when the queue is full."""
+
+    DROP = "drop"
+    BLOCK = "block"
 
 
 class CorrelationIdFilter(logging.Filter):
@@ -16,6 +32,46 @@ class CorrelationIdFilter(logging.Filter):
         return True
 
 
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler for a bounded queue with an explicit overflow policy.
+
+    With OverflowPolicy.DROP a full queue discards the record and counts it
+    in ``dropped``, so logging never stalls the caller. OverflowPolicy.BLOCK
+    waits for space instead and never loses records.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        policy: OverflowPolicy = OverflowPolicy.DROP,
+    ):
+        super().__init__(log_queue)
+        self.policy = policy
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    @property
+    def dropped(self) -> int:
+        """Number of records discarded because the queue was full."""
+        with self._dropped_lock:
+            return self._dropped
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put a record on the queue according to the overflow policy."""
+        if self.policy is OverflowPolicy.BLOCK:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
+
+_queue_handler: BoundedQueueHandler | None = None
+_listener: QueueListener | None = None
+
+
 def create_json_formatter() -> JsonFormatter:
     """Create a JSON formatter with standard fields."""
     return JsonFormatter(
@@ -28,27 +84,69 @@ def create_json_formatter() -> JsonFormatter:
     )
 
 
-def setup_logging(debug: bool = False) -> None:
+def setup_logging(
+    debug: bool = False,
+    queue_size: int = LOG_QUEUE_SIZE,
+    overflow: OverflowPolicy = OverflowPolicy.DROP,
+) -> None:
     """Configure structured JSON logging for the application.
 
-    Sets up the 'app' logger hierarchy with JSON output to stdout.
+    Sets up the 'app' logger hierarchy with JSON output to stdout. Callers
+    only enqueue records; formatting and writing happen on a background
+    listener thread so slow stdout never adds request latency.
     Suppresses noisy third-party loggers.
     """
+    global _queue_handler, _listener
+
     app_logger = logging.getLogger("app")
     app_logger.setLevel(logging.DEBUG if debug else logging.INFO)
 
     # Only add handler if none exist (avoid duplicates on reload)
     if not app_logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(create_json_formatter())
-        handler.addFilter(CorrelationIdFilter())
-        app_logger.addHandler(handler)
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(create_json_formatter())
+
+        log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        _queue_handler = BoundedQueueHandler(log_queue, overflow)
+        # The filter must run on the caller's side where the context is set
+        _queue_handler.addFilter(CorrelationIdFilter())
+        app_logger.addHandler(_queue_handler)
+
+        _listener = QueueListener(log_queue, stream_handler)
+        _listener.start()
+        atexit.unregister(shutdown_logging)
+        atexit.register(shutdown_logging)
 
     # Suppress noisy third-party loggers
     for noisy_logger in ("uvicorn.access", "sqlalchemy.engine"):
         logging.getLogger(noisy_logger).setLevel(logging.WARNING)
 
 
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background writer."""
+    global _queue_handler, _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _queue_handler is not None:
+        logging.getLogger("app").removeHandler(_queue_handler)
+        _queue_handler = None
+
+
+def dropped_log_records() -> int:
+    """Number of records dropped because the log queue was full."""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+registry.register_callback(
+    "insider_log_records_dropped_total",
+    "Log records discarded because the log queue was full.",
+    lambda: [({}, dropped_log_records())],
+    type_name="counter",
+)
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a named logger."""
     return logging.getLogger(name)
@@ -2,21 +2,51 @@
 import uuid
 from contextlib import asynccontextmanager
 
-from fastapi import Depends, FastAPI, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.database import SessionLocal, create_tables, get_db
-from app.db_repository import InsightDBRepository
+from app.batch import BatchBodyError, BatchTooLargeError, is_ndjson, parse_batch
+from app.conditional import Validators, is_conditional
+from app.config import (
+    get_logging_settings,
+    get_password_hash_settings,
+    get_query_budget_settings,
+)
+from app.database import (
+    SessionLocal,
+    async_engine,
+    async_replica_engine,
+    create_tables,
+    find_missing_indexes,
+    get_async_db,
+    get_async_session_factory,
+)
+from app.db_repository import (
+    AsyncInsightDBRepository,
+    InsightNotOwnedError,
+    UnknownProductError,
+)
 from app.dependencies import get_current_user
-from app.logging_config import get_logger, setup_logging
-from app.middleware import LoggingMiddleware
-from app.models import Insight, User
-from app.routers import auth, users
+from app.export import MEDIA_TYPES, ExportFormat, render_export
+from app.logging_config import get_logger, setup_logging, shutdown_logging
+from app.maintenance import rebuild_product_insight_counts
+from app.middleware import LoggingMiddleware, MetricsMiddleware
+from app.query_budget import QueryBudgetMiddleware
+from app.response_cache import insight_list_cache
+from app.models import Insight, InsightFilters, Source, User
+from app.pagination import TotalMode, decode_cursor, encode_cursor
+from app.routers import auth, metrics, products, users
+from app.security import password_hash_pool
 from app.seed import seed_users
 from app.schemas import (
+    BatchItemStatus,
+    InsightBatchItemResult,
+    InsightBatchResponse,
     InsightCreate,
     InsightListResponse,
     InsightResponse,
+    InsightSearchResult,
     InsightUpdate,
 )
 
@@ -25,6 +55,8 @@ logger = get_logger("app.main")
 # Error message constants
 INSIGHT_NOT_FOUND = "Insight not found"
 NOT_AUTHORIZED = "Not authorized to modify this insight"
+INVALID_CURSOR = "Invalid pagination cursor"
+CURSOR_WITH_SEARCH = "cursor cannot be combined with q; page search results with offset"
 
 
 @asynccontextmanager
@@ -32,12 +64,24 @@ async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown."""
     setup_logging()
     logger.info("Insider API starting up")
+    password_hash_pool.configure(get_password_hash_settings().max_workers)
     create_tables()
+    for index_name in find_missing_indexes():
+        logger.warning("Missing database index: %s", index_name)
     # Seed default users for development
     with SessionLocal() as session:
         seed_users(session)
+        # Products created before product_insight_counts existed have no row
+        backfilled = rebuild_product_insight_counts(session, missing_only=True)
+    if backfilled:
+        logger.info("Backfilled product insight counts: products=%d", backfilled)
     yield
+    await async_engine.dispose()
+    if async_replica_engine is not None:
+        await async_replica_engine.dispose()
+    password_hash_pool.shutdown()
     logger.info("Insider API shutting down")
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -47,32 +91,198 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-app.add_middleware(LoggingMiddleware)
+query_budget_settings = get_query_budget_settings()
+if query_budget_settings.enabled:
+    app.add_middleware(
+        QueryBudgetMiddleware,
+        route_budgets=query_budget_settings.routes,
+        default_budget=query_budget_settings.default,
+        repeat_threshold=query_budget_settings.repeat_threshold,
+        strict=query_budget_settings.strict,
+    )
+app.add_middleware(MetricsMiddleware)
+logging_settings = get_logging_settings()
+app.add_middleware(
+    LoggingMiddleware,
+    sample_rate=logging_settings.sample_rate,
+    route_sample_rates=logging_settings.route_sample_rates,
+    slow_request_ms=logging_settings.slow_request_ms,
+)
 
 # Include routers
 app.include_router(auth.router)
 app.include_router(users.router)
+app.include_router(products.router)
+app.include_router(metrics.router)
 
 
-def get_repository(db: Session = Depends(get_db)) -> InsightDBRepository:
+def get_repository(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncInsightDBRepository:
     """Dependency that provides an insight repository."""
-    return InsightDBRepository(db)
+    return AsyncInsightDBRepository(db)
+
+
+async def _search_insights(
+    repository: AsyncInsightDBRepository,
+    q: str,
+    limit: int,
+    offset: int,
+    include_total: bool,
+    filters: InsightFilters,
+) -> InsightListResponse:
+    hits, total = await repository.search(
+        q, limit=limit, offset=offset, with_total=include_total, filters=filters
+    )
+    return InsightListResponse(
+        items=[
+            InsightSearchResult(
+                **hit.insight.model_dump(),
+                score=hit.score,
+                title_highlight=hit.title_highlight,
+                snippet=hit.snippet,
+            )
+            for hit in hits
+        ],
+        total=total,
+        limit=limit,
+        offset=offset,
+    )
 
 
 @app.get("/api/v1/insights", response_model=InsightListResponse)
 async def list_insights(
+    request: Request,
+    response: Response,
     limit: int = 20,
     offset: int = 0,
+    cursor: str | None = None,
+    include_total: bool = True,
+    total_mode: TotalMode = TotalMode.EXACT,
+    q: str | None = None,
+    product_id: list[uuid.UUID] = Query(default=[]),
+    tag: list[str] = Query(default=[]),
+    source: Source | None = None,
     current_user: User = Depends(get_current_user),
-    repository: InsightDBRepository = Depends(get_repository),
+    repository: AsyncInsightDBRepository = Depends(get_repository),
 ):
-    """List all insights."""
-    insights, total = repository.get_all(limit=limit, offset=offset)
-    return InsightListResponse(
-        items=[InsightResponse(**i.model_dump()) for i in insights],
-        total=total,
-        limit=limit,
-        offset=offset,
+    """List all insights.
+
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page
+    by keyset instead of offset. ``total_mode`` trades accuracy of ``total``
+    for speed; ``include_total=false`` skips counting entirely. With ``q``
+    the results are ranked full-text matches with highlighted snippets.
+    ``product_id`` and ``tag`` may be repeated to match any of the values.
+
+    Responses carry an ETag from the collection version, and a request
+    whose If-None-Match still matches gets a 304 without any rows being
+    read. Pages (not search results) are cached as serialized JSON until
+    the next insight write commits.
+    """
+    filters = InsightFilters(
+        product_ids=tuple(product_id), tags=tuple(tag), source=source
+    )
+    if q is not None and cursor is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=CURSOR_WITH_SEARCH,
+        )
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=INVALID_CURSOR,
+            )
+        offset = 0
+
+    # Read before the rows, so a concurrent write can only leave the ETag
+    # (and the cache key) older than the body, which costs one refetch
+    version, modified_at = await repository.collection_version()
+    validators = Validators.for_collection(version, modified_at)
+    if validators.not_modified(request.headers):
+        return validators.not_modified_response()
+    response.headers.update(validators.headers())
+
+    if q is not None:
+        return await _search_insights(
+            repository,
+            q,
+            limit=limit,
+            offset=offset,
+            include_total=include_total,
+            filters=filters,
+        )
+
+    if not include_total:
+        total_mode = TotalMode.NONE
+
+    cache_key = (version, limit, offset, after, total_mode, filters)
+    body = insight_list_cache.get(cache_key)
+    if body is None:
+        insights, total = await repository.get_all(
+            limit=limit,
+            offset=offset,
+            after=after,
+            total_mode=total_mode,
+            filters=filters,
+        )
+
+        next_cursor = None
+        if insights and len(insights) == limit:
+            last = insights[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        body = InsightListResponse(
+            items=[InsightResponse(**i.model_dump()) for i in insights],
+            total=total,
+            limit=limit,
+            offset=offset,
+            next_cursor=next_cursor,
+        ).model_dump_json().encode()
+        insight_list_cache.set(cache_key, body)
+    return Response(
+        content=body, media_type="application/json", headers=validators.headers()
+    )
+
+
+@app.get("/api/v1/insights/export", response_class=StreamingResponse)
+async def export_insights(
+    format: ExportFormat = ExportFormat.NDJSON,
+    product_id: list[uuid.UUID] = Query(default=[]),
+    tag: list[str] = Query(default=[]),
+    source: Source | None = None,
+    current_user: User = Depends(get_current_user),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_async_session_factory
+    ),
+):
+    """Stream every insight as NDJSON or CSV.
+
+    Takes the same filters as the list endpoint. The export opens its own
+    session, held for as long as the response is streaming, and reads rows
+    from a server-side cursor in batches.
+    """
+    filters = InsightFilters(
+        product_ids=tuple(product_id), tags=tuple(tag), source=source
+    )
+    logger.info(
+        "Insight export started: format=%s user_id=%s", format.value, current_user.id
+    )
+
+    async def batches():
+        async with session_factory() as session:
+            async for batch in AsyncInsightDBRepository(session).stream_all(filters):
+                yield batch
+
+    return StreamingResponse(
+        render_export(batches(), format),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="insights.{format.value}"'
+        },
     )
 
 
@@ -84,7 +294,7 @@ async def list_insights(
 async def create_insight(
     insight_data: InsightCreate,
     current_user: User = Depends(get_current_user),
-    repository: InsightDBRepository = Depends(get_repository),
+    repository: AsyncInsightDBRepository = Depends(get_repository),
 ):
     """Create a new insight."""
     insight = Insight(
@@ -93,7 +303,17 @@ async def create_insight(
         source=insight_data.source,
         author_id=current_user.id,
     )
-    created = repository.create(insight)
+    try:
+        created = await repository.create(
+            insight,
+            product_ids=insight_data.product_ids or [],
+            tags=insight_data.tags or [],
+        )
+    except UnknownProductError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
     logger.info(
         "Insight created: insight_id=%s user_id=%s",
         created.id,
@@ -102,19 +322,115 @@ async def create_insight(
     return InsightResponse(**created.model_dump())
 
 
+@app.post("/api/v1/insights:batch", response_model=InsightBatchResponse)
+async def create_insights_batch(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    repository: AsyncInsightDBRepository = Depends(get_repository),
+):
+    """Create many insights from a JSON array or NDJSON body.
+
+    Each item is validated on its own; valid items are inserted in one
+    transaction and invalid ones are reported back by index.
+    """
+    ndjson = is_ndjson(request.headers.get("content-type", ""))
+    try:
+        items = parse_batch(await request.body(), ndjson)
+    except BatchTooLargeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=str(exc),
+        )
+    except BatchBodyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+
+    valid = [item for item in items if item.data is not None]
+    missing = await repository.missing_product_ids(
+        [pid for item in valid for pid in item.data.product_ids or []]
+    )
+    if missing:
+        for item in valid:
+            unknown = sorted(
+                str(pid) for pid in item.data.product_ids or [] if pid in missing
+            )
+            if unknown:
+                item.errors.append(f"Unknown product ids: {', '.join(unknown)}")
+        valid = [item for item in valid if not item.errors]
+
+    created = await repository.create_many(
+        [
+            (
+                Insight(
+                    title=item.data.title,
+                    description=item.data.description,
+                    source=item.data.source,
+                    author_id=current_user.id,
+                ),
+                item.data.product_ids or [],
+                item.data.tags or [],
+            )
+            for item in valid
+        ]
+    )
+    created_ids = {item.index: insight.id for item, insight in zip(valid, created)}
+    results = [
+        InsightBatchItemResult(
+            index=item.index,
+            status=BatchItemStatus.CREATED,
+            id=created_ids[item.index],
+        )
+        if item.index in created_ids
+        else InsightBatchItemResult(
+            index=item.index, status=BatchItemStatus.INVALID, errors=item.errors
+        )
+        for item in items
+    ]
+    logger.info(
+        "Insight batch imported: created=%d failed=%d user_id=%s",
+        len(created),
+        len(items) - len(created),
+        current_user.id,
+    )
+    return InsightBatchResponse(
+        created=len(created), failed=len(items) - len(created), items=results
+    )
+
+
 @app.get("/api/v1/insights/{insight_id}", response_model=InsightResponse)
 async def get_insight(
     insight_id: uuid.UUID,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    repository: InsightDBRepository = Depends(get_repository),
+    repository: AsyncInsightDBRepository = Depends(get_repository),
 ):
-    """Get an insight by ID."""
-    insight = repository.get_by_id(insight_id)
+    """Get an insight by ID.
+
+    Responses carry an ETag and Last-Modified from ``updated_at``. A
+    conditional request first reads only that column, and gets a 304
+    without loading the insight if the client's copy is current.
+    """
+    if is_conditional(request.headers):
+        updated_at = await repository.get_updated_at(insight_id)
+        if updated_at is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=INSIGHT_NOT_FOUND,
+            )
+        validators = Validators.for_insight(updated_at)
+        if validators.not_modified(request.headers):
+            return validators.not_modified_response()
+
+    insight = await repository.get_by_id(insight_id)
     if not insight:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=INSIGHT_NOT_FOUND,
         )
+    response.headers.update(Validators.for_insight(insight.updated_at).headers())
     return InsightResponse(**insight.model_dump())
 
 
@@ -123,31 +439,39 @@ async def update_insight(
     insight_id: uuid.UUID,
     insight_data: InsightUpdate,
     current_user: User = Depends(get_current_user),
-    repository: InsightDBRepository = Depends(get_repository),
+    repository: AsyncInsightDBRepository = Depends(get_repository),
 ):
-    """Update an insight."""
-    insight = repository.get_by_id(insight_id)
-    if not insight:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=INSIGHT_NOT_FOUND,
-        )
+    """Update an insight.
 
-    # Check if user is the author
-    if insight.author_id != current_user.id:
+    The ownership check is part of the UPDATE itself, so a successful
+    update is one statement.
+    """
+    update_data = insight_data.model_dump(exclude_unset=True)
+    try:
+        updated = await repository.update(
+            insight_id, owner_id=current_user.id, **update_data
+        )
+    except InsightNotOwnedError as exc:
         logger.warning(
             "Authorization denied: user_id=%s attempted to update insight_id=%s owned by %s",
             current_user.id,
             insight_id,
-            insight.author_id,
+            exc.author_id,
         )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=NOT_AUTHORIZED,
         )
-
-    update_data = insight_data.model_dump(exclude_unset=True)
-    updated = repository.update(insight_id, **update_data)
+    except UnknownProductError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+    if updated is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=INSIGHT_NOT_FOUND,
+        )
     logger.info(
         "Insight updated: insight_id=%s user_id=%s",
         insight_id,
@@ -163,30 +487,28 @@ async def update_insight(
 async def delete_insight(
     insight_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    repository: InsightDBRepository = Depends(get_repository),
+    repository: AsyncInsightDBRepository = Depends(get_repository),
 ):
-    """Delete an insight."""
-    insight = repository.get_by_id(insight_id)
-    if not insight:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=INSIGHT_NOT_FOUND,
-        )
-
-    # Check if user is the author
-    if insight.author_id != current_user.id:
+    """Delete an insight, checking ownership in the DELETE itself."""
+    try:
+        deleted = await repository.delete(insight_id, owner_id=current_user.id)
+    except InsightNotOwnedError as exc:
         logger.warning(
             "Authorization denied: user_id=%s attempted to delete insight_id=%s owned by %s",
             current_user.id,
             insight_id,
-            insight.author_id,
+            exc.author_id,
         )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=NOT_AUTHORIZED,
         )
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=INSIGHT_NOT_FOUND,
+        )
 
-    repository.delete(insight_id)
     logger.info(
         "Insight deleted: insight_id=%s user_id=%s",
         insight_id,
@@ -0,0 +1,80 @@
+"""Maintenance commands for derived data.
+
+Usage:
+    python -m app.maintenance rebuild-product-counts
+"""
+import argparse
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.db_models import ProductDB, ProductInsightCountDB, insight_products
+from app.logging_config import get_logger, setup_logging, shutdown_logging
+
+logger = get_logger("app.maintenance")
+
+
+def rebuild_product_insight_counts(session: Session, missing_only: bool = False) -> int:
+    """Recompute product_insight_counts from insight_products.
+
+    Rows that disagree with the junction table are corrected, missing rows
+    are created and rows for deleted products are removed. With
+    ``missing_only`` only products without a row are counted, which is
+    cheap enough to run at every startup. Returns the number of rows
+    changed.
+    """
+    counts = ProductInsightCountDB
+    existing = dict(
+        session.execute(select(counts.product_id, counts.insight_count)).all()
+    )
+    query = (
+        select(ProductDB.id, func.count(insight_products.c.insight_id))
+        .outerjoin(insight_products, insight_products.c.product_id == ProductDB.id)
+        .group_by(ProductDB.id)
+    )
+    if missing_only:
+        query = query.where(
+            ProductDB.id.not_in(select(ProductInsightCountDB.product_id))
+        )
+    expected = dict(session.execute(query).all())
+
+    changed = 0
+    for product_id, count in expected.items():
+        if product_id not in existing:
+            session.add(ProductInsightCountDB(product_id, count))
+            changed += 1
+        elif existing[product_id] != count:
+            session.get(ProductInsightCountDB, product_id).insight_count = count
+            changed += 1
+    if not missing_only:
+        orphaned = set(existing) - set(expected)
+        if orphaned:
+            session.execute(
+                delete(ProductInsightCountDB).where(
+                    ProductInsightCountDB.product_id.in_(orphaned)
+                )
+            )
+            changed += len(orphaned)
+    session.commit()
+    return changed
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run a maintenance command."""
+    parser = argparse.ArgumentParser(description="Insider maintenance commands")
+    parser.add_argument("command", choices=["rebuild-product-counts"])
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    try:
+        if args.command == "rebuild-product-counts":
+            with SessionLocal() as session:
+                changed = rebuild_product_insight_counts(session)
+            logger.info("Rebuilt product insight counts: rows_changed=%d", changed)
+    finally:
+        shutdown_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,186 @@
 """Request logging middleware with correlation ID support."""
+import itertools
+import logging
 import time
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.correlation import generate_correlation_id, set_correlation_id
 from app.logging_config import get_logger
+from app.metrics import registry
 
 logger = get_logger("app.middleware")
 
 CORRELATION_ID_HEADER = "X-Correlation-ID"
+DEFAULT_SLOW_REQUEST_MS = 1000.0
+# Route label for requests no route matched, to bound label cardinality
+UNMATCHED_ROUTE = "<unmatched>"
 
+http_requests_total = registry.counter(
+    "insider_http_requests_total",
+    "HTTP requests by method, route template and status code.",
+    ("method", "route", "status"),
+)
+http_request_duration_seconds = registry.histogram(
+    "insider_http_request_duration_seconds",
+    "HTTP request latency in seconds by method and route template.",
+    ("method", "route"),
+)
+http_requests_in_flight = registry.gauge(
+    "insider_http_requests_in_flight",
+    "HTTP requests currently being served.",
+)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware that logs requests and manages correlation IDs."""
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """Process request with logging and correlation ID."""
-        correlation_id = request.headers.get(
-            CORRELATION_ID_HEADER, generate_correlation_id()
+@dataclass
+class _SampleRule:
+    """A 1-in-``rate`` sampling rule for the requests of one route."""
+
+    rate: int
+    counter: Iterator[int] = field(default_factory=itertools.count)
+
+    def sample(self) -> bool:
+        return self.rate <= 1 or next(self.counter) % self.rate == 0
+
+
+class LoggingMiddleware:
+    """Middleware that logs requests and manages correlation IDs.
+
+    Implemented as plain ASGI rather than BaseHTTPMiddleware, so it adds no
+    extra task or body stream per request and streaming responses pass
+    through untouched.
+
+    Successful requests can be sampled: ``sample_rate`` logs one in N
+    requests, and ``route_sample_rates`` overrides N per route template
+    such as ``"GET /api/v1/insights/{insight_id}"``. Requests that are not
+    sampled log nothing unless they return a non-2xx status, take at least
+    ``slow_request_ms`` or raise, which are always logged. The route is
+    only known once the request has been routed, so with sampling on the
+    decision is made at completion and "Request received" is not logged.
+    The correlation ID is handled the same way for every request.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: int = 1,
+        route_sample_rates: Mapping[str, int] | None = None,
+        slow_request_ms: float = DEFAULT_SLOW_REQUEST_MS,
+    ):
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+        self._default_rule = _SampleRule(sample_rate)
+        self._route_rules = {}
+        for route, rate in (route_sample_rates or {}).items():
+            method, path = route.split(" ", 1)
+            self._route_rules[f"{method.upper()} {path}"] = _SampleRule(rate)
+        self._log_all = sample_rate <= 1 and all(
+            rule.rate <= 1 for rule in self._route_rules.values()
         )
+
+    def _is_sampled(self, scope: Scope) -> bool:
+        route = getattr(scope.get("route"), "path", None)
+        rule = self._route_rules.get(f"{scope['method']} {route}")
+        return (rule or self._default_rule).sample()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process request with logging and correlation ID."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        correlation_id = Headers(scope=scope).get(CORRELATION_ID_HEADER)
+        if correlation_id is None:
+            correlation_id = generate_correlation_id()
         set_correlation_id(correlation_id)
 
-        logger.info(
-            "Request received: %s %s", request.method, request.url.path
-        )
+        method = scope["method"]
+        path = scope["path"]
+        if self._log_all:
+            logger.info("Request received: %s %s", method, path)
 
+        status_code = 500
+        failed = True
         start_time = time.monotonic()
-        response = await call_next(request)
-        duration_ms = round((time.monotonic() - start_time) * 1000, 2)
-
-        logger.info(
-            "Request completed: %s %s status=%d duration_ms=%.2f",
-            request.method,
-            request.url.path,
-            response.status_code,
-            duration_ms,
-        )
 
-        response.headers[CORRELATION_ID_HEADER] = correlation_id
-        return response
+        async def send_with_correlation_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[CORRELATION_ID_HEADER] = (
+                    correlation_id
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_correlation_id)
+            failed = False
+        finally:
+            duration_ms = round((time.monotonic() - start_time) * 1000, 2)
+            is_error = failed or status_code >= 500
+            is_slow = duration_ms >= self.slow_request_ms
+            if is_error:
+                level = logging.ERROR
+            elif is_slow:
+                level = logging.WARNING
+            else:
+                level = logging.INFO
+            if (
+                level > logging.INFO
+                or not 200 <= status_code < 300
+                or self._log_all
+                or self._is_sampled(scope)
+            ):
+                logger.log(
+                    level,
+                    "Request completed: %s %s status=%d duration_ms=%.2f",
+                    method,
+                    path,
+                    status_code,
+                    duration_ms,
+                )
+
+
+class MetricsMiddleware:
+    """ASGI middleware that records per-route request metrics.
+
+    Requests are labelled with the matched route template (for example
+    ``/api/v1/insights/{insight_id}``) rather than the raw path, so label
+    cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Time the request and count it by route and status."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_capturing_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_capturing_status)
+        finally:
+            duration = time.perf_counter() - start_time
+            http_requests_in_flight.dec()
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            http_requests_total.inc(
+                method=method, route=route, status=str(status_code)
+            )
+            http_request_duration_seconds.observe(
+                duration, method=method, route=route
+            )
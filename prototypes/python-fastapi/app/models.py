@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime, timezone
 from enum import Enum
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class Source(str, Enum):
@@ -23,6 +23,37 @@ class Role(str, Enum):
     PRODUCT_MANAGER = "product_manager"
 
 
+class Product(BaseModel):
+    """A product or feature that insights can be linked to."""
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4)
+    name: str
+    description: str | None = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @field_validator("name")
+    @classmethod
+    def name_not_empty(cls, v: str) -> str:
+        if not v or not v.strip():
+            raise ValueError("Name cannot be empty")
+        return v
+
+
+class Tag(BaseModel):
+    """A tag for organizing insights."""
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4)
+    name: str
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @field_validator("name")
+    @classmethod
+    def name_not_empty_and_lowercase(cls, v: str) -> str:
+        if not v or not v.strip():
+            raise ValueError("Name cannot be empty")
+        return v.lower()
+
+
 class Insight(BaseModel):
     """A product insight captured by a Developer Advocate."""
 
@@ -31,6 +62,8 @@ class Insight(BaseModel):
     title: str = Field(..., max_length=200)
     description: str
     source: Source | None = None
+    products: list[Product] = Field(default_factory=list)
+    tags: list[Tag] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -49,35 +82,37 @@ class Insight(BaseModel):
         return v
 
 
-class Product(BaseModel):
-    """A product or feature that insights can be linked to."""
+class InsightFilters(BaseModel):
+    """Criteria narrowing an insight listing or search.
 
-    id: uuid.UUID = Field(default_factory=uuid.uuid4)
-    name: str
-    description: str | None = None
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    An insight matches if it has the source (when given), is linked to any
+    of ``product_ids`` (when given) and carries any of ``tags`` (when
+    given).
+    """
 
-    @field_validator("name")
+    model_config = ConfigDict(frozen=True)
+
+    product_ids: tuple[uuid.UUID, ...] = ()
+    tags: tuple[str, ...] = ()
+    source: Source | None = None
+
+    @field_validator("tags")
     @classmethod
-    def name_not_empty(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError("Name cannot be empty")
-        return v
+    def tags_lowercase(cls, v: tuple[str, ...]) -> tuple[str, ...]:
+        return tuple(tag.strip().lower() for tag in v if tag.strip())
 
+    def is_empty(self) -> bool:
+        """True if no criteria are set."""
+        return not (self.product_ids or self.tags or self.source)
 
-class Tag(BaseModel):
-    """A tag for organizing insights."""
 
-    id: uuid.UUID = Field(default_factory=uuid.uuid4)
-    name: str
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+class InsightSearchHit(BaseModel):
+    """An insight matched by a full-text search."""
 
-    @field_validator("name")
-    @classmethod
-    def name_not_empty_and_lowercase(cls, v: str) -> str:
-        if not v or not v.strip():
-            raise ValueError("Name cannot be empty")
-        return v.lower()
+    insight: Insight
+    score: float
+    title_highlight: str
+    snippet: str
 
 
 class User(BaseModel):
@@ -0,0 +1,101 @@
+"""Pagination helpers for list endpoints."""
+import base64
+import binascii
+import json
+import threading
+import time
+import uuid
+import weakref
+from collections.abc import Callable
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy.engine import Engine
+
+# Seconds a cached row count is trusted before it is re-seeded
+ROW_COUNT_TTL = 30.0
+
+
+def encode_cursor(created_at: datetime, insight_id: uuid.UUID) -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor."""
+    payload = json.dumps(
+        [created_at.isoformat(), str(insight_id)], separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        created_at, insight_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(insight_id)
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+class TotalMode(str, Enum):
+    """How the ``total`` of a list response is computed."""
+
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
+
+class RowCountCache:
+    """Process-wide cache of table row counts, one value per engine.
+
+    Counts are seeded from an exact COUNT(*) on first use and then adjusted
+    by the repository on every create and delete, so subsequent reads are
+    free. Writes by other processes are not seen, so a count expires
+    ``ttl`` seconds after it was seeded and the next read re-seeds it.
+    Entries disappear with their engine.
+    """
+
+    def __init__(
+        self, ttl: float = ROW_COUNT_TTL, clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl = ttl
+        self._clock = clock
+        # engine -> (count, expires at)
+        self._counts: weakref.WeakKeyDictionary[Engine, tuple[int, float]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, engine: Engine) -> int | None:
+        """Return the cached count, or None if it is unseeded or expired."""
+        with self._lock:
+            entry = self._counts.get(engine)
+            if entry is None:
+                return None
+            count, expires_at = entry
+            if expires_at <= self._clock():
+                del self._counts[engine]
+                return None
+            return count
+
+    def set(self, engine: Engine, value: int) -> None:
+        """Seed or overwrite the cached count."""
+        with self._lock:
+            self._counts[engine] = (value, self._clock() + self.ttl)
+
+    def adjust(self, engine: Engine, delta: int) -> None:
+        """Apply a delta to the cached count if it has been seeded."""
+        with self._lock:
+            if engine in self._counts:
+                count, expires_at = self._counts[engine]
+                self._counts[engine] = (max(0, count + delta), expires_at)
+
+    def clear(self) -> None:
+        """Forget all cached counts."""
+        with self._lock:
+            self._counts.clear()
+
+
+insight_count_cache = RowCountCache()
@@ -0,0 +1,119 @@
+"""Database repository for products."""
+from collections.abc import Mapping
+from enum import Enum
+
+from sqlalchemy import case, desc, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db_models import ProductDB, ProductInsightCountDB
+from app.logging_config import get_logger
+from app.models import Product
+
+logger = get_logger("app.repository.product")
+
+
+class ProductSort(str, Enum):
+    """Orderings for the product list."""
+
+    NAME = "name"
+    INSIGHT_COUNT = "insight_count"
+
+
+class DuplicateProductError(ValueError):
+    """Raised when a product name is already taken."""
+
+
+def adjust_product_insight_counts(
+    session: Session, deltas: Mapping[str, int]
+) -> None:
+    """Apply per-product insight count changes in the current transaction.
+
+    Every product is updated with one statement, adding its own delta.
+    """
+    deltas = {product_id: delta for product_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    session.execute(
+        update(ProductInsightCountDB)
+        .where(ProductInsightCountDB.product_id.in_(deltas))
+        .values(
+            insight_count=ProductInsightCountDB.insight_count
+            + case(deltas, value=ProductInsightCountDB.product_id)
+        )
+    )
+
+
+class ProductDBRepository:
+    """Database repository for products."""
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    def get_all(
+        self, sort: ProductSort = ProductSort.NAME, search: str | None = None
+    ) -> list[tuple[Product, int]]:
+        """List products with their insight counts.
+
+        Counts come from product_insight_counts, so sorting by count reads
+        the precomputed column instead of grouping insight_products.
+        """
+        logger.debug("get_all: sort=%s search=%r", sort.value, search)
+        insight_count = func.coalesce(ProductInsightCountDB.insight_count, 0)
+        query = select(ProductDB, insight_count).outerjoin(
+            ProductInsightCountDB,
+            ProductInsightCountDB.product_id == ProductDB.id,
+        )
+        if search:
+            query = query.where(ProductDB.name.icontains(search, autoescape=True))
+        if sort is ProductSort.INSIGHT_COUNT:
+            query = query.order_by(desc(insight_count), ProductDB.name)
+        else:
+            query = query.order_by(ProductDB.name)
+        rows = self._session.execute(query).all()
+        return [(db_product.to_domain(), count) for db_product, count in rows]
+
+    def create(self, product: Product) -> Product:
+        """Create a new product.
+
+        Raises:
+            DuplicateProductError: If the name is already taken.
+        """
+        logger.debug("create: product_id=%s", product.id)
+        db_product = ProductDB(
+            id=product.id, name=product.name, description=product.description
+        )
+        self._session.add(db_product)
+        try:
+            self._session.commit()
+        except IntegrityError as exc:
+            self._session.rollback()
+            raise DuplicateProductError(product.name) from exc
+        self._session.refresh(db_product)
+        return db_product.to_domain()
+
+
+class AsyncProductDBRepository:
+    """Async database repository for products.
+
+    Runs ProductDBRepository through AsyncSession.run_sync, like
+    AsyncInsightDBRepository.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def get_all(
+        self, sort: ProductSort = ProductSort.NAME, search: str | None = None
+    ) -> list[tuple[Product, int]]:
+        """List products with their insight counts."""
+        return await self._session.run_sync(
+            lambda session: ProductDBRepository(session).get_all(sort, search)
+        )
+
+    async def create(self, product: Product) -> Product:
+        """Create a new product."""
+        return await self._session.run_sync(
+            lambda session: ProductDBRepository(session).create(product)
+        )
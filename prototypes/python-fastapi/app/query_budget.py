@@ -0,0 +1,155 @@
+"""Per-request SQL statement budgets and N+1 detection."""
+import re
+from collections import Counter
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.correlation import get_correlation_id
+from app.logging_config import get_logger
+from app.middleware import UNMATCHED_ROUTE
+
+logger = get_logger("app.query_budget")
+
+# Identical SELECTs in one request at which an N+1 pattern is reported
+DEFAULT_REPEAT_THRESHOLD = 5
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request or block runs more SQL statements than allowed."""
+
+
+@dataclass
+class QueryTracker:
+    """SQL statements executed while the tracker is active."""
+
+    correlation_id: str | None = None
+    statements: list[str] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def record(self, statement: str) -> None:
+        self.statements.append(_WHITESPACE.sub(" ", statement).strip())
+
+    def repeated_selects(self, threshold: int) -> dict[str, int]:
+        """SELECTs run at least ``threshold`` times, the sign of an N+1 loop.
+
+        Parameters are bound separately, so one query issued per row of an
+        earlier result shows up as the same statement text over and over.
+        """
+        counts = Counter(s for s in self.statements if s.startswith("SELECT"))
+        return {s: n for s, n in counts.items() if n >= threshold}
+
+
+# Every tracker active in this context; nested blocks all see a statement
+_trackers_var: ContextVar[tuple[QueryTracker, ...]] = ContextVar(
+    "query_trackers", default=()
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    for tracker in _trackers_var.get():
+        tracker.record(statement)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryTracker]:
+    """Count the SQL statements executed in this block on any engine.
+
+    The tracker lives in a context variable, so statements run from
+    threadpool dependencies and AsyncSession greenlets started inside the
+    block are counted too. Blocks can nest, such as a test's block around a
+    request the middleware also tracks.
+    """
+    tracker = QueryTracker(correlation_id=get_correlation_id())
+    token = _trackers_var.set((*_trackers_var.get(), tracker))
+    try:
+        yield tracker
+    finally:
+        _trackers_var.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryTracker]:
+    """Raise QueryBudgetExceeded if the block runs over ``limit`` statements."""
+    with track_queries() as tracker:
+        yield tracker
+    if tracker.count > limit:
+        raise QueryBudgetExceeded(_describe(tracker, limit))
+
+
+def _describe(tracker: QueryTracker, limit: int) -> str:
+    listing = "\n".join(f"  {s}" for s in tracker.statements)
+    return f"{tracker.count} SQL statements, budget {limit}:\n{listing}"
+
+
+class QueryBudgetMiddleware:
+    """ASGI middleware that counts SQL statements per request.
+
+    ``route_budgets`` maps keys such as
+    ``"PUT /api/v1/insights/{insight_id}"`` to the most statements that
+    route may run; ``default_budget`` applies to other routes, and None
+    leaves them unchecked. A checked request that goes over budget, or
+    repeats the same SELECT ``repeat_threshold`` times, is logged as a
+    warning with its correlation ID. With ``strict`` the request raises
+    QueryBudgetExceeded instead, which fails tests that drive the app
+    through an ASGI client.
+
+    Add it before LoggingMiddleware so it runs inside it and sees the
+    request's correlation ID.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        route_budgets: Mapping[str, int] | None = None,
+        default_budget: int | None = None,
+        repeat_threshold: int = DEFAULT_REPEAT_THRESHOLD,
+        strict: bool = False,
+    ):
+        self.app = app
+        self.route_budgets = dict(route_budgets or {})
+        self.default_budget = default_budget
+        self.repeat_threshold = repeat_threshold
+        self.strict = strict
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Run the request with a query tracker and check it afterwards."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as tracker:
+            await self.app(scope, receive, send)
+
+        route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+        key = f"{scope['method']} {route}"
+        budget = self.route_budgets.get(key, self.default_budget)
+        if budget is None:
+            return
+        problems = []
+        if tracker.count > budget:
+            problems.append(_describe(tracker, budget))
+        for statement, times in tracker.repeated_selects(
+            self.repeat_threshold
+        ).items():
+            problems.append(f"possible N+1, {times} times: {statement}")
+        for problem in problems:
+            logger.warning(
+                "Query budget exceeded: %s correlation_id=%s %s",
+                key,
+                tracker.correlation_id,
+                problem,
+            )
+        if problems and self.strict:
+            raise QueryBudgetExceeded(f"{key}: " + "\n".join(problems))
@@ -1,23 +1,118 @@
 """In-memory repository for storing data (will be replaced with DB later)."""
+import bisect
 import uuid
-from datetime import datetime, timezone
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
 
-from app.models import Insight
+from app.models import Insight, InsightFilters, InsightSearchHit, Tag
+from app.search import InvertedIndex, highlight, search_terms, snippet
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# (negated created_at in microseconds, id): ascending order of these keys is
+# created_at DESC, id ASC, the same order as the database repository.
+SortKey = tuple[int, uuid.UUID]
+
+
+def _sort_key(created_at: datetime, insight_id: uuid.UUID) -> SortKey:
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return -((created_at - _EPOCH) // _MICROSECOND), insight_id
 
 
 class InsightRepository:
-    """In-memory storage for insights."""
+    """In-memory storage for insights.
+
+    Insights are kept in a list of sort keys maintained with bisect on every
+    write, so a page read is a binary search plus a slice of ``limit`` keys
+    instead of sorting every insight.
+    """
 
     def __init__(self):
         self._insights: dict[uuid.UUID, Insight] = {}
+        self._order: list[SortKey] = []
+        self._index = InvertedIndex()
+        # Tags by name, shared between insights like the tags table
+        self._tags: dict[str, Tag] = {}
+
+    def get_all(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        after: tuple[datetime, uuid.UUID] | None = None,
+    ) -> tuple[list[Insight], int]:
+        """Get all insights with pagination.
+
+        Insights are ordered by (created_at DESC, id). When ``after`` is
+        given it is used as a keyset position and ``offset`` is ignored.
+        """
+        if after is not None:
+            offset = bisect.bisect_right(self._order, _sort_key(*after))
+        page = self._order[offset : offset + limit]
+        insights = [self._insights[insight_id] for _, insight_id in page]
+        return insights, len(self._order)
 
-    def get_all(self, limit: int = 20, offset: int = 0) -> tuple[list[Insight], int]:
-        """Get all insights with pagination."""
-        all_insights = list(self._insights.values())
-        # Sort by created_at descending (most recent first)
-        all_insights.sort(key=lambda x: x.created_at, reverse=True)
-        total = len(all_insights)
-        return all_insights[offset : offset + limit], total
+    def _insert(self, insight: Insight) -> None:
+        bisect.insort(self._order, _sort_key(insight.created_at, insight.id))
+
+    def _discard(self, insight: Insight) -> None:
+        key = _sort_key(insight.created_at, insight.id)
+        position = bisect.bisect_left(self._order, key)
+        if position < len(self._order) and self._order[position] == key:
+            del self._order[position]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        with_total: bool = True,
+        filters: InsightFilters | None = None,
+    ) -> tuple[list[InsightSearchHit], int | None]:
+        """Full-text search over title and description, best match first.
+
+        ``filters`` narrow the matches the same way as the database
+        repository, before ranking, so the total counts filtered matches.
+        """
+        terms = search_terms(query)
+        accept = None
+        if filters is not None and not filters.is_empty():
+            accept = self._filter_predicate(filters)
+        ranked, total = self._index.search(
+            terms, limit=limit, offset=offset, accept=accept
+        )
+        hits = []
+        for insight_id, score in ranked:
+            insight = self._insights[insight_id]
+            hits.append(
+                InsightSearchHit(
+                    insight=insight,
+                    score=score,
+                    title_highlight=highlight(insight.title, terms),
+                    snippet=snippet(insight.description, terms),
+                )
+            )
+        return hits, total if with_total else None
+
+    def _filter_predicate(
+        self, filters: InsightFilters
+    ) -> Callable[[uuid.UUID], bool]:
+        product_ids = set(filters.product_ids)
+        tags = set(filters.tags)
+
+        def accept(insight_id: uuid.UUID) -> bool:
+            insight = self._insights[insight_id]
+            if filters.source is not None and insight.source != filters.source:
+                return False
+            if product_ids and not any(
+                product.id in product_ids for product in insight.products
+            ):
+                return False
+            return not tags or any(tag.name in tags for tag in insight.tags)
+
+        return accept
 
     def get_by_id(self, insight_id: uuid.UUID) -> Insight | None:
         """Get an insight by ID."""
@@ -25,36 +120,66 @@ class InsightRepository:
 
     def create(self, insight: Insight) -> Insight:
         """Create a new insight."""
+        existing = self._insights.get(insight.id)
+        if existing is not None:
+            self._discard(existing)
         self._insights[insight.id] = insight
+        self._insert(insight)
+        for tag in insight.tags:
+            self._tags.setdefault(tag.name, tag)
+        self._index.add(insight.id, insight.title, insight.description)
         return insight
 
+    def _tags_named(self, names: list[str]) -> list[Tag]:
+        names = dict.fromkeys(n.strip().lower() for n in names if n.strip())
+        return [self._tags.setdefault(name, Tag(name=name)) for name in names]
+
     def update(self, insight_id: uuid.UUID, **kwargs) -> Insight | None:
-        """Update an insight."""
+        """Update an insight.
+
+        ``tags``, when given, replaces the insight's tags, reusing tags by
+        name. There is no product store here, so ``product_ids`` is
+        ignored.
+        """
         insight = self._insights.get(insight_id)
         if not insight:
             return None
 
+        kwargs.pop("product_ids", None)
+        tags = kwargs.pop("tags", None)
         # Update fields
         insight_dict = insight.model_dump()
+        if tags is not None:
+            insight_dict["tags"] = self._tags_named(tags)
         for key, value in kwargs.items():
             if value is not None:
                 insight_dict[key] = value
         insight_dict["updated_at"] = datetime.now(timezone.utc)
 
         updated_insight = Insight(**insight_dict)
+        if updated_insight.created_at != insight.created_at:
+            self._discard(insight)
+            self._insert(updated_insight)
         self._insights[insight_id] = updated_insight
+        self._index.add(
+            insight_id, updated_insight.title, updated_insight.description
+        )
         return updated_insight
 
     def delete(self, insight_id: uuid.UUID) -> bool:
         """Delete an insight. Returns True if deleted, False if not found."""
         if insight_id in self._insights:
-            del self._insights[insight_id]
+            self._discard(self._insights.pop(insight_id))
+            self._index.remove(insight_id)
             return True
         return False
 
     def clear(self):
         """Clear all insights (for testing)."""
         self._insights.clear()
+        self._order.clear()
+        self._index.clear()
+        self._tags.clear()
 
 
 # Global repository instance (will be replaced with DI later)
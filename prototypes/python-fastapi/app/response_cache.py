@@ -0,0 +1,42 @@
+"""Cache of serialized insight list responses."""
+from collections.abc import Hashable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.cache import TTLCache
+
+LIST_CACHE_MAXSIZE = 512
+LIST_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Writes clear the cache; the TTL only bounds how long unused pages linger
+LIST_CACHE_TTL = 300.0
+
+# Session.info key set when a transaction writes insights
+_INSIGHTS_CHANGED = "insights_changed"
+
+# JSON bodies of GET /api/v1/insights, keyed by the collection version and
+# the query. Keying on the version means an entry stored by a request that
+# raced a write can never be served once that write has bumped the version.
+insight_list_cache: TTLCache[Hashable, bytes] = TTLCache(
+    maxsize=LIST_CACHE_MAXSIZE,
+    ttl=LIST_CACHE_TTL,
+    name="insight_list",
+    sizeof=len,
+    maxbytes=LIST_CACHE_MAX_BYTES,
+)
+
+
+def mark_insights_changed(session: Session) -> None:
+    """Clear the list cache once the session's transaction commits."""
+    session.info[_INSIGHTS_CHANGED] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_on_commit(session: Session) -> None:
+    if session.info.pop(_INSIGHTS_CHANGED, False):
+        insight_list_cache.clear()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_on_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop(_INSIGHTS_CHANGED, None)
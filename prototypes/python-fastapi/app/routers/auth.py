@@ -1,12 +1,12 @@
 """Authentication endpoints."""
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, EmailStr
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app.logging_config import get_logger
-from app.security import create_access_token, verify_password
-from app.user_repository import UserDBRepository
+from app.security import create_access_token, verify_password_async
+from app.user_repository import AsyncUserDBRepository
 
 logger = get_logger("app.auth")
 
@@ -33,11 +33,13 @@ class TokenResponse(BaseModel):
 @router.post("/login", response_model=TokenResponse)
 async def login(
     request: LoginRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Authenticate user and return JWT token."""
-    user_repo = UserDBRepository(db)
-    user, hashed_password = user_repo.get_by_email_with_password(request.email)
+    user_repo = AsyncUserDBRepository(db)
+    user, hashed_password = await user_repo.get_by_email_with_password(
+        request.email
+    )
 
     if not user or not hashed_password:
         logger.warning("Login failed: email=%s", request.email)
@@ -47,7 +49,7 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if not verify_password(request.password, hashed_password):
+    if not await verify_password_async(request.password, hashed_password):
         logger.warning("Login failed: email=%s", request.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
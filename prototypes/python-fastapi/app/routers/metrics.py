@@ -0,0 +1,16 @@
+"""Metrics endpoint."""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.metrics import registry
+
+router = APIRouter(tags=["metrics"])
+
+# Prometheus text exposition format
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    """Expose in-process metrics for scraping."""
+    return PlainTextResponse(registry.render(), media_type=METRICS_CONTENT_TYPE)
@@ -0,0 +1,107 @@
+"""Product endpoints."""
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel, Field, field_validator
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.dependencies import get_current_user
+from app.logging_config import get_logger
+from app.models import Product, User
+from app.product_repository import (
+    AsyncProductDBRepository,
+    DuplicateProductError,
+    ProductSort,
+)
+
+logger = get_logger("app.products")
+
+router = APIRouter(prefix="/api/v1/products", tags=["products"])
+
+# Error message constants
+PRODUCT_EXISTS = "Product with this name already exists"
+
+
+class ProductCreate(BaseModel):
+    """Product creation schema."""
+
+    name: str = Field(..., max_length=100)
+    description: str | None = None
+
+    @field_validator("name")
+    @classmethod
+    def name_not_empty(cls, v: str) -> str:
+        if not v or not v.strip():
+            raise ValueError("Name cannot be empty")
+        return v.strip()
+
+
+class ProductResponse(BaseModel):
+    """Product response schema."""
+
+    id: uuid.UUID
+    name: str
+    description: str | None = None
+    insight_count: int = 0
+    created_at: datetime
+
+
+class ProductListResponse(BaseModel):
+    """Product list response schema."""
+
+    items: list[ProductResponse]
+
+
+def get_product_repository(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncProductDBRepository:
+    """Dependency that provides a product repository."""
+    return AsyncProductDBRepository(db)
+
+
+@router.get("", response_model=ProductListResponse)
+async def list_products(
+    sort: ProductSort = ProductSort.NAME,
+    search: str | None = None,
+    current_user: User = Depends(get_current_user),
+    repository: AsyncProductDBRepository = Depends(get_product_repository),
+):
+    """List products with their insight counts.
+
+    ``sort=insight_count`` lists the products with the most insights first.
+    """
+    products = await repository.get_all(sort=sort, search=search)
+    return ProductListResponse(
+        items=[
+            ProductResponse(**product.model_dump(), insight_count=count)
+            for product, count in products
+        ]
+    )
+
+
+@router.post(
+    "",
+    response_model=ProductResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_product(
+    product_data: ProductCreate,
+    current_user: User = Depends(get_current_user),
+    repository: AsyncProductDBRepository = Depends(get_product_repository),
+):
+    """Create a new product."""
+    try:
+        created = await repository.create(
+            Product(name=product_data.name, description=product_data.description)
+        )
+    except DuplicateProductError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=PRODUCT_EXISTS,
+        )
+    logger.info(
+        "Product created: product_id=%s user_id=%s", created.id, current_user.id
+    )
+    return ProductResponse(**created.model_dump())
@@ -0,0 +1,75 @@
+"""Routing of read-only queries between a primary and a replica database."""
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import Select, event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import ORMExecuteState, Session
+
+# Session.info keys
+_REPLICA_READS = "replica_reads"
+_WROTE = "wrote"
+
+
+class RoutingSession(Session):
+    """Session that can send reads to a replica engine.
+
+    SELECTs issued inside replica_reads() go to ``replica_bind``; all other
+    statements go to the primary ``bind``. Once the session has written
+    anything it stays on the primary for the rest of its life, so a request
+    always reads its own writes however far the replica lags. Without a
+    replica it behaves like a plain Session.
+
+    Use it as ``sync_session_class`` for AsyncSession; an AsyncEngine
+    replica is unwrapped to its sync engine.
+    """
+
+    def __init__(
+        self,
+        *args,
+        replica_bind: Engine | AsyncEngine | None = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        if isinstance(replica_bind, AsyncEngine):
+            replica_bind = replica_bind.sync_engine
+        self.replica_bind = replica_bind
+
+    @property
+    def reads_from_replica(self) -> bool:
+        """True if reads inside replica_reads() currently use the replica."""
+        return self.replica_bind is not None and not self.info.get(_WROTE)
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs) -> Engine | Connection:
+        if (
+            self.info.get(_REPLICA_READS)
+            and self.reads_from_replica
+            and not self._flushing
+            and isinstance(clause, Select)
+        ):
+            return self.replica_bind
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush(session: Session, flush_context) -> None:
+    session.info[_WROTE] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_statement(state: ORMExecuteState) -> None:
+    # Bulk and Core INSERT/UPDATE/DELETE run through execute(), not flush
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[_WROTE] = True
+
+
+@contextmanager
+def replica_reads(session: Session) -> Iterator[None]:
+    """Let SELECTs in this block use the session's replica, if it has one."""
+    previous = session.info.get(_REPLICA_READS, False)
+    session.info[_REPLICA_READS] = True
+    try:
+        yield
+    finally:
+        session.info[_REPLICA_READS] = previous
@@ -1,11 +1,16 @@
 """API request/response schemas."""
 import uuid
 from datetime import datetime
+from enum import Enum
+from typing import Annotated
 
 from pydantic import BaseModel, Field, field_validator
 
 from app.models import Source
 
+# A tag name, as long as the tags.name column allows
+TagName = Annotated[str, Field(max_length=50)]
+
 
 class InsightCreate(BaseModel):
     """Schema for creating an insight."""
@@ -14,7 +19,7 @@ class InsightCreate(BaseModel):
     description: str
     source: Source | None = None
     product_ids: list[uuid.UUID] | None = None
-    tags: list[str] | None = None
+    tags: list[TagName] | None = None
 
     @field_validator("title")
     @classmethod
@@ -38,7 +43,7 @@ class InsightUpdate(BaseModel):
     description: str | None = None
     source: Source | None = None
     product_ids: list[uuid.UUID] | None = None
-    tags: list[str] | None = None
+    tags: list[TagName] | None = None
 
     @field_validator("title")
     @classmethod
@@ -48,6 +53,20 @@ class InsightUpdate(BaseModel):
         return v
 
 
+class ProductSummary(BaseModel):
+    """Schema for a product linked to an insight."""
+
+    id: uuid.UUID
+    name: str
+
+
+class TagSummary(BaseModel):
+    """Schema for a tag on an insight."""
+
+    id: uuid.UUID
+    name: str
+
+
 class InsightResponse(BaseModel):
     """Schema for insight response."""
 
@@ -55,14 +74,49 @@ class InsightResponse(BaseModel):
     title: str
     description: str
     source: Source | None = None
+    products: list[ProductSummary] = []
+    tags: list[TagSummary] = []
     created_at: datetime
     updated_at: datetime
 
 
+class InsightSearchResult(InsightResponse):
+    """Schema for an insight returned by a search, with highlights."""
+
+    score: float
+    title_highlight: str
+    snippet: str
+
+
 class InsightListResponse(BaseModel):
     """Schema for list of insights response."""
 
-    items: list[InsightResponse]
-    total: int
+    items: list[InsightSearchResult | InsightResponse]
+    total: int | None
     limit: int = 20
     offset: int = 0
+    next_cursor: str | None = None
+
+
+class BatchItemStatus(str, Enum):
+    """Outcome of one item in a batch import."""
+
+    CREATED = "created"
+    INVALID = "invalid"
+
+
+class InsightBatchItemResult(BaseModel):
+    """Schema for the result of one item in a batch import."""
+
+    index: int
+    status: BatchItemStatus
+    id: uuid.UUID | None = None
+    errors: list[str] = []
+
+
+class InsightBatchResponse(BaseModel):
+    """Schema for batch import response."""
+
+    created: int
+    failed: int
+    items: list[InsightBatchItemResult]
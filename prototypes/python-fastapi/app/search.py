@@ -0,0 +1,395 @@
+"""Full-text search over insight titles and descriptions."""
+import bisect
+import heapq
+import itertools
+import math
+import re
+from collections import Counter
+from collections.abc import Callable, Hashable, Sequence
+from functools import lru_cache
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Markers wrapped around matched terms in highlights and snippets
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+ELLIPSIS = "…"
+# Words of description context returned around the first match
+SNIPPET_WORDS = 24
+# bm25 column weights: a match in the title counts for more than one in
+# the description
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+FTS_TABLE = "insights_fts"
+# Maps each insight id to the integer rowid of its FTS5 row
+FTS_ROWID_TABLE = "insights_fts_rowids"
+_FTS_TRIGGERS = ("insights_fts_ai", "insights_fts_ad", "insights_fts_au")
+
+# insights is keyed by a string UUID, so its implicit rowid may be
+# renumbered by VACUUM and cannot key the index. Each insight gets a row in
+# FTS_ROWID_TABLE instead, whose INTEGER PRIMARY KEY is a stable rowid
+# alias, and the FTS5 table stores its own copy of the text under that
+# rowid. Triggers keep both in step with every insert, update and delete,
+# including ones made outside the repository.
+_FTS_DDL = (
+    f"""
+    CREATE TABLE IF NOT EXISTS {FTS_ROWID_TABLE} (
+        rowid INTEGER PRIMARY KEY,
+        insight_id VARCHAR(36) NOT NULL UNIQUE
+    )
+    """,
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS insights_fts_ai AFTER INSERT ON insights BEGIN
+        INSERT INTO {FTS_ROWID_TABLE}(insight_id) VALUES (new.id);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (last_insert_rowid(), new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS insights_fts_ad AFTER DELETE ON insights BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = (
+            SELECT rowid FROM {FTS_ROWID_TABLE} WHERE insight_id = old.id
+        );
+        DELETE FROM {FTS_ROWID_TABLE} WHERE insight_id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS insights_fts_au
+    AFTER UPDATE OF title, description ON insights BEGIN
+        UPDATE {FTS_TABLE} SET title = new.title, description = new.description
+        WHERE rowid = (
+            SELECT rowid FROM {FTS_ROWID_TABLE} WHERE insight_id = new.id
+        );
+    END
+    """,
+)
+_FTS_BACKFILL = (
+    f"INSERT INTO {FTS_ROWID_TABLE}(insight_id) SELECT id FROM insights",
+    f"""
+    INSERT INTO {FTS_TABLE}(rowid, title, description)
+    SELECT r.rowid, i.title, i.description
+    FROM {FTS_ROWID_TABLE} AS r JOIN insights AS i ON i.id = r.insight_id
+    """,
+)
+
+
+def _drop_search_objects(connection: Connection) -> None:
+    for trigger in _FTS_TRIGGERS:
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+    connection.execute(text(f"DROP TABLE IF EXISTS {FTS_ROWID_TABLE}"))
+
+
+def install_search_index(connection: Connection) -> bool:
+    """Create the FTS5 index and its triggers if they are missing.
+
+    Only SQLite has FTS5; other dialects are left alone and searched with
+    LIKE instead. If the index or its rowid map is missing, as in a new or
+    older database, both are rebuilt from the current rows. Returns True
+    if the index was rebuilt.
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+    existing = connection.scalar(
+        text(
+            "SELECT count(*) FROM sqlite_master "
+            "WHERE type = 'table' AND name IN (:index, :rowids)"
+        ),
+        {"index": FTS_TABLE, "rowids": FTS_ROWID_TABLE},
+    )
+    rebuild = existing < 2
+    if rebuild:
+        _drop_search_objects(connection)
+    for statement in _FTS_DDL:
+        connection.execute(text(statement))
+    if rebuild:
+        for statement in _FTS_BACKFILL:
+            connection.execute(text(statement))
+    return rebuild
+
+
+def drop_search_index(connection: Connection) -> None:
+    """Drop the FTS5 index, its rowid map and its triggers."""
+    if connection.dialect.name == "sqlite":
+        _drop_search_objects(connection)
+
+
+def search_terms(query: str) -> list[str]:
+    """Split a user query into lower-case word terms.
+
+    Punctuation and FTS operators are dropped, so any input is safe to turn
+    into a MATCH expression.
+    """
+    return re.findall(r"\w+", query.lower())
+
+
+def match_expression(terms: list[str]) -> str:
+    """Build an FTS5 MATCH expression requiring every term."""
+    return " ".join(f'"{term}"' for term in terms)
+
+
+@lru_cache(maxsize=256)
+def _term_pattern(terms: tuple[str, ...]) -> re.Pattern[str]:
+    alternatives = "|".join(re.escape(term) for term in terms)
+    return re.compile(rf"\b(?:{alternatives})\b", re.IGNORECASE)
+
+
+def highlight(content: str, terms: list[str]) -> str:
+    """Wrap every whole-word occurrence of a term in highlight markers."""
+    if not terms:
+        return content
+    return _term_pattern(tuple(terms)).sub(
+        lambda match: f"{HIGHLIGHT_START}{match.group(0)}{HIGHLIGHT_END}", content
+    )
+
+
+def snippet(content: str, terms: list[str], max_words: int = SNIPPET_WORDS) -> str:
+    """Return a highlighted excerpt of ``content`` around the first match."""
+    words = content.split()
+    if len(words) <= max_words:
+        return highlight(content, terms)
+    match = _term_pattern(tuple(terms)).search(content) if terms else None
+    first = len(content[: match.start()].split()) if match else 0
+    start = max(0, min(first - max_words // 4, len(words) - max_words))
+    end = start + max_words
+    prefix = ELLIPSIS if start > 0 else ""
+    suffix = ELLIPSIS if end < len(words) else ""
+    return prefix + highlight(" ".join(words[start:end]), terms) + suffix
+
+
+class InvertedIndex:
+    """Incremental in-memory inverted index ranked with BM25.
+
+    Scoring follows SQLite FTS5's bm25(): each field's term frequency is
+    multiplied by its weight, document length is the token count across
+    all fields, idf is log((N - n + 0.5) / (n + 0.5)) with terms in half or
+    more of the documents clamped to a tiny positive value, and every query
+    term must match. Both repositories therefore rank alike.
+
+    Documents are re-indexed in place by calling add() again and dropped
+    with remove(). Postings are keyed by small internal document numbers
+    rather than the caller's ids, which keeps the scoring loop on cheap int
+    hashes.
+
+    Each term's postings are also kept impact-ordered: grouped by term
+    frequency and, within a group, sorted by document length. A term's
+    contribution falls with length at a fixed frequency, so merging the
+    group heads yields documents best first. search() walks the rarest
+    term that way and stops once no remaining document can beat the
+    current top results, instead of scoring every match.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    # FTS5's floor for the idf of terms in at least half of the documents
+    MIN_IDF = 1e-6
+
+    def __init__(
+        self, weights: Sequence[float] = (TITLE_WEIGHT, DESCRIPTION_WEIGHT)
+    ):
+        self._weights = tuple(weights)
+        # term -> {doc number: weighted term frequency}
+        self._postings: dict[str, dict[int, float]] = {}
+        # term -> {weighted term frequency: doc numbers by length}
+        self._impacts: dict[str, dict[float, list[int]]] = {}
+        self._numbers: dict[Hashable, int] = {}
+        self._doc_ids: dict[int, Hashable] = {}
+        self._doc_terms: dict[int, tuple[str, ...]] = {}
+        self._doc_lengths: dict[int, int] = {}
+        self._total_length = 0
+        self._next_number = itertools.count()
+
+    def add(self, doc_id: Hashable, *fields: str) -> None:
+        """Index a document, replacing any previous version of it."""
+        if len(fields) != len(self._weights):
+            raise ValueError(
+                f"Expected {len(self._weights)} fields, got {len(fields)}"
+            )
+        self.remove(doc_id)
+        frequencies: Counter[str] = Counter()
+        length = 0
+        for weight, content in zip(self._weights, fields):
+            tokens = search_terms(content)
+            length += len(tokens)
+            for term, count in Counter(tokens).items():
+                frequencies[term] += weight * count
+        number = next(self._next_number)
+        self._doc_lengths[number] = length
+        by_length = self._doc_lengths.__getitem__
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[number] = frequency
+            group = self._impacts.setdefault(term, {}).setdefault(frequency, [])
+            # Numbers only grow, so equal lengths stay in insertion order
+            bisect.insort_right(group, number, key=by_length)
+        self._numbers[doc_id] = number
+        self._doc_ids[number] = doc_id
+        self._doc_terms[number] = tuple(frequencies)
+        self._total_length += length
+
+    def remove(self, doc_id: Hashable) -> None:
+        """Drop a document from the index if present."""
+        number = self._numbers.pop(doc_id, None)
+        if number is None:
+            return
+        length = self._doc_lengths[number]
+        by_length = self._doc_lengths.__getitem__
+        for term in self._doc_terms.pop(number):
+            postings = self._postings[term]
+            frequency = postings.pop(number)
+            groups = self._impacts[term]
+            group = groups[frequency]
+            position = bisect.bisect_left(group, length, key=by_length)
+            del group[group.index(number, position)]
+            if not group:
+                del groups[frequency]
+            if not postings:
+                del self._postings[term]
+                del self._impacts[term]
+        del self._doc_ids[number]
+        self._total_length -= self._doc_lengths.pop(number)
+
+    def clear(self) -> None:
+        """Drop every document."""
+        self._postings.clear()
+        self._impacts.clear()
+        self._numbers.clear()
+        self._doc_ids.clear()
+        self._doc_terms.clear()
+        self._doc_lengths.clear()
+        self._total_length = 0
+
+    def search(
+        self,
+        terms: Sequence[str],
+        limit: int = 20,
+        offset: int = 0,
+        accept: Callable[[Hashable], bool] | None = None,
+    ) -> tuple[list[tuple[Hashable, float]], int]:
+        """Rank documents matching every term.
+
+        ``accept``, when given, is called with a doc_id and drops the
+        documents it returns False for. Returns one page of (doc_id, score)
+        pairs, best first, and the number of matching documents.
+        """
+        unique_terms = sorted(
+            dict.fromkeys(terms), key=lambda t: len(self._postings.get(t, ()))
+        )
+        postings = [self._postings.get(term) for term in unique_terms]
+        if not postings or not all(postings):
+            return [], 0
+        rarest, *others = postings
+        matches: set[int] | dict[int, float] = (
+            set(rarest).intersection(*others) if others else rarest
+        )
+        if accept is not None:
+            doc_ids = self._doc_ids
+            matches = {n for n in matches if accept(doc_ids[n])}
+        wanted = offset + limit
+        if not matches or wanted <= 0:
+            return [], len(matches)
+
+        doc_count = len(self._doc_lengths)
+        average_length = self._total_length / doc_count or 1.0
+        idfs = [
+            max(math.log((doc_count - len(p) + 0.5) / (len(p) + 0.5)), self.MIN_IDF)
+            for p in postings
+        ]
+        # norm = K1 * (1 - B + B * length / average_length), split so the
+        # per-document loop is one multiply-add
+        norm_base = self.K1 * (1 - self.B)
+        norm_scale = self.K1 * self.B / average_length
+        lengths = self._doc_lengths
+
+        def contribution(idf: float, frequency: float, number: int) -> float:
+            norm = norm_base + norm_scale * lengths[number]
+            return idf * frequency / (frequency + norm) * (self.K1 + 1)
+
+        other_terms = list(zip(idfs[1:], others))
+        rarest_idf = idfs[0]
+        if len(matches) * 2 < len(rarest):
+            # Few of the rarest term's documents survive the intersection or
+            # filter, so walking its postings would mostly skip; score the
+            # matches directly instead
+            top = heapq.nlargest(
+                wanted,
+                (
+                    (
+                        sum(
+                            contribution(idf, term_postings[number], number)
+                            for idf, term_postings in zip(idfs, postings)
+                        ),
+                        -number,
+                    )
+                    for number in matches
+                ),
+            )
+            return self._page(top, offset), len(matches)
+
+        # Most any document can still gain from the other terms: their
+        # highest frequency at their shortest length
+        others_bound = sum(
+            contribution(
+                idf,
+                max(groups),
+                min((g[0] for g in groups.values()), key=lengths.__getitem__),
+            )
+            for idf, groups in zip(
+                idfs[1:], (self._impacts[t] for t in unique_terms[1:])
+            )
+        )
+
+        # Heads of the rarest term's frequency groups, best contribution first
+        frontier = [
+            (-contribution(rarest_idf, frequency, group[0]), frequency, 0, group)
+            for frequency, group in self._impacts[unique_terms[0]].items()
+        ]
+        heapq.heapify(frontier)
+        # Min-heap of the best (score, -number) pairs seen so far
+        top: list[tuple[float, int]] = []
+        while frontier:
+            negated, frequency, position, group = frontier[0]
+            if len(top) == wanted and -negated + others_bound < top[0][0]:
+                break
+            number = group[position]
+            if position + 1 < len(group):
+                heapq.heapreplace(
+                    frontier,
+                    (
+                        -contribution(rarest_idf, frequency, group[position + 1]),
+                        frequency,
+                        position + 1,
+                        group,
+                    ),
+                )
+            else:
+                heapq.heappop(frontier)
+            if number not in matches:
+                continue
+            score = -negated + sum(
+                contribution(idf, term_postings[number], number)
+                for idf, term_postings in other_terms
+            )
+            # Ties rank the earlier indexed document first
+            entry = (score, -number)
+            if len(top) < wanted:
+                heapq.heappush(top, entry)
+            elif entry > top[0]:
+                heapq.heapreplace(top, entry)
+
+        return self._page(top, offset), len(matches)
+
+    def _page(
+        self, top: list[tuple[float, int]], offset: int
+    ) -> list[tuple[Hashable, float]]:
+        ranked = sorted(top, reverse=True)[offset:]
+        return [(self._doc_ids[-negated], score) for score, negated in ranked]
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
@@ -1,13 +1,41 @@
 """Security utilities for authentication."""
+import asyncio
+import hashlib
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from typing import TypeVar
 
 import bcrypt
 from jose import jwt
 
+from app.cache import TTLCache
+from app.config import DEFAULT_BCRYPT_MAX_WORKERS
+from app.metrics import registry
+
 # Configuration - should come from environment in production
 SECRET_KEY = "your-secret-key-change-in-production"  # noqa: S105
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+TOKEN_CACHE_MAX_SIZE = 4096
+
+T = TypeVar("T")
+
+# Verified claims by SHA-256 of the raw token; entries expire at "exp".
+token_cache: TTLCache[str, dict] = TTLCache(
+    maxsize=TOKEN_CACHE_MAX_SIZE,
+    ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    name="token",
+)
+
+bcrypt_duration_seconds = registry.histogram(
+    "insider_bcrypt_duration_seconds",
+    "Time spent hashing or checking a password with bcrypt, in seconds.",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0),
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -22,6 +50,131 @@ def get_password_hash(password: str) -> str:
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
 
 
+@dataclass(frozen=True)
+class PasswordHashStats:
+    """Point-in-time counters for the password hashing pool."""
+
+    max_workers: int
+    queued: int
+    running: int
+    completed: int
+    busy_seconds: float
+
+
+class PasswordHashPool:
+    """Bounded thread pool that runs bcrypt away from the event loop.
+
+    bcrypt releases the GIL while hashing, so worker threads hash in
+    parallel while the loop keeps serving other requests. ``max_workers``
+    caps concurrent hashes; extra work waits in the pool's queue and is
+    reported as ``queued``. Work cancelled while still queued never runs
+    and leaves the queue count.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._busy_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="bcrypt",
+                )
+            return self._executor
+
+    def _call(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            bcrypt_duration_seconds.observe(elapsed)
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._busy_seconds += elapsed
+
+    def _discard_cancelled(self, job: Future) -> None:
+        # A job can only be cancelled before _call starts, so it is still
+        # counted as queued
+        if job.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """Run ``fn(*args)`` on a pool thread and await its result."""
+        executor = self._get_executor()
+        with self._lock:
+            self._queued += 1
+        job = executor.submit(self._call, fn, *args)
+        job.add_done_callback(self._discard_cancelled)
+        # Cancelling the awaiting task cancels the job if it has not started
+        return await asyncio.wrap_future(job)
+
+    def configure(self, max_workers: int) -> None:
+        """Change the concurrency limit. In-flight work finishes first."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self.max_workers = max_workers
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        """Stop the worker threads, waiting for queued work."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> PasswordHashStats:
+        """Return queue depth and throughput counters."""
+        with self._lock:
+            return PasswordHashStats(
+                max_workers=self.max_workers,
+                queued=self._queued,
+                running=self._running,
+                completed=self._completed,
+                busy_seconds=self._busy_seconds,
+            )
+
+
+# Resized from PasswordHashSettings at startup
+password_hash_pool = PasswordHashPool(max_workers=DEFAULT_BCRYPT_MAX_WORKERS)
+
+registry.register_callback(
+    "insider_bcrypt_queue_depth",
+    "Password hashing jobs waiting for a worker thread.",
+    lambda: [({}, password_hash_pool.stats().queued)],
+)
+registry.register_callback(
+    "insider_bcrypt_running",
+    "Password hashing jobs currently running.",
+    lambda: [({}, password_hash_pool.stats().running)],
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool without blocking the loop."""
+    return await password_hash_pool.run(
+        verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool without blocking the loop."""
+    return await password_hash_pool.run(get_password_hash, password)
+
+
 def create_access_token(
     data: dict, expires_delta: timedelta | None = None
 ) -> str:
@@ -34,10 +187,24 @@ def create_access_token(
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def decode_token(token: str) -> dict:
+def decode_token(token: str, use_cache: bool = True) -> dict:
     """Decode and validate a JWT token.
 
+    Verified claims are memoized until the token's ``exp`` so that clients
+    resending the same token skip signature verification. Tokens without
+    an ``exp`` claim are never cached.
+
     Raises:
         JWTError: If token is invalid or expired.
     """
-    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    if not use_cache:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+    digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    claims = token_cache.get(digest)
+    if claims is None:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            token_cache.set(digest, claims, ttl=exp - time.time())
+    return dict(claims)
@@ -1,14 +1,55 @@
 """Database repository for users."""
 import uuid
 
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.cache import TTLCache
 from app.db_models import UserDB
 from app.logging_config import get_logger
 from app.models import User
 
 logger = get_logger("app.repository.user")
 
+USER_CACHE_TTL_SECONDS = 60.0
+USER_CACHE_MAX_SIZE = 1024
+
+# Authenticated users by email, read by get_current_user.
+user_cache: TTLCache[str, User] = TTLCache(
+    maxsize=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS, name="user"
+)
+
+
+# Session.info key holding the emails of users changed in the transaction
+_CHANGED_USER_EMAILS = "changed_user_emails"
+
+
+@event.listens_for(UserDB, "after_update")
+@event.listens_for(UserDB, "after_delete")
+def _record_changed_user(mapper, connection, target: UserDB) -> None:
+    """Remember a changed user's old and new email until the commit."""
+    state = inspect(target)
+    emails = state.session.info.setdefault(_CHANGED_USER_EMAILS, set())
+    emails.add(target.email)
+    emails.update(state.attrs.email.history.deleted)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cached_users(session: Session) -> None:
+    """Drop users changed by the committed transaction from the cache.
+
+    Evicting at flush would let a request that reads between the flush and
+    the commit cache the old row again.
+    """
+    for email in session.info.pop(_CHANGED_USER_EMAILS, ()):
+        user_cache.invalidate(email)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session) -> None:
+    session.info.pop(_CHANGED_USER_EMAILS, None)
+
 
 class UserDBRepository:
     """Database repository for users."""
@@ -58,3 +99,36 @@ class UserDBRepository:
             return None, None
 
         return db_user.to_domain(), db_user.hashed_password
+
+
+class AsyncUserDBRepository:
+    """Async database repository for users.
+
+    Runs UserDBRepository through AsyncSession.run_sync, like
+    AsyncInsightDBRepository.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def get_by_email(self, email: str) -> User | None:
+        """Get a user by email."""
+        return await self._session.run_sync(
+            lambda session: UserDBRepository(session).get_by_email(email)
+        )
+
+    async def get_by_id(self, user_id: uuid.UUID) -> User | None:
+        """Get a user by ID."""
+        return await self._session.run_sync(
+            lambda session: UserDBRepository(session).get_by_id(user_id)
+        )
+
+    async def get_by_email_with_password(
+        self, email: str
+    ) -> tuple[User | None, str | None]:
+        """Get a user by email along with their hashed password."""
+        return await self._session.run_sync(
+            lambda session: UserDBRepository(
+                session
+            ).get_by_email_with_password(email)
+        )
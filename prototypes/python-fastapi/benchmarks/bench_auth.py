@@ -0,0 +1,85 @@
+"""Per-request authentication cost with and without the JWT claims cache.
+
+Measures decode_token alone and the full get_current_user dependency via
+GET /api/v1/users/me, each with the token cache enabled and disabled.
+
+Usage:
+    python -m benchmarks.bench_auth --iterations 5000
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import dependencies
+from app.database import get_async_session_factory
+from app.main import app
+from app.security import create_access_token, decode_token, token_cache
+from benchmarks.bench_concurrency import BENCH_EMAIL, seed
+
+USERS_ME_ENDPOINT = "/api/v1/users/me"
+
+
+def bench_decode(token: str, iterations: int, use_cache: bool) -> float:
+    """Return mean microseconds per decode_token call."""
+    token_cache.clear()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        decode_token(token, use_cache=use_cache)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+async def bench_request(
+    client: AsyncClient, token: str, iterations: int, use_cache: bool
+) -> float:
+    """Return mean microseconds per authenticated /users/me request."""
+    token_cache.clear()
+    real_decode = dependencies.decode_token
+    dependencies.decode_token = lambda t: real_decode(t, use_cache=use_cache)
+    headers = {"Authorization": f"Bearer {token}"}
+    try:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            (await client.get(USERS_ME_ENDPOINT, headers=headers)).raise_for_status()
+        return (time.perf_counter() - start) / iterations * 1e6
+    finally:
+        dependencies.decode_token = real_decode
+
+
+async def main(args: argparse.Namespace) -> None:
+    token = create_access_token(data={"sub": BENCH_EMAIL})
+    for use_cache in (False, True):
+        label = "on " if use_cache else "off"
+        print(
+            f"decode_token   cache={label} "
+            f"{bench_decode(token, args.iterations, use_cache):8.1f} us/call"
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = Path(tmp) / "bench.db"
+        seed(database_path, insights=0)
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+        session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+        app.dependency_overrides[get_async_session_factory] = lambda: session_factory
+        requests = max(args.iterations // 10, 1)
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://bench"
+            ) as client:
+                for use_cache in (False, True):
+                    label = "on " if use_cache else "off"
+                    cost = await bench_request(client, token, requests, use_cache)
+                    print(f"GET /users/me  cache={label} {cost:8.1f} us/request")
+        finally:
+            app.dependency_overrides.clear()
+            await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,144 @@
+"""Concurrency load test for the async insights API.
+
+Seeds a temporary SQLite database, then sends the same number of
+GET /api/v1/insights requests at increasing concurrency levels and reports
+requests per second for each. With the async repositories the event loop
+keeps serving other requests while one waits on the database, so
+throughput should grow with concurrency instead of staying flat.
+
+With --write, the workers send PUT /api/v1/insights/{id} to different
+insights instead, to show how far concurrent writes scale.
+
+Usage:
+    python -m benchmarks.bench_concurrency --requests 400 --concurrency 1 4 16
+    python -m benchmarks.bench_concurrency --write --concurrency 1 4 16
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.database import Base, get_async_session_factory
+from app.db_models import InsightDB, UserDB
+from app.main import app
+from app.security import create_access_token, get_password_hash
+
+BENCH_EMAIL = "bench@example.com"
+INSIGHTS_ENDPOINT = "/api/v1/insights"
+
+
+def seed(database_path: Path, insights: int) -> list[uuid.UUID]:
+    """Create the schema, one user and ``insights`` rows; return their ids."""
+    engine = create_engine(f"sqlite:///{database_path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        author_id = uuid.uuid4()
+        session.add(
+            UserDB(
+                id=author_id,
+                email=BENCH_EMAIL,
+                name="Bench User",
+                hashed_password=get_password_hash("bench-password"),
+                role="advocate",
+            )
+        )
+        insight_ids = [uuid.uuid4() for _ in range(insights)]
+        session.add_all(
+            InsightDB(
+                id=insight_id,
+                author_id=author_id,
+                title=f"Insight {i}",
+                description=f"Benchmark insight number {i}",
+            )
+            for i, insight_id in enumerate(insight_ids)
+        )
+        session.commit()
+    engine.dispose()
+    return insight_ids
+
+
+async def run_level(
+    client: AsyncClient,
+    requests: int,
+    concurrency: int,
+    insight_ids: list[uuid.UUID] | None = None,
+) -> float:
+    """Send ``requests`` calls with ``concurrency`` workers; return req/s.
+
+    The calls list insights, or update ``insight_ids`` in turn when given.
+    """
+    headers = {
+        "Authorization": f"Bearer {create_access_token(data={'sub': BENCH_EMAIL})}"
+    }
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for i in remaining:
+            if insight_ids:
+                insight_id = insight_ids[i % len(insight_ids)]
+                response = await client.put(
+                    f"{INSIGHTS_ENDPOINT}/{insight_id}",
+                    json={"title": f"Updated {i}"},
+                    headers=headers,
+                )
+            else:
+                response = await client.get(INSIGHTS_ENDPOINT, headers=headers)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = Path(tmp) / "bench.db"
+        insight_ids = seed(database_path, args.insights)
+        if not args.write:
+            insight_ids = None
+
+        async_engine = create_async_engine(
+            f"sqlite+aiosqlite:///{database_path}",
+            pool_size=max(args.concurrency),
+        )
+        session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+        app.dependency_overrides[get_async_session_factory] = lambda: session_factory
+        try:
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://bench"
+            ) as client:
+                # warm-up
+                await run_level(client, min(args.requests, 20), 1, insight_ids)
+                baseline = None
+                for concurrency in args.concurrency:
+                    rps = await run_level(
+                        client, args.requests, concurrency, insight_ids
+                    )
+                    baseline = baseline or rps
+                    print(
+                        f"concurrency={concurrency:<4d} "
+                        f"req/s={rps:8.1f} scaling={rps / baseline:5.2f}x"
+                    )
+        finally:
+            app.dependency_overrides.clear()
+            await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--insights", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 4, 16]
+    )
+    parser.add_argument(
+        "--write", action="store_true", help="update insights instead of listing"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,84 @@
+"""Peak memory and throughput of the streaming insights export.
+
+Fills a temporary SQLite database, then renders the full export as NDJSON
+and CSV while tracing allocations. Peak memory should stay flat as the
+row count grows, since rows are read from the cursor one batch at a time.
+
+Usage:
+    python -m benchmarks.bench_export --insights 10000 100000
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.db_repository import AsyncInsightDBRepository, InsightDBRepository
+from app.export import ExportFormat, render_export
+from app.models import Insight
+
+
+def fill(path: Path, insights: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    author_id = uuid.uuid4()
+    with Session(engine) as session:
+        InsightDBRepository(session).create_many(
+            [
+                (
+                    Insight(
+                        title=f"Insight {i}",
+                        description="Export benchmark description " * 8,
+                        author_id=author_id,
+                    ),
+                    [],
+                    [f"tag{i % 20}"],
+                )
+                for i in range(insights)
+            ]
+        )
+    engine.dispose()
+
+
+async def export(path: Path, export_format: ExportFormat) -> tuple[int, float, int]:
+    """Render one export, returning (bytes, seconds, peak traced bytes)."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    size = 0
+    tracemalloc.start()
+    start = time.perf_counter()
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        batches = AsyncInsightDBRepository(session).stream_all()
+        async for chunk in render_export(batches, export_format):
+            size += len(chunk)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    await engine.dispose()
+    return size, elapsed, peak
+
+
+def main(args: argparse.Namespace) -> None:
+    for insights in args.insights:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "export.db"
+            fill(path, insights)
+            for export_format in ExportFormat:
+                size, elapsed, peak = asyncio.run(export(path, export_format))
+                print(
+                    f"{insights:>8d} rows {export_format.value:<6s} "
+                    f"{size / 2**20:8.1f} MiB out {insights / elapsed:10.0f} rows/s "
+                    f"peak {peak / 2**20:6.1f} MiB"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--insights", type=int, nargs="+", default=[10_000, 100_000])
+    main(parser.parse_args())
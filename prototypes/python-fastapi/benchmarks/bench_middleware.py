@@ -0,0 +1,87 @@
+"""Per-request overhead of LoggingMiddleware, before and after going pure ASGI.
+
+Serves a trivial route three ways: bare, behind the previous
+BaseHTTPMiddleware implementation, and behind the current ASGI
+LoggingMiddleware. Logging is disabled so only middleware plumbing is
+measured.
+
+Usage:
+    python -m benchmarks.bench_middleware --requests 5000
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+
+from app.correlation import generate_correlation_id, set_correlation_id
+from app.middleware import CORRELATION_ID_HEADER, LoggingMiddleware, logger
+
+
+class BaseHTTPLoggingMiddleware(BaseHTTPMiddleware):
+    """The LoggingMiddleware implementation prior to the ASGI rewrite."""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        correlation_id = request.headers.get(
+            CORRELATION_ID_HEADER, generate_correlation_id()
+        )
+        set_correlation_id(correlation_id)
+        logger.info("Request received: %s %s", request.method, request.url.path)
+        start_time = time.monotonic()
+        response = await call_next(request)
+        duration_ms = round((time.monotonic() - start_time) * 1000, 2)
+        logger.info(
+            "Request completed: %s %s status=%d duration_ms=%.2f",
+            request.method,
+            request.url.path,
+            response.status_code,
+            duration_ms,
+        )
+        response.headers[CORRELATION_ID_HEADER] = correlation_id
+        return response
+
+
+async def ping(request: Request) -> Response:
+    return PlainTextResponse("pong")
+
+
+def build_app(middleware: list[Middleware]) -> Starlette:
+    return Starlette(routes=[Route("/ping", ping)], middleware=middleware)
+
+
+async def mean_request_us(app: Starlette, requests: int) -> float:
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        for _ in range(min(requests, 100)):
+            await client.get("/ping")
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/ping")
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main(args: argparse.Namespace) -> None:
+    logger.setLevel(logging.CRITICAL)
+    bare = await mean_request_us(build_app([]), args.requests)
+    variants = {
+        "BaseHTTPMiddleware": build_app([Middleware(BaseHTTPLoggingMiddleware)]),
+        "pure ASGI": build_app([Middleware(LoggingMiddleware)]),
+    }
+    print(f"{'no middleware':<20s} {bare:8.1f} us/request")
+    for name, app in variants.items():
+        cost = await mean_request_us(app, args.requests)
+        print(f"{name:<20s} {cost:8.1f} us/request  overhead={cost - bare:7.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    asyncio.run(main(parser.parse_args()))
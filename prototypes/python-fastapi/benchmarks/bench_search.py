@@ -0,0 +1,69 @@
+"""Query latency of the in-memory inverted index in InsightRepository.
+
+Fills the repository with synthetic insights drawn from a Zipf-like
+vocabulary, then times q= searches for rare, mid-frequency and common
+terms.
+
+Usage:
+    python -m benchmarks.bench_search --insights 100000 --queries 200
+"""
+import argparse
+import itertools
+import random
+import time
+import uuid
+
+from app.models import Insight
+from app.repository import InsightRepository
+
+VOCABULARY_SIZE = 5000
+
+
+def build(insights: int, rng: random.Random) -> tuple[InsightRepository, list[str]]:
+    vocabulary = [f"term{i}" for i in range(VOCABULARY_SIZE)]
+    cum_weights = list(
+        itertools.accumulate(1 / (rank + 1) for rank in range(VOCABULARY_SIZE))
+    )
+    repository = InsightRepository()
+    author_id = uuid.uuid4()
+    for _ in range(insights):
+        repository.create(
+            Insight(
+                title=" ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=6)),
+                description=" ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=40)),
+                author_id=author_id,
+            )
+        )
+    return repository, vocabulary
+
+
+def mean_query_us(repository: InsightRepository, query: str, queries: int) -> float:
+    start = time.perf_counter()
+    for _ in range(queries):
+        repository.search(query)
+    return (time.perf_counter() - start) / queries * 1e6
+
+
+def main(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    repository, vocabulary = build(args.insights, rng)
+    print(f"indexed {args.insights} insights in {time.perf_counter() - start:.1f}s")
+    cases = {
+        "rare term": vocabulary[-1],
+        "mid term": vocabulary[VOCABULARY_SIZE // 10],
+        "two terms": f"{vocabulary[50]} {vocabulary[500]}",
+        "common term": vocabulary[0],
+    }
+    for name, query in cases.items():
+        matches = repository.search(query)[1]
+        cost = mean_query_us(repository, query, args.queries)
+        print(f"{name:<12s} {matches:>7d} matches {cost:10.1f} us/query")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--insights", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    main(parser.parse_args())
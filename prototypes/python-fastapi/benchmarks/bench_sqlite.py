@@ -0,0 +1,132 @@
+"""Read/write concurrency of SQLite with default and tuned engine settings.
+
+Runs writer threads creating insights alongside reader threads listing
+them, against a fresh database per configuration, and reports operations
+per second and "database is locked" failures. The default configuration
+is a plain engine (rollback journal, synchronous=FULL); the tuned one is
+built from DatabaseSettings (WAL, synchronous=NORMAL, busy_timeout, mmap
+and a larger page cache). Reader threads share the GIL with the ORM, so
+the gain shows mostly in write throughput.
+
+Usage:
+    python -m benchmarks.bench_sqlite --writers 2 --readers 8 --seconds 5
+"""
+import argparse
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.config import DatabaseSettings
+from app.database import Base, create_database_engine
+from app.db_repository import InsightDBRepository
+from app.models import Insight
+from app.pagination import TotalMode
+
+
+def default_engine(url: str, threads: int) -> Engine:
+    return create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        pool_size=threads,
+    )
+
+
+def tuned_engine(url: str, threads: int) -> Engine:
+    return create_database_engine(DatabaseSettings(url=url, pool_size=threads))
+
+
+def write(repository: InsightDBRepository, author_id: uuid.UUID) -> None:
+    repository.create(
+        Insight(
+            title="Concurrent insight",
+            description="Written while readers list insights",
+            author_id=author_id,
+        )
+    )
+
+
+def read(repository: InsightDBRepository, author_id: uuid.UUID) -> None:
+    repository.get_all(limit=20, total_mode=TotalMode.NONE)
+
+
+def worker(
+    engine: Engine,
+    operation: Callable[[InsightDBRepository, uuid.UUID], None],
+    kind: str,
+    deadline: float,
+    counts: Counter,
+    lock: threading.Lock,
+) -> None:
+    author_id = uuid.uuid4()
+    done = failed = 0
+    while time.perf_counter() < deadline:
+        with Session(engine) as session:
+            try:
+                operation(InsightDBRepository(session), author_id)
+                done += 1
+            except OperationalError:
+                session.rollback()
+                failed += 1
+    with lock:
+        counts[kind] += done
+        counts[f"{kind} failed"] += failed
+
+
+def run(make_engine, args: argparse.Namespace) -> Counter:
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{Path(directory) / 'bench.db'}"
+        engine = make_engine(url, args.writers + args.readers)
+        Base.metadata.create_all(engine)
+        seed = InsightDBRepository(Session(engine))
+        for _ in range(args.seed_rows):
+            write(seed, uuid.uuid4())
+        seed._session.close()
+
+        counts: Counter = Counter()
+        lock = threading.Lock()
+        deadline = time.perf_counter() + args.seconds
+        threads = [
+            threading.Thread(
+                target=worker, args=(engine, write, "writes", deadline, counts, lock)
+            )
+            for _ in range(args.writers)
+        ] + [
+            threading.Thread(
+                target=worker, args=(engine, read, "reads", deadline, counts, lock)
+            )
+            for _ in range(args.readers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+    return counts
+
+
+def main(args: argparse.Namespace) -> None:
+    for name, make_engine in (("default", default_engine), ("tuned", tuned_engine)):
+        counts = run(make_engine, args)
+        print(
+            f"{name:<8s} writes {counts['writes'] / args.seconds:8.1f}/s "
+            f"reads {counts['reads'] / args.seconds:8.1f}/s "
+            f"locked {counts['writes failed'] + counts['reads failed']:4d}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--seed-rows", type=int, default=200)
+    main(parser.parse_args())
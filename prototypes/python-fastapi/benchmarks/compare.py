@@ -0,0 +1,77 @@
+"""Compare two load test result files and flag regressions.
+
+Prints each scenario's p50/p95/p99 and requests per second from a base and
+a head run (see benchmarks.loadtest) with the relative change, and exits
+with status 1 if any p95 latency rose, or throughput fell, by more than the
+threshold.
+
+Usage:
+    python -m benchmarks.compare base.json head.json --threshold 10
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def change(base: float, head: float) -> float:
+    """Relative change from base to head, in percent."""
+    return (head - base) / base * 100 if base else 0.0
+
+
+def regressions(base: dict, head: dict, threshold: float) -> list[str]:
+    """Describe every scenario whose p95 or rps moved past ``threshold``%."""
+    found = []
+    for name, head_result in head["results"].items():
+        base_result = base["results"].get(name)
+        if base_result is None:
+            continue
+        p95 = change(base_result["p95_ms"], head_result["p95_ms"])
+        if p95 > threshold:
+            found.append(f"{name}: p95 {p95:+.1f}%")
+        rps = change(base_result["rps"], head_result["rps"])
+        if rps < -threshold:
+            found.append(f"{name}: rps {rps:+.1f}%")
+    return found
+
+
+def render(base: dict, head: dict) -> str:
+    lines = [
+        f"base {base['meta'].get('commit')}  head {head['meta'].get('commit')}",
+        f"{'scenario':<9s}"
+        + "".join(f"{metric:>22s}" for metric in (*LATENCY_METRICS, "rps")),
+    ]
+    for name, head_result in head["results"].items():
+        base_result = base["results"].get(name)
+        if base_result is None:
+            lines.append(f"{name:<9s} (not in base)")
+            continue
+        cells = [
+            f"{base_result[metric]:8.2f} {head_result[metric]:8.2f} "
+            f"{change(base_result[metric], head_result[metric]):+4.0f}%"
+            for metric in (*LATENCY_METRICS, "rps")
+        ]
+        lines.append(f"{name:<9s}" + "".join(f"{cell:>22s}" for cell in cells))
+    return "\n".join(lines)
+
+
+def main(args: argparse.Namespace) -> int:
+    base = json.loads(Path(args.base).read_text())
+    head = json.loads(Path(args.head).read_text())
+    print(render(base, head))
+    found = regressions(base, head, args.threshold)
+    for line in found:
+        print(f"REGRESSION {line}")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="Allowed change in percent"
+    )
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,356 @@
+"""Load test of the insights API with latency percentiles and JSON results.
+
+Seeds a SQLite database with insights (10k to 1M), then drives each
+scenario in-process through httpx's ASGITransport at the requested
+concurrency and reports p50/p95/p99 latency and requests per second.
+Results are written as JSON for benchmarks.compare to diff across commits.
+A seeded database can be kept with --database and reused by later runs.
+Engines are built from the app's INSIDER_DB_* settings, so pragmas and
+pool options match the server. The list page is measured twice: "list"
+clears the response cache before every request and "list_cached" reads
+a warm cache.
+
+Usage:
+    python -m benchmarks.loadtest --insights 100000 --concurrency 16
+    python -m benchmarks.loadtest --scenarios list get --output base.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient, Response
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.config import DatabaseSettings, async_url_for, get_database_settings
+from app.database import (
+    Base,
+    create_async_database_engine,
+    create_database_engine,
+    get_async_session_factory,
+)
+from app.db_models import InsightDB, UserDB
+from app.main import app
+from app.response_cache import insight_list_cache
+from app.routing import RoutingSession
+from app.security import create_access_token, get_password_hash
+
+BENCH_EMAIL = "loadtest@example.com"
+BENCH_PASSWORD = "loadtest-password"
+INSIGHTS_ENDPOINT = "/api/v1/insights"
+SEED_CHUNK_SIZE = 10_000
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+@dataclass
+class ScenarioResult:
+    """Latency and throughput of one scenario."""
+
+    requests: int
+    errors: int
+    rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+@dataclass
+class Context:
+    """What scenarios need to build their requests."""
+
+    client: AsyncClient
+    headers: dict[str, str]
+    # Seeded insight ids; deletes consume them from the end
+    insight_ids: list[str]
+    rng: random.Random
+
+
+Scenario = Callable[[Context], Awaitable[Response]]
+
+
+def _insight_body(ctx: Context) -> dict:
+    return {
+        "title": f"Load test insight {ctx.rng.randrange(1_000_000)}",
+        "description": "Created by the load test",
+    }
+
+
+async def list_insights_cached(ctx: Context) -> Response:
+    return await ctx.client.get(
+        INSIGHTS_ENDPOINT, params={"limit": 20}, headers=ctx.headers
+    )
+
+
+async def list_insights(ctx: Context) -> Response:
+    insight_list_cache.clear()
+    return await list_insights_cached(ctx)
+
+
+async def get_insight(ctx: Context) -> Response:
+    insight_id = ctx.rng.choice(ctx.insight_ids)
+    return await ctx.client.get(
+        f"{INSIGHTS_ENDPOINT}/{insight_id}", headers=ctx.headers
+    )
+
+
+async def create_insight(ctx: Context) -> Response:
+    return await ctx.client.post(
+        INSIGHTS_ENDPOINT, json=_insight_body(ctx), headers=ctx.headers
+    )
+
+
+async def update_insight(ctx: Context) -> Response:
+    insight_id = ctx.rng.choice(ctx.insight_ids)
+    return await ctx.client.put(
+        f"{INSIGHTS_ENDPOINT}/{insight_id}",
+        json={"title": _insight_body(ctx)["title"]},
+        headers=ctx.headers,
+    )
+
+
+async def delete_insight(ctx: Context) -> Response:
+    return await ctx.client.delete(
+        f"{INSIGHTS_ENDPOINT}/{ctx.insight_ids.pop()}", headers=ctx.headers
+    )
+
+
+async def login(ctx: Context) -> Response:
+    return await ctx.client.post(
+        "/api/v1/auth/login",
+        json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD},
+    )
+
+
+async def users_me(ctx: Context) -> Response:
+    return await ctx.client.get("/api/v1/users/me", headers=ctx.headers)
+
+
+# Default run order
+SCENARIOS: dict[str, Scenario] = {
+    "list": list_insights,
+    "list_cached": list_insights_cached,
+    "get": get_insight,
+    "create": create_insight,
+    "update": update_insight,
+    "login": login,
+    "me": users_me,
+    "delete": delete_insight,
+}
+
+
+def database_url(database_path: Path) -> str:
+    return f"sqlite:///{database_path}"
+
+
+def seed(settings: DatabaseSettings, database_path: Path, insights: int) -> None:
+    """Create the schema, the load test user and ``insights`` rows."""
+    engine = create_database_engine(settings, database_url(database_path))
+    Base.metadata.create_all(engine)
+    author_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        session.add(
+            UserDB(
+                id=uuid.UUID(author_id),
+                email=BENCH_EMAIL,
+                name="Load Test",
+                hashed_password=get_password_hash(BENCH_PASSWORD),
+                role="advocate",
+            )
+        )
+        rows = (
+            {
+                "id": str(uuid.uuid4()),
+                "author_id": author_id,
+                "title": f"Insight {i}",
+                "description": f"Seeded load test insight number {i}",
+                "created_at": now - timedelta(seconds=i),
+                "updated_at": now - timedelta(seconds=i),
+            }
+            for i in range(insights)
+        )
+        for chunk in itertools.batched(rows, SEED_CHUNK_SIZE):
+            session.execute(insert(InsightDB), list(chunk))
+        session.commit()
+        session.execute(text("ANALYZE"))
+    engine.dispose()
+
+
+def sample_ids(
+    settings: DatabaseSettings, database_path: Path, count: int
+) -> tuple[list[str], int]:
+    """Pick ``count`` random insight ids; also return the number of rows."""
+    engine = create_database_engine(settings, database_url(database_path))
+    with engine.connect() as conn:
+        ids = conn.scalars(
+            select(InsightDB.id).order_by(text("random()")).limit(count)
+        ).all()
+        total = conn.scalar(text("SELECT COUNT(*) FROM insights"))
+    engine.dispose()
+    return list(ids), total
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def run_scenario(
+    ctx: Context, scenario: Scenario, requests: int, concurrency: int
+) -> ScenarioResult:
+    """Send ``requests`` requests from ``concurrency`` workers."""
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await scenario(ctx)
+            latencies.append(time.perf_counter() - start)
+            if response.is_error:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return ScenarioResult(
+        requests=requests,
+        errors=errors,
+        rps=requests / elapsed,
+        mean_ms=sum(latencies) / len(latencies) * 1000,
+        p50_ms=percentile(latencies, 0.50) * 1000,
+        p95_ms=percentile(latencies, 0.95) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+    )
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace, database_path: Path) -> dict:
+    # Every worker gets a pooled connection
+    settings = get_database_settings().model_copy(
+        update={"pool_size": args.concurrency}
+    )
+    if not database_path.exists():
+        start = time.perf_counter()
+        seed(settings, database_path, args.insights)
+        print(
+            f"seeded {args.insights} insights in {time.perf_counter() - start:.1f}s"
+        )
+    requests_per_scenario = {
+        name: args.login_requests if name == "login" else args.requests
+        for name in args.scenarios
+    }
+    # Deletes need their own ids, so get and update never hit a deleted row
+    pool, insights = sample_ids(settings, database_path, args.requests * 2)
+    delete_ids = pool[: requests_per_scenario.get("delete", 0)]
+    read_ids = pool[len(delete_ids) :] or pool
+
+    async_engine = create_async_database_engine(
+        settings, async_url_for(database_url(database_path))
+    )
+    session_factory = async_sessionmaker(
+        async_engine, expire_on_commit=False, sync_session_class=RoutingSession
+    )
+    app.dependency_overrides[get_async_session_factory] = lambda: session_factory
+    headers = {
+        "Authorization": f"Bearer {create_access_token(data={'sub': BENCH_EMAIL})}"
+    }
+    results = {}
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://loadtest"
+        ) as client:
+            ctx = Context(client, headers, read_ids, random.Random(args.seed))
+            await run_scenario(ctx, list_insights_cached, 20, 1)  # warm-up
+            for name in args.scenarios:
+                ctx.insight_ids = delete_ids if name == "delete" else read_ids
+                result = await run_scenario(
+                    ctx, SCENARIOS[name], requests_per_scenario[name], args.concurrency
+                )
+                results[name] = asdict(result)
+                print(
+                    f"{name:<11s} {result.rps:8.1f} req/s  p50 {result.p50_ms:7.2f} ms  "
+                    f"p95 {result.p95_ms:7.2f} ms  p99 {result.p99_ms:7.2f} ms  "
+                    f"errors {result.errors}"
+                )
+    finally:
+        app.dependency_overrides.clear()
+        await async_engine.dispose()
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "insights": insights,
+            "concurrency": args.concurrency,
+        },
+        "results": results,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.database:
+        report = await run(args, Path(args.database))
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = await run(args, Path(tmp) / "loadtest.db")
+
+    output = RESULTS_DIR / f"loadtest-{report['meta']['commit'] or 'local'}.json"
+    if args.output:
+        output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--insights", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument(
+        "--login-requests",
+        type=int,
+        default=50,
+        help="Requests for the login scenario, which is bound by bcrypt",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument(
+        "--database", help="SQLite file to seed once and reuse across runs"
+    )
+    parser.add_argument("--output", help="JSON results path")
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(main(parser.parse_args()))
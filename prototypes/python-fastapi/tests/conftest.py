@@ -4,13 +4,17 @@ import uuid
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
 
-from app.database import Base, get_db
+from app.config import ROUTE_QUERY_BUDGETS
+from app.database import Base, get_async_session_factory, get_db
 from app.db_models import UserDB
 from app.main import app
+from app.query_budget import QueryBudgetMiddleware
+from app.response_cache import insight_list_cache
 from app.security import create_access_token, get_password_hash
+from app.user_repository import user_cache
 
 # Test user constants
 TEST_USER_EMAIL = "testuser@example.com"
@@ -24,12 +28,17 @@ def anyio_backend():
 
 
 @pytest.fixture
-def engine():
-    """Create an in-memory SQLite database for testing."""
+def database_path(tmp_path):
+    """Path of a throwaway SQLite file shared by the sync and async engines."""
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def engine(database_path):
+    """Create a temporary SQLite database for testing."""
     engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{database_path}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
     Base.metadata.create_all(engine)
     yield engine
@@ -37,6 +46,14 @@ def engine():
     engine.dispose()
 
 
+@pytest.fixture
+async def async_engine(engine, database_path):
+    """Create an async engine on the same database as ``engine``."""
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+    yield async_engine
+    await async_engine.dispose()
+
+
 @pytest.fixture
 def session(engine):
     """Create a database session for testing."""
@@ -46,9 +63,12 @@ def session(engine):
 
 
 @pytest.fixture
-async def client(engine):
+async def client(engine, async_engine):
     """Create a test client for the API with test database."""
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    TestingAsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
 
     def override_get_db():
         db = TestingSessionLocal()
@@ -58,13 +78,25 @@ async def client(engine):
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_session_factory] = (
+        lambda: TestingAsyncSessionLocal
+    )
 
+    user_cache.clear()
+    insight_list_cache.clear()
+
+    # Any request that goes over its route's SQL budget fails the test
+    checked_app = QueryBudgetMiddleware(
+        app, route_budgets=ROUTE_QUERY_BUDGETS, strict=True
+    )
     async with AsyncClient(
-        transport=ASGITransport(app=app), base_url="http://test"
+        transport=ASGITransport(app=checked_app), base_url="http://test"
     ) as ac:
         yield ac
 
     app.dependency_overrides.clear()
+    user_cache.clear()
+    insight_list_cache.clear()
 
 
 @pytest.fixture
@@ -1,8 +1,17 @@
 """Tests for the insights API endpoints - TDD: write tests first."""
+import csv
+import io
+import json
 import logging
 import uuid
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db_models import ProductDB, UserDB
+from app.query_budget import assert_max_queries
+from app.security import create_access_token, get_password_hash
 
 # Test constants
 INSIGHTS_ENDPOINT = "/api/v1/insights"
@@ -10,6 +19,8 @@ TEST_INSIGHT_TITLE = "Test insight"
 TEST_DESCRIPTION = "Test description"
 SOME_DESCRIPTION = "Some description"
 MAIN_LOGGER = "app.main"
+BATCH_ENDPOINT = "/api/v1/insights:batch"
+EXPORT_ENDPOINT = "/api/v1/insights/export"
 
 
 class TestListInsights:
@@ -45,6 +56,92 @@ class TestListInsights:
         assert len(data["items"]) == 1
         assert data["items"][0]["title"] == TEST_INSIGHT_TITLE
 
+    @pytest.mark.anyio
+    async def test_list_insights_cursor_pagination(self, client, auth_headers):
+        """next_cursor walks through every insight exactly once."""
+        for i in range(5):
+            await client.post(
+                INSIGHTS_ENDPOINT,
+                json={"title": f"Insight {i}", "description": TEST_DESCRIPTION},
+                headers=auth_headers,
+            )
+
+        seen = []
+        params = {"limit": 2}
+        while True:
+            response = await client.get(
+                INSIGHTS_ENDPOINT, params=params, headers=auth_headers
+            )
+            assert response.status_code == 200
+            data = response.json()
+            seen.extend(item["id"] for item in data["items"])
+            if data["next_cursor"] is None:
+                break
+            params = {"limit": 2, "cursor": data["next_cursor"]}
+
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+
+    @pytest.mark.anyio
+    async def test_list_insights_last_page_has_no_cursor(
+        self, client, auth_headers
+    ):
+        """next_cursor is null when the page is not full."""
+        await client.post(
+            INSIGHTS_ENDPOINT,
+            json={"title": TEST_INSIGHT_TITLE, "description": TEST_DESCRIPTION},
+            headers=auth_headers,
+        )
+
+        response = await client.get(
+            INSIGHTS_ENDPOINT, params={"limit": 2}, headers=auth_headers
+        )
+
+        assert response.json()["next_cursor"] is None
+
+    @pytest.mark.anyio
+    async def test_list_insights_invalid_cursor_returns_400(
+        self, client, auth_headers
+    ):
+        """Returns 400 for a malformed cursor."""
+        response = await client.get(
+            INSIGHTS_ENDPOINT, params={"cursor": "garbage"}, headers=auth_headers
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.anyio
+    async def test_list_insights_include_total_false(self, client, auth_headers):
+        """include_total=false returns a null total."""
+        response = await client.get(
+            INSIGHTS_ENDPOINT,
+            params={"include_total": "false"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["total"] is None
+
+    @pytest.mark.anyio
+    async def test_list_insights_cached_total(self, client, auth_headers):
+        """Cached total stays correct across creates."""
+        params = {"total_mode": "cached"}
+        response = await client.get(
+            INSIGHTS_ENDPOINT, params=params, headers=auth_headers
+        )
+        assert response.json()["total"] == 0
+
+        await client.post(
+            INSIGHTS_ENDPOINT,
+            json={"title": TEST_INSIGHT_TITLE, "description": TEST_DESCRIPTION},
+            headers=auth_headers,
+        )
+        response = await client.get(
+            INSIGHTS_ENDPOINT, params=params, headers=auth_headers
+        )
+
+        assert response.json()["total"] == 1
+
     @pytest.mark.anyio
     async def test_list_insights_without_auth_returns_401(self, client):
         """Returns 401 when no token provided."""
@@ -53,6 +150,340 @@ class TestListInsights:
         assert response.status_code == 401
 
 
+@pytest.fixture
+def product_id(engine):
+    """Create a product and return its id."""
+    product_id = uuid.uuid4()
+    with Session(engine) as session:
+        session.add(ProductDB(id=product_id, name="SonarQube"))
+        session.commit()
+    return product_id
+
+
+class TestInsightProductsAndTags:
+    """Tests for product and tag links on insights."""
+
+    @pytest.mark.anyio
+    async def test_create_with_products_and_tags(
+        self, client, auth_headers, product_id
+    ):
+        """Linked products and tags are returned on the insight."""
+        response = await client.post(
+            INSIGHTS_ENDPOINT,
+            json={
+                "title": TEST_INSIGHT_TITLE,
+                "description": TEST_DESCRIPTION,
+                "product_ids": [str(product_id)],
+                "tags": ["Performance"],
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["products"] == [{"id": str(product_id), "name": "SonarQube"}]
+        assert [tag["name"] for tag in data["tags"]] == ["performance"]
+
+    @pytest.mark.anyio
+    async def test_create_with_unknown_product_returns_400(
+        self, client, auth_headers
+    ):
+        """Unknown product ids are rejected."""
+        response = await client.post(
+            INSIGHTS_ENDPOINT,
+            json={
+                "title": TEST_INSIGHT_TITLE,
+                "description": TEST_DESCRIPTION,
+                "product_ids": [str(uuid.uuid4())],
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.anyio
+    async def test_tag_too_long_returns_422(self, client, auth_headers):
+        """Tags longer than 50 characters are rejected on create and update."""
+        created = await client.post(
+            INSIGHTS_ENDPOINT,
+            json={"title": TEST_INSIGHT_TITLE, "description": TEST_DESCRIPTION},
+            headers=auth_headers,
+        )
+
+        create = await client.post(
+            INSIGHTS_ENDPOINT,
+            json={
+                "title": TEST_INSIGHT_TITLE,
+                "description": TEST_DESCRIPTION,
+                "tags": ["t" * 51],
+            },
+            headers=auth_headers,
+        )
+        update = await client.put(
+            f"{INSIGHTS_ENDPOINT}/{created.json()['id']}",
+            json={"tags": ["t" * 51]},
+            headers=auth_headers,
+        )
+
+        assert create.status_code == 422
+        assert update.status_code == 422
+
+    @pytest.mark.anyio
+    async def test_list_filters_by_product_and_tag(
+        self, client, auth_headers, product_id
+    ):
+        """product_id and tag narrow the list and its total."""
+        for tags in (["perf"], ["ux"]):
+            await client.post(
+                INSIGHTS_ENDPOINT,
+                json={
+                    "title": TEST_INSIGHT_TITLE,
+                    "description": TEST_DESCRIPTION,
+                    "product_ids": [str(product_id)],
+                    "tags": tags,
+                },
+                headers=auth_headers,
+            )
+        await client.post(
+            INSIGHTS_ENDPOINT,
+            json={"title": TEST_INSIGHT_TITLE, "description": TEST_DESCRIPTION},
+            headers=auth_headers,
+        )
+
+        by_product = await client.get(
+            INSIGHTS_ENDPOINT,
+            params={"product_id": str(product_id)},
+            headers=auth_headers,
+        )
+        by_tag = await client.get(
+            INSIGHTS_ENDPOINT,
+            params={"product_id": str(product_id), "tag": "perf"},
+            headers=auth_headers,
+        )
+
+        assert by_product.json()["total"] == 2
+        assert by_tag.json()["total"] == 1
+        assert by_tag.json()["items"][0]["tags"][0]["name"] == "perf"
+
+
+class TestCreateInsightsBatch:
+    """Tests for POST /api/v1/insights:batch."""
+
+    @pytest.mark.anyio
+    async def test_batch_json_array(self, client, auth_headers, product_id):
+        """Every valid item in a JSON array is created and listed."""
+        items = [
+            {"title": f"Insight {i}", "description": TEST_DESCRIPTION}
+            for i in range(3)
+        ]
+        items[0]["product_ids"] = [str(product_id)]
+
+        response = await client.post(BATCH_ENDPOINT, json=items, headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["created"], data["failed"]) == (3, 0)
+        assert all(item["status"] == "created" for item in data["items"])
+        listed = await client.get(
+            INSIGHTS_ENDPOINT,
+            params={"product_id": str(product_id)},
+            headers=auth_headers,
+        )
+        assert listed.json()["total"] == 1
+
+    @pytest.mark.anyio
+    async def test_batch_ndjson_reports_invalid_items(self, client, auth_headers):
+        """Bad lines and schema errors fail alone; the rest are created."""
+        lines = [
+            json.dumps({"title": TEST_INSIGHT_TITLE, "description": "One"}),
+            "{not json",
+            json.dumps({"title": "", "description": "Empty title"}),
+            json.dumps({"title": TEST_INSIGHT_TITLE, "description": "Two"}),
+        ]
+
+        response = await client.post(
+            BATCH_ENDPOINT,
+            content="\n".join(lines),
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        )
+
+        data = response.json()
+        assert (data["created"], data["failed"]) == (2, 2)
+        assert [item["status"] for item in data["items"]] == [
+            "created",
+            "invalid",
+            "invalid",
+            "created",
+        ]
+        assert data["items"][1]["errors"] == ["Invalid JSON"]
+        assert data["items"][2]["errors"][0].startswith("title:")
+
+    @pytest.mark.anyio
+    async def test_batch_unknown_product_rejects_item(
+        self, client, auth_headers, product_id
+    ):
+        """Only the item naming an unknown product is rejected."""
+        unknown = str(uuid.uuid4())
+        items = [
+            {
+                "title": title,
+                "description": SOME_DESCRIPTION,
+                "product_ids": [product],
+            }
+            for title, product in (("Known", str(product_id)), ("Unknown", unknown))
+        ]
+
+        response = await client.post(BATCH_ENDPOINT, json=items, headers=auth_headers)
+
+        data = response.json()
+        assert [item["status"] for item in data["items"]] == ["created", "invalid"]
+        assert unknown in data["items"][1]["errors"][0]
+
+    @pytest.mark.anyio
+    async def test_batch_non_array_returns_400(self, client, auth_headers):
+        """A JSON body that is not an array is rejected outright."""
+        response = await client.post(
+            BATCH_ENDPOINT,
+            json={"title": TEST_INSIGHT_TITLE, "description": TEST_DESCRIPTION},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.anyio
+    async def test_batch_requires_auth(self, client):
+        """Batch import is authenticated like single creates."""
+        response = await client.post(BATCH_ENDPOINT, json=[])
+
+        assert response.status_code == 401
+
+
+class TestExportInsights:
+    """Tests for GET /api/v1/insights/export."""
+
+    async def _create_insights(self, client, auth_headers, count, **fields):
+        items = [
+            {"title": f"Insight {i}", "description": TEST_DESCRIPTION, **fields}
+            for i in range(count)
+        ]
+        await client.post(BATCH_ENDPOINT, json=items, headers=auth_headers)
+
+    @pytest.mark.anyio
+    async def test_export_ndjson(self, client, auth_headers):
+        """The default export is one JSON object per line."""
+        await self._create_insights(client, auth_headers, 3)
+
+        response = await client.get(EXPORT_ENDPOINT, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "insights.ndjson" in response.headers["content-disposition"]
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(line["title"] for line in lines) == [
+            "Insight 0",
+            "Insight 1",
+            "Insight 2",
+        ]
+
+    @pytest.mark.anyio
+    async def test_export_csv(self, client, auth_headers):
+        """format=csv returns a CSV file with a header row."""
+        await self._create_insights(client, auth_headers, 2, tags=["perf"])
+
+        response = await client.get(
+            EXPORT_ENDPOINT, params={"format": "csv"}, headers=auth_headers
+        )
+
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 2
+        assert {row["tags"] for row in rows} == {"perf"}
+
+    @pytest.mark.anyio
+    async def test_export_applies_filters(self, client, auth_headers, product_id):
+        """Export takes the same product, tag and source filters as the list."""
+        await self._create_insights(
+            client, auth_headers, 1, product_ids=[str(product_id)]
+        )
+        await self._create_insights(client, auth_headers, 2)
+
+        response = await client.get(
+            EXPORT_ENDPOINT,
+            params={"product_id": str(product_id)},
+            headers=auth_headers,
+        )
+
+        assert len(response.text.splitlines()) == 1
+
+    @pytest.mark.anyio
+    async def test_export_is_not_an_insight_id(self, client, auth_headers):
+        """/export is routed to the export, not parsed as an insight id."""
+        response = await client.get(EXPORT_ENDPOINT, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.text == ""
+
+    @pytest.mark.anyio
+    async def test_export_requires_auth(self, client):
+        """Export is authenticated."""
+        response = await client.get(EXPORT_ENDPOINT)
+
+        assert response.status_code == 401
+
+
+class TestSearchInsights:
+    """Tests for GET /api/v1/insights?q=."""
+
+    @pytest.mark.anyio
+    async def test_search_returns_ranked_highlighted_matches(
+        self, client, auth_headers
+    ):
+        """Matching insights come back with a score and highlights."""
+        for title in ("Search is slow", "Unrelated"):
+            await client.post(
+                INSIGHTS_ENDPOINT,
+                json={"title": title, "description": TEST_DESCRIPTION},
+                headers=auth_headers,
+            )
+
+        response = await client.get(
+            INSIGHTS_ENDPOINT, params={"q": "slow search"}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        item = data["items"][0]
+        assert item["title"] == "Search is slow"
+        assert item["title_highlight"] == "<mark>Search</mark> is <mark>slow</mark>"
+        assert "score" in item
+        assert data["next_cursor"] is None
+
+    @pytest.mark.anyio
+    async def test_plain_list_has_no_search_fields(self, client, auth_headers):
+        """Without q, items do not carry search fields."""
+        await client.post(
+            INSIGHTS_ENDPOINT,
+            json={"title": TEST_INSIGHT_TITLE, "description": TEST_DESCRIPTION},
+            headers=auth_headers,
+        )
+
+        response = await client.get(INSIGHTS_ENDPOINT, headers=auth_headers)
+
+        assert "score" not in response.json()["items"][0]
+
+    @pytest.mark.anyio
+    async def test_search_with_cursor_returns_400(self, client, auth_headers):
+        """Search results are paged by offset, not cursor."""
+        response = await client.get(
+            INSIGHTS_ENDPOINT,
+            params={"q": "anything", "cursor": "abc"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+
+
 class TestCreateInsight:
     """Tests for POST /api/v1/insights."""
 
@@ -185,6 +616,33 @@ class TestGetInsight:
         assert response.status_code == 404
 
 
+@pytest.fixture
+def other_headers(engine):
+    """Auth headers for a second user who owns no insights."""
+    with Session(engine) as session:
+        session.add(
+            UserDB(
+                id=uuid.uuid4(),
+                email="owner-check@example.com",
+                name="Other User",
+                hashed_password=get_password_hash("password"),
+                role="advocate",
+            )
+        )
+        session.commit()
+    token = create_access_token(data={"sub": "owner-check@example.com"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def _create(client, auth_headers, title=TEST_INSIGHT_TITLE):
+    response = await client.post(
+        INSIGHTS_ENDPOINT,
+        json={"title": title, "description": TEST_DESCRIPTION},
+        headers=auth_headers,
+    )
+    return response.json()["id"]
+
+
 class TestUpdateInsight:
     """Tests for PUT /api/v1/insights/{id}."""
 
@@ -228,6 +686,87 @@ class TestUpdateInsight:
 
         assert response.status_code == 404
 
+    @pytest.mark.anyio
+    async def test_update_insight_not_owner(self, client, auth_headers, other_headers):
+        """Returns 403 and leaves the insight unchanged for another user."""
+        insight_id = await _create(client, auth_headers)
+
+        response = await client.put(
+            f"{INSIGHTS_ENDPOINT}/{insight_id}",
+            json={"title": "Hijacked"},
+            headers=other_headers,
+        )
+        current = await client.get(
+            f"{INSIGHTS_ENDPOINT}/{insight_id}", headers=auth_headers
+        )
+
+        assert response.status_code == 403
+        assert current.json()["title"] == TEST_INSIGHT_TITLE
+
+    @pytest.mark.anyio
+    async def test_update_insight_single_write(
+        self, client, auth_headers, async_engine
+    ):
+        """A PUT is one UPDATE ... RETURNING, with no SELECT of the insight."""
+        insight_id = await _create(client, auth_headers)
+        statements = []
+        event.listen(
+            async_engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        response = await client.put(
+            f"{INSIGHTS_ENDPOINT}/{insight_id}",
+            json={"title": "Updated title"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert [s for s in statements if "FROM insights" in s] == []
+        assert len([s for s in statements if s.startswith("UPDATE insights")]) == 1
+
+    @pytest.mark.anyio
+    async def test_update_without_links_runs_four_statements(
+        self, client, auth_headers
+    ):
+        """The UPDATE, one load per link collection and the version bump."""
+        insight_id = await _create(client, auth_headers)
+
+        with assert_max_queries(4):
+            response = await client.put(
+                f"{INSIGHTS_ENDPOINT}/{insight_id}",
+                json={"title": "Updated title"},
+                headers=auth_headers,
+            )
+
+        assert response.status_code == 200
+
+    @pytest.mark.anyio
+    async def test_update_replaces_links(self, client, auth_headers, product_id):
+        """Given links replace the old ones without loading them first."""
+        created = await client.post(
+            INSIGHTS_ENDPOINT,
+            json={
+                "title": TEST_INSIGHT_TITLE,
+                "description": TEST_DESCRIPTION,
+                "product_ids": [str(product_id)],
+                "tags": ["old"],
+            },
+            headers=auth_headers,
+        )
+        url = f"{INSIGHTS_ENDPOINT}/{created.json()['id']}"
+
+        response = await client.put(
+            url, json={"product_ids": [], "tags": ["ux", "Perf"]}, headers=auth_headers
+        )
+        current = await client.get(url, headers=auth_headers)
+
+        assert response.status_code == 200
+        for data in (response.json(), current.json()):
+            assert data["products"] == []
+            assert [tag["name"] for tag in data["tags"]] == ["perf", "ux"]
+
 
 class TestDeleteInsight:
     """Tests for DELETE /api/v1/insights/{id}."""
@@ -269,6 +808,139 @@ class TestDeleteInsight:
 
         assert response.status_code == 404
 
+    @pytest.mark.anyio
+    async def test_delete_insight_not_owner(self, client, auth_headers, other_headers):
+        """Returns 403 and keeps the insight for another user."""
+        insight_id = await _create(client, auth_headers)
+
+        response = await client.delete(
+            f"{INSIGHTS_ENDPOINT}/{insight_id}", headers=other_headers
+        )
+        current = await client.get(
+            f"{INSIGHTS_ENDPOINT}/{insight_id}", headers=auth_headers
+        )
+
+        assert response.status_code == 403
+        assert current.status_code == 200
+
+
+class TestConditionalGet:
+    """Tests for ETag and Last-Modified handling on insight reads."""
+
+    @pytest.mark.anyio
+    async def test_get_insight_has_validators(self, client, auth_headers):
+        """A single insight carries an ETag and Last-Modified."""
+        insight_id = await _create(client, auth_headers)
+
+        response = await client.get(
+            f"{INSIGHTS_ENDPOINT}/{insight_id}", headers=auth_headers
+        )
+
+        assert response.headers["etag"]
+        assert response.headers["last-modified"].endswith("GMT")
+
+    @pytest.mark.anyio
+    async def test_matching_etag_is_304_without_loading(self, client, auth_headers):
+        """A current ETag gets an empty 304 after one updated_at lookup."""
+        insight_id = await _create(client, auth_headers)
+        url = f"{INSIGHTS_ENDPOINT}/{insight_id}"
+        etag = (await client.get(url, headers=auth_headers)).headers["etag"]
+
+        with assert_max_queries(1):
+            response = await client.get(
+                url, headers={**auth_headers, "If-None-Match": etag}
+            )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    @pytest.mark.anyio
+    async def test_update_changes_etag(self, client, auth_headers):
+        """After an update the old ETag gets the full insight."""
+        insight_id = await _create(client, auth_headers)
+        url = f"{INSIGHTS_ENDPOINT}/{insight_id}"
+        etag = (await client.get(url, headers=auth_headers)).headers["etag"]
+        await client.put(url, json={"title": "Renamed"}, headers=auth_headers)
+
+        response = await client.get(
+            url, headers={**auth_headers, "If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["title"] == "Renamed"
+        assert response.headers["etag"] != etag
+
+    @pytest.mark.anyio
+    async def test_if_modified_since(self, client, auth_headers):
+        """Last-Modified sent back as If-Modified-Since gets a 304."""
+        insight_id = await _create(client, auth_headers)
+        url = f"{INSIGHTS_ENDPOINT}/{insight_id}"
+        last_modified = (await client.get(url, headers=auth_headers)).headers[
+            "last-modified"
+        ]
+
+        response = await client.get(
+            url, headers={**auth_headers, "If-Modified-Since": last_modified}
+        )
+
+        assert response.status_code == 304
+
+    @pytest.mark.anyio
+    async def test_conditional_get_of_missing_insight(self, client, auth_headers):
+        """A missing insight is still a 404."""
+        response = await client.get(
+            f"{INSIGHTS_ENDPOINT}/{uuid.uuid4()}",
+            headers={**auth_headers, "If-None-Match": '"0"'},
+        )
+
+        assert response.status_code == 404
+
+    @pytest.mark.anyio
+    async def test_list_is_304_from_version_lookup(self, client, auth_headers):
+        """An unchanged list gets a 304 from the version row alone."""
+        await _create(client, auth_headers)
+        etag = (await client.get(INSIGHTS_ENDPOINT, headers=auth_headers)).headers[
+            "etag"
+        ]
+
+        with assert_max_queries(1):
+            response = await client.get(
+                INSIGHTS_ENDPOINT, headers={**auth_headers, "If-None-Match": etag}
+            )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+
+    @pytest.mark.anyio
+    async def test_list_etag_changes_on_create_and_delete(self, client, auth_headers):
+        """Creating or deleting an insight invalidates the list ETag."""
+        first = (await client.get(INSIGHTS_ENDPOINT, headers=auth_headers)).headers
+        insight_id = await _create(client, auth_headers)
+        second = (await client.get(INSIGHTS_ENDPOINT, headers=auth_headers)).headers
+        await client.delete(f"{INSIGHTS_ENDPOINT}/{insight_id}", headers=auth_headers)
+
+        response = await client.get(
+            INSIGHTS_ENDPOINT,
+            headers={**auth_headers, "If-None-Match": second["etag"]},
+        )
+
+        assert first["etag"] != second["etag"]
+        assert response.status_code == 200
+        assert response.json()["items"] == []
+
+    @pytest.mark.anyio
+    async def test_search_results_carry_list_etag(self, client, auth_headers):
+        """Search responses use the same collection validators."""
+        await _create(client, auth_headers)
+        listed = await client.get(INSIGHTS_ENDPOINT, headers=auth_headers)
+
+        response = await client.get(
+            INSIGHTS_ENDPOINT, params={"q": "test"}, headers=auth_headers
+        )
+
+        assert response.headers["etag"] == listed.headers["etag"]
+
 
 class TestInsightLogging:
     """Tests for insight CRUD operation logging."""
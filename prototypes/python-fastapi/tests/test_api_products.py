@@ -0,0 +1,73 @@
+"""Tests for the products API endpoints."""
+import pytest
+
+# Test constants
+PRODUCTS_ENDPOINT = "/api/v1/products"
+INSIGHTS_ENDPOINT = "/api/v1/insights"
+
+
+async def create_product(client, headers, name):
+    response = await client.post(
+        PRODUCTS_ENDPOINT, json={"name": name}, headers=headers
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+class TestProductsApi:
+    """Tests for GET and POST /api/v1/products."""
+
+    @pytest.mark.anyio
+    async def test_create_product(self, client, auth_headers):
+        """Creating a product returns it with a zero insight count."""
+        product = await create_product(client, auth_headers, "SonarQube")
+
+        assert product["name"] == "SonarQube"
+        assert product["insight_count"] == 0
+
+    @pytest.mark.anyio
+    async def test_duplicate_name_returns_409(self, client, auth_headers):
+        """Product names must be unique."""
+        await create_product(client, auth_headers, "SonarQube")
+
+        response = await client.post(
+            PRODUCTS_ENDPOINT, json={"name": "SonarQube"}, headers=auth_headers
+        )
+
+        assert response.status_code == 409
+
+    @pytest.mark.anyio
+    async def test_list_sorted_by_insight_count(self, client, auth_headers):
+        """sort=insight_count orders by the precomputed counts."""
+        quiet = await create_product(client, auth_headers, "Quiet")
+        busy = await create_product(client, auth_headers, "Busy")
+        for product_ids in ([busy["id"]], [busy["id"], quiet["id"]]):
+            await client.post(
+                INSIGHTS_ENDPOINT,
+                json={
+                    "title": "Linked",
+                    "description": "Linked insight",
+                    "product_ids": product_ids,
+                },
+                headers=auth_headers,
+            )
+
+        response = await client.get(
+            PRODUCTS_ENDPOINT,
+            params={"sort": "insight_count"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert [(p["name"], p["insight_count"]) for p in items] == [
+            ("Busy", 2),
+            ("Quiet", 1),
+        ]
+
+    @pytest.mark.anyio
+    async def test_list_requires_auth(self, client):
+        """Returns 401 when no token provided."""
+        response = await client.get(PRODUCTS_ENDPOINT)
+
+        assert response.status_code == 401
@@ -0,0 +1,89 @@
+"""Tests for batch import parsing."""
+import json
+
+import pytest
+
+from app.batch import (
+    BATCH_MAX_ITEMS,
+    INVALID_JSON,
+    BatchBodyError,
+    BatchTooLargeError,
+    is_ndjson,
+    parse_batch,
+)
+
+# Test constants
+VALID_ITEM = {"title": "Batch insight", "description": "From a batch"}
+
+
+class TestIsNdjson:
+    """Tests for is_ndjson."""
+
+    @pytest.mark.parametrize(
+        "content_type",
+        [
+            "application/x-ndjson",
+            "application/jsonl",
+            "Application/NDJSON; charset=utf-8",
+        ],
+    )
+    def test_ndjson_types(self, content_type):
+        """NDJSON media types are recognised, ignoring case and parameters."""
+        assert is_ndjson(content_type)
+
+    @pytest.mark.parametrize("content_type", ["application/json", "text/plain", ""])
+    def test_other_types(self, content_type):
+        """Anything else is treated as JSON."""
+        assert not is_ndjson(content_type)
+
+
+class TestParseBatch:
+    """Tests for parse_batch."""
+
+    def test_json_array(self):
+        """Each element of a JSON array becomes a validated item."""
+        items = parse_batch(json.dumps([VALID_ITEM, VALID_ITEM]).encode(), False)
+
+        assert [item.index for item in items] == [0, 1]
+        assert all(item.data.title == VALID_ITEM["title"] for item in items)
+        assert all(item.errors == [] for item in items)
+
+    def test_invalid_item_reports_field(self):
+        """Schema errors reject only their own item and name the field."""
+        items = parse_batch(
+            json.dumps([VALID_ITEM, {"description": "No title"}]).encode(), False
+        )
+
+        assert items[0].data is not None
+        assert items[1].data is None
+        assert items[1].errors[0].startswith("title:")
+
+    def test_ndjson_skips_blank_lines(self):
+        """Blank lines do not count as items."""
+        body = f"{json.dumps(VALID_ITEM)}\n\n{json.dumps(VALID_ITEM)}\n"
+
+        assert len(parse_batch(body.encode(), True)) == 2
+
+    def test_ndjson_bad_line_rejects_only_that_item(self):
+        """A line that is not JSON is reported without failing the batch."""
+        body = f"{json.dumps(VALID_ITEM)}\n{{not json\n{json.dumps(VALID_ITEM)}"
+
+        items = parse_batch(body.encode(), True)
+
+        assert [item.errors for item in items] == [[], [INVALID_JSON], []]
+
+    @pytest.mark.parametrize(
+        "body",
+        [b"{not json", json.dumps(VALID_ITEM).encode(), b"\xff\xfe"],
+    )
+    def test_unusable_json_body_raises(self, body):
+        """A JSON body must decode and be an array."""
+        with pytest.raises(BatchBodyError):
+            parse_batch(body, False)
+
+    def test_too_many_items_raises(self):
+        """Batches over the limit are refused before validation."""
+        body = "\n".join(["{}"] * (BATCH_MAX_ITEMS + 1)).encode()
+
+        with pytest.raises(BatchTooLargeError):
+            parse_batch(body, True)
@@ -0,0 +1,75 @@
+"""Tests for the load test percentile and regression helpers."""
+from benchmarks.compare import regressions
+from benchmarks.loadtest import percentile
+
+
+def report(**results) -> dict:
+    """A load test report with the given per-scenario p95 and rps."""
+    return {
+        "meta": {"commit": None},
+        "results": {
+            name: {"p95_ms": p95_ms, "rps": rps}
+            for name, (p95_ms, rps) in results.items()
+        },
+    }
+
+
+class TestPercentile:
+    """Tests for nearest-rank percentiles."""
+
+    def test_empty_list_is_zero(self):
+        """No samples give a percentile of zero."""
+        assert percentile([], 0.95) == 0.0
+
+    def test_nearest_rank(self):
+        """The value at rank round(fraction * n) is returned."""
+        values = [float(i) for i in range(1, 101)]
+
+        assert percentile(values, 0.50) == 50.0
+        assert percentile(values, 0.95) == 95.0
+        assert percentile(values, 0.99) == 99.0
+
+    def test_small_samples_stay_in_range(self):
+        """Low and high fractions clamp to the first and last values."""
+        assert percentile([3.0], 0.99) == 3.0
+        assert percentile([1.0, 2.0], 0.0) == 1.0
+        assert percentile([1.0, 2.0], 1.0) == 2.0
+
+
+class TestRegressions:
+    """Tests for flagging regressions between two reports."""
+
+    def test_changes_within_threshold_pass(self):
+        """Small moves either way are not regressions."""
+        base = report(list=(10.0, 100.0))
+        head = report(list=(10.9, 91.0))
+
+        assert regressions(base, head, threshold=10) == []
+
+    def test_slower_p95_is_flagged(self):
+        """A p95 rise past the threshold is reported."""
+        base = report(list=(10.0, 100.0))
+        head = report(list=(12.0, 100.0))
+
+        assert regressions(base, head, threshold=10) == ["list: p95 +20.0%"]
+
+    def test_lower_throughput_is_flagged(self):
+        """A throughput drop past the threshold is reported."""
+        base = report(get=(5.0, 200.0))
+        head = report(get=(5.0, 150.0))
+
+        assert regressions(base, head, threshold=10) == ["get: rps -25.0%"]
+
+    def test_improvements_are_not_flagged(self):
+        """Faster and higher-throughput results never count."""
+        base = report(list=(10.0, 100.0))
+        head = report(list=(5.0, 200.0))
+
+        assert regressions(base, head, threshold=10) == []
+
+    def test_scenarios_missing_from_base_are_skipped(self):
+        """A new scenario has nothing to regress against."""
+        base = report(list=(10.0, 100.0))
+        head = report(list=(10.0, 100.0), list_cached=(99.0, 1.0))
+
+        assert regressions(base, head, threshold=10) == []
@@ -0,0 +1,141 @@
+"""Tests for in-process caching primitives."""
+from app.cache import TTLCache
+
+
+class FakeClock:
+    """Manually advanced clock for expiry tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_get_returns_stored_value(self):
+        """A stored value is returned and counted as a hit."""
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.stats().hits == 1
+
+    def test_missing_key_counts_as_miss(self):
+        """Looking up an absent key returns None and counts a miss."""
+        cache = TTLCache(maxsize=2, ttl=10)
+
+        assert cache.get("a") is None
+        assert cache.stats().misses == 1
+
+    def test_entry_expires_after_ttl(self):
+        """Entries are dropped once their TTL has elapsed."""
+        clock = FakeClock()
+        cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 10.0
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_per_entry_ttl_cannot_exceed_default(self):
+        """A per-entry ttl shortens, but never extends, the lifetime."""
+        clock = FakeClock()
+        cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+        cache.set("short", 1, ttl=2)
+        cache.set("long", 2, ttl=100)
+
+        clock.now = 5.0
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+
+        clock.now = 10.0
+        assert cache.get("long") is None
+
+    def test_non_positive_ttl_is_not_stored(self):
+        """An already-expired entry is never stored."""
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1, ttl=0)
+
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        """The LRU entry goes first when the cache is full."""
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats().evictions == 1
+
+    def test_invalidate_removes_entry(self):
+        """invalidate drops a single key."""
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+
+        cache.invalidate("a")
+
+        assert cache.get("a") is None
+
+    def test_hit_ratio(self):
+        """hit_ratio is hits over lookups."""
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+
+        assert cache.stats().hit_ratio == 0.5
+
+    def test_sizeof_tracks_bytes(self):
+        """With a sizeof, stats report the entries' total size."""
+        cache = TTLCache(maxsize=4, ttl=10, sizeof=len)
+        cache.set("a", b"12345")
+        cache.set("b", b"123")
+        cache.set("a", b"1")
+
+        assert cache.stats().bytes == 4
+
+        cache.invalidate("b")
+        assert cache.stats().bytes == 1
+        cache.clear()
+        assert cache.stats().bytes == 0
+
+    def test_maxbytes_evicts_least_recently_used(self):
+        """Entries are evicted until the total size fits maxbytes."""
+        cache = TTLCache(maxsize=10, ttl=10, sizeof=len, maxbytes=8)
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+
+        cache.set("c", b"12")
+
+        assert cache.get("a") is None
+        assert cache.stats().bytes == 6
+        assert cache.stats().evictions == 1
+
+    def test_entry_larger_than_maxbytes_is_not_stored(self):
+        """A value that could never fit is skipped, keeping the rest."""
+        cache = TTLCache(maxsize=10, ttl=10, sizeof=len, maxbytes=4)
+        cache.set("a", b"12")
+
+        cache.set("b", b"12345")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"12"
+
+    def test_expired_entry_releases_bytes(self):
+        """An entry dropped on expiry no longer counts towards the size."""
+        clock = FakeClock()
+        cache = TTLCache(maxsize=2, ttl=10, clock=clock, sizeof=len)
+        cache.set("a", b"123")
+        clock.now = 10.0
+
+        cache.get("a")
+
+        assert cache.stats().bytes == 0
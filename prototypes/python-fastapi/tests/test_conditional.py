@@ -0,0 +1,125 @@
+"""Tests for conditional GET validators."""
+from datetime import datetime, timezone
+
+from starlette.datastructures import Headers
+
+from app.conditional import (
+    Validators,
+    etag_matches,
+    is_conditional,
+    parse_http_date,
+)
+
+# Test constants
+UPDATED_AT = datetime(2026, 3, 1, 12, 30, 15, 250000, tzinfo=timezone.utc)
+HTTP_DATE = "Sun, 01 Mar 2026 12:30:15 GMT"
+
+
+class TestEtagMatches:
+    """Tests for If-None-Match comparison."""
+
+    def test_exact_match(self):
+        """A listed ETag matches."""
+        assert etag_matches('"abc"', '"abc"')
+
+    def test_any_of_several(self):
+        """Any ETag of a comma-separated list matches."""
+        assert etag_matches('"x", "abc" , "y"', '"abc"')
+
+    def test_weak_comparison(self):
+        """W/ prefixes are ignored on either side."""
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches('"abc"', 'W/"abc"')
+
+    def test_wildcard(self):
+        """* matches any current representation."""
+        assert etag_matches("*", '"abc"')
+
+    def test_mismatch(self):
+        """A different ETag does not match."""
+        assert not etag_matches('"abd"', '"abc"')
+
+
+class TestParseHttpDate:
+    """Tests for parse_http_date."""
+
+    def test_parses_imf_fixdate(self):
+        """The usual HTTP date format parses to UTC."""
+        assert parse_http_date(HTTP_DATE) == UPDATED_AT.replace(microsecond=0)
+
+    def test_malformed_or_missing_is_none(self):
+        """Unparseable or absent dates are ignored."""
+        assert parse_http_date("yesterday") is None
+        assert parse_http_date(None) is None
+
+
+class TestValidators:
+    """Tests for Validators."""
+
+    def test_insight_headers(self):
+        """ETag and Last-Modified come from updated_at."""
+        headers = Validators.for_insight(UPDATED_AT).headers()
+
+        assert headers["Last-Modified"] == HTTP_DATE
+        assert headers["ETag"].startswith('"')
+        assert headers["Cache-Control"] == "private, no-cache"
+
+    def test_naive_datetimes_are_utc(self):
+        """SQLite's naive datetimes give the same validators."""
+        naive = UPDATED_AT.replace(tzinfo=None)
+
+        assert Validators.for_insight(naive) == Validators.for_insight(UPDATED_AT)
+
+    def test_insight_etag_changes_with_updated_at(self):
+        """Any change to updated_at changes the ETag."""
+        later = UPDATED_AT.replace(microsecond=250001)
+
+        assert Validators.for_insight(later).etag != (
+            Validators.for_insight(UPDATED_AT).etag
+        )
+
+    def test_collection_etag_is_version(self):
+        """List ETags name the collection version."""
+        validators = Validators.for_collection(7, None)
+
+        assert validators.etag == '"v7"'
+        assert "Last-Modified" not in validators.headers()
+
+    def test_not_modified_by_etag(self):
+        """A matching If-None-Match is not modified."""
+        validators = Validators.for_collection(7, UPDATED_AT)
+
+        assert validators.not_modified(Headers({"if-none-match": '"v7"'}))
+        assert not validators.not_modified(Headers({"if-none-match": '"v6"'}))
+
+    def test_if_none_match_takes_precedence(self):
+        """A stale ETag wins over a current If-Modified-Since."""
+        validators = Validators.for_collection(7, UPDATED_AT)
+        headers = Headers(
+            {"if-none-match": '"v6"', "if-modified-since": HTTP_DATE}
+        )
+
+        assert not validators.not_modified(headers)
+
+    def test_not_modified_since(self):
+        """If-Modified-Since compares at one-second resolution."""
+        validators = Validators.for_insight(UPDATED_AT)
+
+        assert validators.not_modified(Headers({"if-modified-since": HTTP_DATE}))
+        assert not validators.not_modified(
+            Headers({"if-modified-since": "Sun, 01 Mar 2026 12:30:14 GMT"})
+        )
+
+    def test_not_modified_response(self):
+        """304 responses are empty but carry the validators."""
+        response = Validators.for_collection(7, UPDATED_AT).not_modified_response()
+
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == '"v7"'
+
+    def test_is_conditional(self):
+        """Either conditional header makes a request conditional."""
+        assert is_conditional(Headers({"if-none-match": '"v7"'}))
+        assert is_conditional(Headers({"if-modified-since": HTTP_DATE}))
+        assert not is_conditional(Headers({"accept": "application/json"}))
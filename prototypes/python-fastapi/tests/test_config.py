@@ -0,0 +1,191 @@
+"""Tests for application settings."""
+import pytest
+from pydantic import ValidationError
+
+from app.config import (
+    DEFAULT_BCRYPT_MAX_WORKERS,
+    ROUTE_QUERY_BUDGETS,
+    DatabaseSettings,
+    LoggingSettings,
+    PasswordHashSettings,
+    QueryBudgetSettings,
+    async_url_for,
+    sync_url_for,
+)
+
+
+class TestDatabaseSettings:
+    """Tests for DatabaseSettings."""
+
+    def test_defaults_favour_concurrency(self):
+        """WAL with synchronous=NORMAL and a busy timeout by default."""
+        settings = DatabaseSettings()
+
+        assert settings.journal_mode == "wal"
+        assert settings.synchronous == "normal"
+        assert settings.busy_timeout_ms > 0
+
+    def test_reads_environment(self, monkeypatch):
+        """INSIDER_DB_* variables override the defaults."""
+        monkeypatch.setenv("INSIDER_DB_URL", "sqlite:////tmp/other.db")
+        monkeypatch.setenv("INSIDER_DB_SYNCHRONOUS", "full")
+        monkeypatch.setenv("INSIDER_DB_POOL_SIZE", "12")
+
+        settings = DatabaseSettings()
+
+        assert settings.url == "sqlite:////tmp/other.db"
+        assert settings.synchronous == "full"
+        assert settings.pool_size == 12
+
+    def test_rejects_unknown_synchronous_mode(self):
+        """Only SQLite's synchronous levels are accepted."""
+        with pytest.raises(ValidationError):
+            DatabaseSettings(synchronous="sometimes")
+
+    @pytest.mark.parametrize(
+        ("url", "async_url", "expected"),
+        [
+            ("sqlite:///./insider.db", None, "sqlite+aiosqlite:///./insider.db"),
+            ("sqlite://", None, "sqlite+aiosqlite://"),
+            ("sqlite:///a.db", "sqlite+aiosqlite:///b.db", "sqlite+aiosqlite:///b.db"),
+        ],
+    )
+    def test_resolved_async_url(self, url, async_url, expected):
+        """The async URL is derived from a SQLite url unless given."""
+        settings = DatabaseSettings(url=url, async_url=async_url)
+
+        assert settings.resolved_async_url == expected
+
+    def test_default_cache_size_bounds_pooled_memory(self):
+        """Full sync and async pools together stay under 512 MiB of cache."""
+        settings = DatabaseSettings()
+        connections = 2 * (settings.pool_size + settings.max_overflow)
+
+        assert settings.cache_size_kib * connections <= 512 * 1024
+
+    def test_cache_size_is_in_kib(self):
+        """cache_size is passed negative so SQLite reads it as KiB."""
+        pragmas = DatabaseSettings(cache_size_kib=2048).pragmas()
+
+        assert pragmas["cache_size"] == -2048
+
+
+class TestAsyncUrlFor:
+    """Tests for async_url_for."""
+
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            (
+                "postgresql://app:secret@db:5432/insider",
+                "postgresql+psycopg://app:secret@db:5432/insider",
+            ),
+            ("postgresql+asyncpg://db/insider", "postgresql+asyncpg://db/insider"),
+            ("sqlite+aiosqlite:///x.db", "sqlite+aiosqlite:///x.db"),
+        ],
+    )
+    def test_async_url_for(self, url, expected):
+        """Bare backends get their async driver; explicit drivers are kept."""
+        assert async_url_for(url) == expected
+
+    def test_replica_async_url_derived(self):
+        """The replica's async URL is derived like the primary's."""
+        settings = DatabaseSettings(replica_url="postgresql://replica/insider")
+
+        assert (
+            settings.resolved_replica_async_url
+            == "postgresql+psycopg://replica/insider"
+        )
+        assert DatabaseSettings().resolved_replica_async_url is None
+
+
+class TestSyncUrlFor:
+    """Tests for sync_url_for."""
+
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            (
+                "postgresql://app:secret@db:5432/insider",
+                "postgresql+psycopg://app:secret@db:5432/insider",
+            ),
+            ("postgresql+psycopg2://db/insider", "postgresql+psycopg2://db/insider"),
+            ("sqlite:///x.db", "sqlite:///x.db"),
+        ],
+    )
+    def test_sync_url_for(self, url, expected):
+        """A bare postgresql URL gets psycopg 3 instead of psycopg2."""
+        assert sync_url_for(url) == expected
+
+
+class TestQueryBudgetSettings:
+    """Tests for QueryBudgetSettings."""
+
+    def test_disabled_with_insight_route_budgets(self):
+        """Off by default, with the built-in insight route budgets."""
+        settings = QueryBudgetSettings()
+
+        assert settings.enabled is False
+        assert settings.routes == ROUTE_QUERY_BUDGETS
+
+    def test_reads_routes_as_json(self, monkeypatch):
+        """INSIDER_QUERY_BUDGET_ROUTES is a JSON object of budgets."""
+        monkeypatch.setenv("INSIDER_QUERY_BUDGET_ENABLED", "true")
+        monkeypatch.setenv(
+            "INSIDER_QUERY_BUDGET_ROUTES", '{"GET /api/v1/insights": 2}'
+        )
+
+        settings = QueryBudgetSettings()
+
+        assert settings.enabled is True
+        assert settings.routes == {"GET /api/v1/insights": 2}
+
+
+class TestLoggingSettings:
+    """Tests for LoggingSettings."""
+
+    def test_logs_every_request_by_default(self):
+        """Sampling is off unless configured."""
+        settings = LoggingSettings()
+
+        assert settings.sample_rate == 1
+        assert settings.route_sample_rates == {}
+        assert settings.slow_request_ms == 1000.0
+
+    def test_reads_environment(self, monkeypatch):
+        """Sample rates and the slow threshold come from INSIDER_LOG_*."""
+        monkeypatch.setenv("INSIDER_LOG_SAMPLE_RATE", "10")
+        monkeypatch.setenv(
+            "INSIDER_LOG_ROUTE_SAMPLE_RATES", '{"GET /api/v1/insights": 100}'
+        )
+        monkeypatch.setenv("INSIDER_LOG_SLOW_REQUEST_MS", "250")
+
+        settings = LoggingSettings()
+
+        assert settings.sample_rate == 10
+        assert settings.route_sample_rates == {"GET /api/v1/insights": 100}
+        assert settings.slow_request_ms == 250.0
+
+
+class TestPasswordHashSettings:
+    """Tests for PasswordHashSettings."""
+
+    def test_defaults_to_at_most_four_workers(self):
+        """The default worker count is capped at four."""
+        settings = PasswordHashSettings()
+
+        assert settings.max_workers == DEFAULT_BCRYPT_MAX_WORKERS
+        assert 1 <= settings.max_workers <= 4
+
+    def test_reads_environment(self, monkeypatch):
+        """INSIDER_BCRYPT_MAX_WORKERS sets the worker count."""
+        monkeypatch.setenv("INSIDER_BCRYPT_MAX_WORKERS", "8")
+
+        assert PasswordHashSettings().max_workers == 8
+
+    def test_rejects_zero_workers(self, monkeypatch):
+        """At least one worker is required."""
+        monkeypatch.setenv("INSIDER_BCRYPT_MAX_WORKERS", "0")
+
+        with pytest.raises(ValidationError):
+            PasswordHashSettings()
@@ -1,14 +1,33 @@
 """Tests for database persistence - TDD: write tests first."""
 import uuid
+from datetime import datetime
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 
-from app.database import Base, get_db
-from app.db_models import InsightDB
-from app.db_repository import InsightDBRepository
-from app.models import Insight, Source
+from app.config import DatabaseSettings
+from app.database import (
+    Base,
+    create_async_database_engine,
+    create_database_engine,
+    engine_options,
+    find_missing_indexes,
+    get_db,
+)
+from app.db_models import InsightDB, ProductDB, insight_products, insight_tags
+from app.db_repository import (
+    AsyncInsightDBRepository,
+    InsightDBRepository,
+    InsightNotOwnedError,
+    UnknownProductError,
+)
+from app.models import Insight, InsightFilters, Source
+from app.pagination import TotalMode, insight_count_cache
+from app.repository import InsightRepository
+from app.search import FTS_TABLE, install_search_index
 
 # Test constants
 TEST_INSIGHT_TITLE = "Test insight"
@@ -38,6 +57,82 @@ def repository(session):
     return InsightDBRepository(session)
 
 
+@pytest.fixture
+async def async_session():
+    """Create an async session on an in-memory SQLite database."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def async_repository(async_session):
+    """Create an async repository with test session."""
+    return AsyncInsightDBRepository(async_session)
+
+
+class TestDatabaseEngine:
+    """Tests for engine creation from DatabaseSettings."""
+
+    def _pragma(self, conn, name):
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+    def test_pragmas_applied_on_connect(self, tmp_path):
+        """Every new connection gets the configured PRAGMAs."""
+        settings = DatabaseSettings(
+            url=f"sqlite:///{tmp_path / 'tuned.db'}",
+            busy_timeout_ms=1234,
+            cache_size_kib=4096,
+            mmap_size=1 << 20,
+        )
+        engine = create_database_engine(settings)
+
+        with engine.connect() as conn:
+            assert self._pragma(conn, "journal_mode") == "wal"
+            assert self._pragma(conn, "synchronous") == 1
+            assert self._pragma(conn, "busy_timeout") == 1234
+            assert self._pragma(conn, "cache_size") == -4096
+            assert self._pragma(conn, "mmap_size") == 1 << 20
+        assert engine.pool.size() == settings.pool_size
+        engine.dispose()
+
+    async def test_async_engine_gets_pragmas(self, tmp_path):
+        """The aiosqlite engine applies the same PRAGMAs."""
+        settings = DatabaseSettings(
+            url=f"sqlite:///{tmp_path / 'tuned.db'}", synchronous="full"
+        )
+        async_engine = create_async_database_engine(settings)
+
+        async with async_engine.connect() as conn:
+            journal_mode = await conn.scalar(text("PRAGMA journal_mode"))
+            synchronous = await conn.scalar(text("PRAGMA synchronous"))
+
+        assert (journal_mode, synchronous) == ("wal", 2)
+        await async_engine.dispose()
+
+    def test_in_memory_database_has_no_pool_settings(self):
+        """Pool sizes are not passed for in-memory SQLite."""
+        engine = create_database_engine(DatabaseSettings(url="sqlite://"))
+
+        with engine.connect() as conn:
+            assert self._pragma(conn, "busy_timeout") == 5000
+        engine.dispose()
+
+    def test_server_database_gets_queue_pool_options(self):
+        """PostgreSQL URLs get pool sizing and pre-ping."""
+        settings = DatabaseSettings(pool_size=20, max_overflow=5)
+
+        options = engine_options("postgresql://db/insider", settings)
+
+        assert options["pool_size"] == 20
+        assert options["max_overflow"] == 5
+        assert options["pool_pre_ping"] is True
+        assert "connect_args" not in options
+
+
 class TestInsightDBModel:
     """Tests for the InsightDB SQLAlchemy model."""
 
@@ -81,6 +176,45 @@ class TestInsightDBModel:
         assert domain_insight.source == Source.CONFERENCE
 
 
+class TestInsightIndexes:
+    """Tests for the indexes declared on the insights table."""
+
+    def test_declared_indexes_are_created(self, engine):
+        """create_all builds every index listed in the data model."""
+        names = {ix["name"] for ix in inspect(engine).get_indexes("insights")}
+
+        assert {
+            "ix_insights_author_id",
+            "ix_insights_source",
+            "ix_insights_created_at_id",
+        } <= names
+
+    def test_no_missing_indexes_on_fresh_database(self, engine):
+        """A freshly created schema reports nothing missing."""
+        assert find_missing_indexes(engine) == []
+
+    def test_reports_missing_index(self, engine):
+        """An index dropped from an existing database is reported."""
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_insights_source"))
+
+        assert find_missing_indexes(engine) == ["insights.ix_insights_source"]
+
+    def test_list_query_uses_paging_index(self, engine):
+        """The list ordering is served by the composite index, not a sort."""
+        with engine.connect() as conn:
+            plan = conn.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT * FROM insights "
+                    "ORDER BY created_at DESC, id LIMIT 20"
+                )
+            ).all()
+
+        details = " ".join(row[-1] for row in plan)
+        assert "ix_insights_created_at_id" in details
+        assert "TEMP B-TREE" not in details
+
+
 class TestInsightDBRepository:
     """Tests for the database repository."""
 
@@ -173,6 +307,130 @@ class TestInsightDBRepository:
         assert insights[0].title == "Second"
         assert insights[1].title == "First"
 
+    def test_get_all_after_cursor_continues_page(self, repository):
+        """Keyset pagination returns the rows following the given position."""
+        for i in range(5):
+            repository.create(
+                Insight(
+                    title=f"Insight {i}",
+                    description=f"Description {i}",
+                    author_id=uuid.uuid4(),
+                )
+            )
+
+        first_page, _ = repository.get_all(limit=2)
+        last = first_page[-1]
+        second_page, total = repository.get_all(
+            limit=2, after=(last.created_at, last.id)
+        )
+        offset_page, _ = repository.get_all(limit=2, offset=2)
+
+        assert total == 5
+        assert [i.id for i in second_page] == [i.id for i in offset_page]
+
+    def test_get_all_after_cursor_breaks_ties_by_id(self, repository, session):
+        """Rows sharing a created_at value are neither skipped nor repeated."""
+        created_at = datetime(2026, 1, 31, 12, 0, 0)
+        for i in range(4):
+            db_insight = InsightDB(
+                id=uuid.uuid4(),
+                author_id=uuid.uuid4(),
+                title=f"Insight {i}",
+                description=TEST_DESCRIPTION,
+            )
+            db_insight.created_at = created_at
+            session.add(db_insight)
+        session.commit()
+
+        seen = []
+        after = None
+        while True:
+            page, _ = repository.get_all(limit=3, after=after)
+            if not page:
+                break
+            seen.extend(i.id for i in page)
+            after = (page[-1].created_at, page[-1].id)
+
+        assert len(seen) == 4
+        assert len(set(seen)) == 4
+
+    def test_get_all_without_total(self, repository):
+        """TotalMode.NONE skips the count and returns None."""
+        repository.create(
+            Insight(
+                title=TEST_INSIGHT_TITLE,
+                description=TEST_DESCRIPTION,
+                author_id=uuid.uuid4(),
+            )
+        )
+
+        insights, total = repository.get_all(total_mode=TotalMode.NONE)
+
+        assert total is None
+        assert len(insights) == 1
+
+    def test_cached_count_tracks_create_and_delete(self, repository, engine):
+        """The cached count is seeded once and kept current by writes."""
+        first = Insight(
+            title=TEST_INSIGHT_TITLE,
+            description=TEST_DESCRIPTION,
+            author_id=uuid.uuid4(),
+        )
+        repository.create(first)
+        assert repository.count(TotalMode.CACHED) == 1
+        assert insight_count_cache.get(engine) == 1
+
+        for i in range(2):
+            repository.create(
+                Insight(
+                    title=f"Insight {i}",
+                    description=TEST_DESCRIPTION,
+                    author_id=uuid.uuid4(),
+                )
+            )
+        repository.delete(first.id)
+
+        assert repository.count(TotalMode.CACHED) == 2
+
+    def test_cached_count_picks_up_other_writers(self, tmp_path, monkeypatch):
+        """Inserts through another engine show up once the count expires."""
+        now = [0.0]
+        monkeypatch.setattr(insight_count_cache, "_clock", lambda: now[0])
+        url = f"sqlite:///{tmp_path / 'shared.db'}"
+        engine, other_engine = create_engine(url), create_engine(url)
+        Base.metadata.create_all(engine)
+        insight = Insight(
+            title=TEST_INSIGHT_TITLE,
+            description=TEST_DESCRIPTION,
+            author_id=uuid.uuid4(),
+        )
+        try:
+            with Session(engine) as session:
+                repository = InsightDBRepository(session)
+                assert repository.count(TotalMode.CACHED) == 0
+                with Session(other_engine) as other_session:
+                    InsightDBRepository(other_session).create(insight)
+
+                assert repository.count(TotalMode.CACHED) == 0
+                now[0] += insight_count_cache.ttl
+                assert repository.count(TotalMode.CACHED) == 1
+        finally:
+            engine.dispose()
+            other_engine.dispose()
+
+    def test_estimated_count(self, repository):
+        """Estimate mode returns a usable approximation of the row count."""
+        for i in range(3):
+            repository.create(
+                Insight(
+                    title=f"Insight {i}",
+                    description=TEST_DESCRIPTION,
+                    author_id=uuid.uuid4(),
+                )
+            )
+
+        assert repository.count(TotalMode.ESTIMATE) >= 3
+
     def test_update_insight(self, repository):
         """Can update an insight."""
         insight = Insight(
@@ -217,3 +475,625 @@ class TestInsightDBRepository:
         deleted = repository.delete(fake_id)
 
         assert deleted is False
+
+
+class TestInsightSearch:
+    """Tests for full-text search in the database repository."""
+
+    def _create(self, repository, title, description=TEST_DESCRIPTION):
+        return repository.create(
+            Insight(title=title, description=description, author_id=uuid.uuid4())
+        )
+
+    def test_ranks_like_in_memory_repository(self, repository):
+        """FTS5 bm25 and the in-memory index give the same order and scores."""
+        memory = InsightRepository()
+        corpus = [
+            ("Export to CSV", "Users want to export reports as files"),
+            ("Slow export", "Export of large projects takes minutes"),
+            ("Dashboard colours", "Poor contrast on the export button"),
+            ("Login fails", "Users cannot sign in after the upgrade"),
+            ("Reports page", "Reports load slowly for very large projects"),
+            ("Export", "Export export export"),
+        ]
+        for title, description in corpus:
+            insight = self._create(repository, title, description)
+            memory.create(insight)
+
+        for query in ("export", "export reports", "large projects", "users"):
+            db_hits, db_total = repository.search(query)
+            memory_hits, memory_total = memory.search(query)
+
+            assert db_total == memory_total
+            assert [hit.insight.id for hit in db_hits] == [
+                hit.insight.id for hit in memory_hits
+            ]
+            assert [hit.score for hit in db_hits] == pytest.approx(
+                [hit.score for hit in memory_hits]
+            )
+
+    def test_matches_title_and_description(self, repository):
+        """Every query word must appear in the title or description."""
+        self._create(repository, "Slow dashboard", "Charts take ages to render")
+        self._create(repository, "Dashboard colours", "Contrast is poor")
+
+        hits, total = repository.search("dashboard charts")
+
+        assert total == 1
+        assert hits[0].insight.title == "Slow dashboard"
+
+    def test_title_matches_rank_first(self, repository):
+        """A match in the title outranks one in the description."""
+        self._create(repository, "Export is missing", "Users want export")
+        self._create(repository, "Reports", "Please add an export button")
+
+        hits, _ = repository.search("export")
+
+        assert [hit.insight.title for hit in hits] == [
+            "Export is missing",
+            "Reports",
+        ]
+        assert hits[0].score > hits[1].score
+
+    def test_highlights_matched_terms(self, repository):
+        """Matches are wrapped in markers in the title and snippet."""
+        self._create(repository, "Login fails", "The login page times out")
+
+        hits, _ = repository.search("LOGIN")
+
+        assert hits[0].title_highlight == "<mark>Login</mark> fails"
+        assert "<mark>login</mark>" in hits[0].snippet
+
+    def test_index_follows_update_and_delete(self, repository):
+        """Triggers keep the index in step with the insights table."""
+        insight = self._create(repository, "Original wording", TEST_DESCRIPTION)
+
+        repository.update(insight.id, title="Revised wording")
+        assert repository.search("original") == ([], 0)
+        assert repository.search("revised")[1] == 1
+
+        repository.delete(insight.id)
+        assert repository.search("revised") == ([], 0)
+
+    def test_index_survives_rowid_renumbering(self, engine, repository):
+        """Results do not depend on the insights rowid, which VACUUM may change."""
+        alpha = self._create(repository, "Kept alpha", TEST_DESCRIPTION)
+        beta = self._create(repository, "Kept beta", TEST_DESCRIPTION)
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "UPDATE insights SET rowid = CASE id "
+                    "WHEN :alpha THEN 1000 ELSE 999 END"
+                ),
+                {"alpha": str(alpha.id)},
+            )
+
+        repository.update(beta.id, title="Kept gamma")
+        hits, total = repository.search("gamma")
+
+        assert total == 1
+        assert hits[0].insight.id == beta.id
+        assert repository.search("alpha")[0][0].insight.id == alpha.id
+
+    def test_query_syntax_is_treated_as_words(self, repository):
+        """FTS operators and punctuation in the query cannot break MATCH."""
+        self._create(repository, "Crash on save", TEST_DESCRIPTION)
+
+        hits, total = repository.search('crash" (save*')
+
+        assert total == 1
+        assert hits[0].insight.title == "Crash on save"
+
+    def test_empty_query_returns_nothing(self, repository):
+        """A query with no words matches nothing."""
+        self._create(repository, "Anything", TEST_DESCRIPTION)
+
+        assert repository.search("  ?! ") == ([], 0)
+
+    def test_search_paginates(self, repository):
+        """Limit and offset page through ranked results."""
+        for i in range(3):
+            self._create(repository, f"Search result {i}", TEST_DESCRIPTION)
+
+        hits, total = repository.search("result", limit=2, offset=2)
+
+        assert total == 3
+        assert len(hits) == 1
+
+    def test_index_is_rebuilt_for_existing_rows(self, engine, repository):
+        """Installing the index on an older database indexes current rows."""
+        self._create(repository, "Legacy insight", TEST_DESCRIPTION)
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE {FTS_TABLE}"))
+            assert install_search_index(conn) is True
+
+        assert repository.search("legacy")[1] == 1
+
+    def test_like_fallback_without_fts(self, repository, monkeypatch):
+        """Dialects without FTS5 are searched with LIKE and highlighted."""
+        self._create(repository, "Needs snake_case names", TEST_DESCRIPTION)
+        self._create(repository, "Needs snakecase names", TEST_DESCRIPTION)
+        bind = repository._session.get_bind()
+        monkeypatch.setattr(bind.dialect, "name", "postgresql")
+
+        hits, total = repository.search("snake_case")
+
+        assert total == 1
+        assert hits[0].title_highlight == "Needs <mark>snake_case</mark> names"
+
+
+@pytest.fixture
+def products(session):
+    """Create two products and return them by name."""
+    created = {
+        name: ProductDB(id=uuid.uuid4(), name=name) for name in ("Sonar", "IDE")
+    }
+    session.add_all(created.values())
+    session.commit()
+    return {name: uuid.UUID(product.id) for name, product in created.items()}
+
+
+def count_statements(engine):
+    """Attach a listener that appends every executed statement to a list."""
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+class TestInsightLinks:
+    """Tests for linking insights to products and tags."""
+
+    def _create(self, repository, title=TEST_INSIGHT_TITLE, **links):
+        return repository.create(
+            Insight(title=title, description=TEST_DESCRIPTION, author_id=uuid.uuid4()),
+            **links,
+        )
+
+    def test_create_links_products_and_tags(self, repository, products):
+        """Products and normalised tags are stored and returned."""
+        created = self._create(
+            repository, product_ids=[products["Sonar"]], tags=["Perf", "perf", " ux "]
+        )
+
+        assert [p.name for p in created.products] == ["Sonar"]
+        assert [t.name for t in created.tags] == ["perf", "ux"]
+
+    def test_tags_are_reused_by_name(self, repository, session):
+        """A tag name is created once and shared between insights."""
+        first = self._create(repository, tags=["perf"])
+        second = self._create(repository, tags=["PERF"])
+
+        assert first.tags[0].id == second.tags[0].id
+
+    def test_tag_created_concurrently_is_reused(self, engine, repository):
+        """A tag inserted by someone else after the lookup is read back."""
+        other_tag_id = str(uuid.uuid4())
+
+        def insert_first(conn, cursor, statement, *args):
+            if statement.startswith("INSERT INTO tags"):
+                cursor.connection.execute(
+                    "INSERT INTO tags (id, name, created_at) "
+                    "VALUES (?, 'perf', CURRENT_TIMESTAMP)",
+                    (other_tag_id,),
+                )
+
+        event.listen(engine, "before_cursor_execute", insert_first)
+        try:
+            created = self._create(repository, tags=["perf"])
+        finally:
+            event.remove(engine, "before_cursor_execute", insert_first)
+
+        assert [str(tag.id) for tag in created.tags] == [other_tag_id]
+
+    def test_unknown_product_raises(self, repository, session):
+        """Linking to a missing product fails without creating the insight."""
+        with pytest.raises(UnknownProductError) as exc_info:
+            self._create(repository, product_ids=[uuid.uuid4()])
+        session.rollback()
+
+        assert len(exc_info.value.product_ids) == 1
+        assert repository.count() == 0
+
+    def test_update_replaces_links(self, repository, products):
+        """Passing product_ids or tags on update replaces the links."""
+        insight = self._create(
+            repository, product_ids=[products["Sonar"]], tags=["old"]
+        )
+
+        updated = repository.update(
+            insight.id, product_ids=[products["IDE"]], tags=["new"]
+        )
+
+        assert [p.name for p in updated.products] == ["IDE"]
+        assert [t.name for t in updated.tags] == ["new"]
+
+    def test_update_without_links_keeps_them(self, repository, products):
+        """Links are untouched when update does not mention them."""
+        insight = self._create(repository, product_ids=[products["Sonar"]])
+
+        updated = repository.update(insight.id, title="Renamed")
+
+        assert [p.name for p in updated.products] == ["Sonar"]
+
+    def test_delete_removes_links(self, repository, products, session):
+        """Junction rows go with the insight."""
+        insight = self._create(
+            repository, product_ids=[products["Sonar"]], tags=["perf"]
+        )
+
+        repository.delete(insight.id)
+
+        for junction in (insight_products, insight_tags):
+            assert session.scalar(text(f"SELECT COUNT(*) FROM {junction.name}")) == 0
+
+    def test_filter_by_product_tag_and_source(self, repository, products):
+        """Filters combine with AND; repeated values match any."""
+        sonar, ide = products["Sonar"], products["IDE"]
+        self._create(repository, "Sonar perf", product_ids=[sonar], tags=["perf"])
+        self._create(repository, "IDE perf", product_ids=[ide], tags=["perf"])
+        self._create(repository, "IDE ux", product_ids=[ide], tags=["ux"])
+
+        def titles(**criteria):
+            insights, total = repository.get_all(filters=InsightFilters(**criteria))
+            assert total == len(insights)
+            return sorted(i.title for i in insights)
+
+        assert titles(product_ids=(ide,)) == ["IDE perf", "IDE ux"]
+        assert titles(tags=("PERF",)) == ["IDE perf", "Sonar perf"]
+        assert titles(product_ids=(ide,), tags=("perf",)) == ["IDE perf"]
+        assert titles(tags=("perf", "ux")) == ["IDE perf", "IDE ux", "Sonar perf"]
+        assert titles(source=Source.CONFERENCE) == []
+
+    def test_search_respects_filters(self, repository, products):
+        """Full-text search can be narrowed by the same filters."""
+        self._create(repository, "Slow scan", product_ids=[products["Sonar"]])
+        self._create(repository, "Slow editor", product_ids=[products["IDE"]])
+
+        hits, total = repository.search(
+            "slow", filters=InsightFilters(product_ids=(products["IDE"],))
+        )
+
+        assert total == 1
+        assert hits[0].insight.title == "Slow editor"
+
+    def test_links_load_in_batches(self, repository, products, engine):
+        """A page loads links with a fixed number of queries, not one per row."""
+        for i in range(5):
+            self._create(
+                repository, f"Insight {i}", product_ids=[products["Sonar"]], tags=["a"]
+            )
+        repository._session.expire_all()
+        statements = count_statements(engine)
+
+        insights, _ = repository.get_all(total_mode=TotalMode.NONE)
+
+        assert all(i.products and i.tags for i in insights)
+        assert len(statements) == 3
+
+    def test_product_filter_uses_junction_index(self, engine):
+        """Filtering by product is answered from the reverse composite index."""
+        with engine.connect() as conn:
+            plan = conn.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT insight_id FROM insight_products "
+                    "WHERE product_id IN ('a', 'b')"
+                )
+            ).all()
+
+        details = " ".join(row[-1] for row in plan)
+        assert "ix_insight_products_product_id_insight_id" in details
+
+
+class TestInsightConditionalWrites:
+    """Tests for owner-checked updates and deletes."""
+
+    @pytest.fixture
+    def author_id(self):
+        """Author of the insight under test."""
+        return uuid.uuid4()
+
+    @pytest.fixture
+    def insight(self, repository, products, author_id):
+        """An insight linked to one product and one tag."""
+        return repository.create(
+            Insight(
+                title=TEST_INSIGHT_TITLE,
+                description=TEST_DESCRIPTION,
+                author_id=author_id,
+            ),
+            product_ids=[products["Sonar"]],
+            tags=["perf"],
+        )
+
+    def test_update_by_owner_is_one_write(
+        self, repository, insight, author_id, engine
+    ):
+        """The owner's update is one UPDATE ... RETURNING with no lookup first."""
+        repository._session.expunge_all()
+        statements = count_statements(engine)
+
+        updated = repository.update(insight.id, owner_id=author_id, title="Renamed")
+
+        writes = [s for s in statements if s.startswith("UPDATE insights")]
+        insight_reads = [s for s in statements if "FROM insights" in s]
+        assert len(writes) == 1
+        assert "RETURNING" in writes[0]
+        assert insight_reads == []
+        assert updated.title == "Renamed"
+        assert [p.name for p in updated.products] == ["Sonar"]
+
+    def test_update_by_other_author_raises(self, repository, insight, author_id):
+        """A different owner_id is refused and nothing changes."""
+        with pytest.raises(InsightNotOwnedError) as exc_info:
+            repository.update(insight.id, owner_id=uuid.uuid4(), title="Hijacked")
+
+        assert exc_info.value.author_id == author_id
+        assert repository.get_by_id(insight.id).title == TEST_INSIGHT_TITLE
+
+    def test_update_missing_returns_none(self, repository):
+        """A missing insight is None whether or not an owner is given."""
+        assert repository.update(uuid.uuid4(), owner_id=uuid.uuid4()) is None
+
+    def test_update_refreshes_loaded_instance(self, repository, insight, author_id):
+        """An instance already in the session sees the new values."""
+        repository.get_by_id(insight.id)
+
+        updated = repository.update(insight.id, owner_id=author_id, title="Renamed")
+
+        assert updated.title == "Renamed"
+        assert repository.get_by_id(insight.id).title == "Renamed"
+
+    def test_delete_by_other_author_raises(self, repository, insight, session):
+        """Nothing is deleted, including links, for a non-owner."""
+        with pytest.raises(InsightNotOwnedError):
+            repository.delete(insight.id, owner_id=uuid.uuid4())
+
+        assert repository.get_by_id(insight.id) is not None
+        assert session.scalar(text("SELECT COUNT(*) FROM insight_products")) == 1
+
+    def test_delete_by_owner(self, repository, insight, author_id, session):
+        """The owner's delete removes the row, its links and its count."""
+        assert repository.delete(insight.id, owner_id=author_id) is True
+
+        assert repository.get_by_id(insight.id) is None
+        for junction in (insight_products, insight_tags):
+            assert session.scalar(text(f"SELECT COUNT(*) FROM {junction.name}")) == 0
+        counts = text("SELECT SUM(insight_count) FROM product_insight_counts")
+        assert session.scalar(counts) == 0
+
+    def test_delete_missing_returns_false(self, repository):
+        """A missing insight is reported as not deleted."""
+        assert repository.delete(uuid.uuid4(), owner_id=uuid.uuid4()) is False
+
+
+class TestInsightCollectionVersion:
+    """Tests for the insight collection version behind list ETags."""
+
+    def _create(self, repository, author_id=None):
+        return repository.create(
+            Insight(
+                title=TEST_INSIGHT_TITLE,
+                description=TEST_DESCRIPTION,
+                author_id=author_id or uuid.uuid4(),
+            )
+        )
+
+    def test_new_database_starts_at_zero(self, repository):
+        """create_all() seeds the version row."""
+        version, modified_at = repository.collection_version()
+
+        assert version == 0
+        assert modified_at is not None
+
+    def test_every_write_bumps_version(self, repository):
+        """Create, bulk create, update and delete each move the version on."""
+        author_id = uuid.uuid4()
+        insight = self._create(repository, author_id)
+        copy = insight.model_copy(update={"id": uuid.uuid4()})
+        repository.create_many([(copy, [], [])])
+        repository.update(insight.id, owner_id=author_id, title="Renamed")
+        repository.delete(insight.id, owner_id=author_id)
+
+        assert repository.collection_version()[0] == 4
+
+    def test_version_bumped_after_commit(self, repository, engine):
+        """The version row is only touched once the write has committed."""
+        events = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: events.append(
+                statement.split()[1]
+            ),
+        )
+        event.listen(engine, "commit", lambda conn: events.append("COMMIT"))
+
+        self._create(repository)
+
+        assert events[-3:] == ["COMMIT", "insight_collection_version", "COMMIT"]
+        assert repository.collection_version()[0] == 1
+
+    def test_rejected_writes_keep_version(self, repository):
+        """Writes that match no row leave the version alone."""
+        insight = self._create(repository)
+
+        with pytest.raises(InsightNotOwnedError):
+            repository.update(insight.id, owner_id=uuid.uuid4(), title="Hijacked")
+        repository.delete(uuid.uuid4(), owner_id=uuid.uuid4())
+
+        assert repository.collection_version()[0] == 1
+
+    def test_get_updated_at(self, repository):
+        """updated_at is read without loading the insight."""
+        insight = self._create(repository)
+
+        updated_at = repository.get_updated_at(insight.id)
+
+        assert updated_at == insight.updated_at.replace(tzinfo=None)
+        assert repository.get_updated_at(uuid.uuid4()) is None
+
+
+class TestInsightCreateMany:
+    """Tests for bulk insight creation."""
+
+    def _new(self, title, product_ids=(), tags=()):
+        insight = Insight(
+            title=title, description=TEST_DESCRIPTION, author_id=uuid.uuid4()
+        )
+        return insight, list(product_ids), list(tags)
+
+    def test_creates_insights_with_links(self, repository, products):
+        """Insights, product links and tags are all stored."""
+        created = repository.create_many(
+            [
+                self._new("First", [products["Sonar"]], ["perf", "PERF"]),
+                self._new("Second", tags=["ux"]),
+            ]
+        )
+
+        assert [i.title for i in created] == ["First", "Second"]
+        assert [p.name for p in created[0].products] == ["Sonar"]
+        assert [t.name for t in created[0].tags] == ["perf"]
+        stored = repository.get_by_id(created[0].id)
+        assert [p.name for p in stored.products] == ["Sonar"]
+        assert [t.name for t in stored.tags] == ["perf"]
+
+    def test_inserts_in_chunks(self, repository, engine):
+        """Rows are sent chunk_size at a time with executemany."""
+        statements = count_statements(engine)
+
+        repository.create_many(
+            [self._new(f"Insight {i}") for i in range(5)], chunk_size=2
+        )
+
+        inserts = [s for s in statements if s.startswith("INSERT INTO insights ")]
+        assert len(inserts) == 3
+        assert repository.count() == 5
+
+    def test_maintains_counts(self, repository, products, session):
+        """Product insight counts and the total count cache are updated."""
+        sonar = products["Sonar"]
+        assert repository.count(TotalMode.CACHED) == 0
+
+        repository.create_many([self._new("A", [sonar]), self._new("B", [sonar])])
+
+        assert repository.count(TotalMode.CACHED) == 2
+        count = session.scalar(
+            text(
+                "SELECT insight_count FROM product_insight_counts "
+                "WHERE product_id = :id"
+            ),
+            {"id": str(sonar)},
+        )
+        assert count == 2
+
+    def test_unknown_product_creates_nothing(self, repository, session):
+        """One unknown product aborts the whole batch."""
+        with pytest.raises(UnknownProductError):
+            repository.create_many(
+                [self._new("A"), self._new("B", [uuid.uuid4()])]
+            )
+        session.rollback()
+
+        assert repository.count() == 0
+
+    def test_missing_product_ids(self, repository, products):
+        """Only ids without a product are reported."""
+        unknown = uuid.uuid4()
+
+        missing = repository.missing_product_ids([products["Sonar"], unknown])
+
+        assert missing == {unknown}
+
+
+class TestAsyncInsightDBRepository:
+    """Tests for the async database repository."""
+
+    async def test_create_and_get_by_id(self, async_repository):
+        """Can create an insight and read it back."""
+        insight = Insight(
+            title=TEST_INSIGHT_TITLE,
+            description=TEST_DESCRIPTION,
+            author_id=uuid.uuid4(),
+        )
+
+        await async_repository.create(insight)
+        found = await async_repository.get_by_id(insight.id)
+
+        assert found is not None
+        assert found.title == TEST_INSIGHT_TITLE
+
+    async def test_get_all(self, async_repository):
+        """Lists insights with a total."""
+        for i in range(3):
+            await async_repository.create(
+                Insight(
+                    title=f"Insight {i}",
+                    description=TEST_DESCRIPTION,
+                    author_id=uuid.uuid4(),
+                )
+            )
+
+        insights, total = await async_repository.get_all(limit=2)
+
+        assert total == 3
+        assert len(insights) == 2
+
+    async def test_update_and_delete(self, async_repository):
+        """Can update and then delete an insight."""
+        insight = Insight(
+            title="Original title",
+            description=TEST_DESCRIPTION,
+            author_id=uuid.uuid4(),
+        )
+        await async_repository.create(insight)
+
+        updated = await async_repository.update(insight.id, title="Updated title")
+        deleted = await async_repository.delete(insight.id)
+
+        assert updated.title == "Updated title"
+        assert deleted is True
+        assert await async_repository.get_by_id(insight.id) is None
+
+    async def test_stream_all_in_batches(self, async_repository, async_session):
+        """stream_all yields every insight, newest first, batch_size at a time."""
+        await async_repository.create_many(
+            [
+                (
+                    Insight(
+                        title=f"Insight {i}",
+                        description=TEST_DESCRIPTION,
+                        author_id=uuid.uuid4(),
+                        created_at=datetime(2024, 1, i + 1),
+                    ),
+                    [],
+                    ["perf"] if i % 2 else [],
+                )
+                for i in range(5)
+            ]
+        )
+
+        batches = [
+            batch async for batch in async_repository.stream_all(batch_size=2)
+        ]
+        tagged = [
+            insight
+            async for batch in async_repository.stream_all(
+                InsightFilters(tags=("perf",))
+            )
+            for insight in batch
+        ]
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert [i.title for batch in batches for i in batch] == [
+            f"Insight {i}" for i in (4, 3, 2, 1, 0)
+        ]
+        assert sorted(i.title for i in tagged) == ["Insight 1", "Insight 3"]
+        assert tagged[0].tags[0].name == "perf"
+        assert not any(
+            isinstance(obj, InsightDB) for obj in async_session.identity_map.values()
+        )
@@ -0,0 +1,81 @@
+"""Tests for insight export rendering."""
+import csv
+import io
+import json
+import uuid
+
+import pytest
+
+from app.export import CSV_COLUMNS, ExportFormat, render_export
+from app.models import Insight, Product, Tag
+
+# Test constants
+TEST_DESCRIPTION = "Test description"
+
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+async def _render(export_format, *batches):
+    return [chunk async for chunk in render_export(_batches(*batches), export_format)]
+
+
+def _insight(title="Export me", **fields):
+    return Insight(
+        title=title, description=TEST_DESCRIPTION, author_id=uuid.uuid4(), **fields
+    )
+
+
+class TestRenderExport:
+    """Tests for render_export."""
+
+    @pytest.mark.anyio
+    async def test_ndjson_one_line_per_insight(self):
+        """Each insight is one JSON line shaped like a list item."""
+        first, second = _insight("First"), _insight("Second")
+
+        chunks = await _render(ExportFormat.NDJSON, [first], [second])
+
+        lines = [json.loads(line) for line in "".join(chunks).splitlines()]
+        assert len(chunks) == 2
+        assert [line["title"] for line in lines] == ["First", "Second"]
+        assert lines[0]["id"] == str(first.id)
+        assert "author_id" not in lines[0]
+
+    @pytest.mark.anyio
+    async def test_ndjson_empty(self):
+        """An empty export produces no output."""
+        assert "".join(await _render(ExportFormat.NDJSON)) == ""
+
+    @pytest.mark.anyio
+    async def test_csv_header_and_rows(self):
+        """CSV starts with a header; products and tags are joined names."""
+        insight = _insight(
+            products=[Product(name="Sonar"), Product(name="IDE")],
+            tags=[Tag(name="perf")],
+        )
+
+        chunks = await _render(ExportFormat.CSV, [insight])
+
+        rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+        assert tuple(rows[0]) == CSV_COLUMNS
+        assert rows[0]["products"] == "Sonar; IDE"
+        assert rows[0]["tags"] == "perf"
+        assert rows[0]["source"] == ""
+
+    @pytest.mark.anyio
+    async def test_csv_empty_has_header(self):
+        """An empty CSV export is still a file with a header row."""
+        chunks = await _render(ExportFormat.CSV)
+
+        assert "".join(chunks).strip() == ",".join(CSV_COLUMNS)
+
+    @pytest.mark.anyio
+    async def test_csv_neutralises_formulas(self):
+        """Cells a spreadsheet would evaluate are prefixed with a quote."""
+        chunks = await _render(ExportFormat.CSV, [_insight("=HYPERLINK(1)")])
+
+        rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+        assert rows[0]["title"] == "'=HYPERLINK(1)"
@@ -1,13 +1,19 @@
 """Tests for logging configuration."""
 import json
 import logging
+import queue
+import threading
 
 from app.correlation import set_correlation_id
 from app.logging_config import (
+    BoundedQueueHandler,
     CorrelationIdFilter,
+    OverflowPolicy,
     create_json_formatter,
+    dropped_log_records,
     get_logger,
     setup_logging,
+    shutdown_logging,
 )
 
 # Test constants
@@ -48,6 +54,87 @@ class TestSetupLogging:
         setup_logging(debug=False)
 
 
+    def test_installs_queue_handler(self):
+        """The app logger hands records to a queue, not to stdout."""
+        shutdown_logging()
+        setup_logging()
+        app_logger = logging.getLogger("app")
+
+        assert any(isinstance(h, BoundedQueueHandler) for h in app_logger.handlers)
+        assert not any(
+            type(h) is logging.StreamHandler for h in app_logger.handlers
+        )
+
+    def test_shutdown_removes_queue_handler(self):
+        """shutdown_logging detaches the handler so setup can run again."""
+        setup_logging()
+        shutdown_logging()
+
+        assert not any(
+            isinstance(h, BoundedQueueHandler)
+            for h in logging.getLogger("app").handlers
+        )
+        assert dropped_log_records() == 0
+        setup_logging()
+
+
+def make_record(msg: str = TEST_LOG_MESSAGE) -> logging.LogRecord:
+    """Build a plain INFO record."""
+    return logging.LogRecord(
+        name=TEST_LOGGER_NAME,
+        level=logging.INFO,
+        pathname="test.py",
+        lineno=1,
+        msg=msg,
+        args=None,
+        exc_info=None,
+    )
+
+
+class TestBoundedQueueHandler:
+    """Tests for the bounded queue handler."""
+
+    def test_drop_policy_counts_dropped_records(self):
+        """A full queue drops records and counts them."""
+        handler = BoundedQueueHandler(queue.Queue(maxsize=1), OverflowPolicy.DROP)
+
+        for _ in range(3):
+            handler.handle(make_record())
+
+        assert handler.queue.qsize() == 1
+        assert handler.dropped == 2
+
+    def test_block_policy_waits_for_space(self):
+        """A full queue blocks until the consumer makes room."""
+        log_queue = queue.Queue(maxsize=1)
+        handler = BoundedQueueHandler(log_queue, OverflowPolicy.BLOCK)
+        received = []
+
+        def consume():
+            for _ in range(3):
+                received.append(log_queue.get(timeout=5))
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        for _ in range(3):
+            handler.handle(make_record())
+        consumer.join(timeout=5)
+
+        assert len(received) == 3
+        assert handler.dropped == 0
+
+    def test_correlation_id_captured_before_enqueue(self):
+        """The correlation ID is read on the logging thread, not the writer."""
+        handler = BoundedQueueHandler(queue.Queue())
+        handler.addFilter(CorrelationIdFilter())
+        set_correlation_id(TEST_CORRELATION_ID)
+
+        handler.handle(make_record())
+        set_correlation_id(None)
+
+        assert handler.queue.get_nowait().correlation_id == TEST_CORRELATION_ID
+
+
 class TestJsonFormatter:
     """Tests for JSON log formatter."""
 
@@ -0,0 +1,90 @@
+"""Tests for maintenance commands."""
+import uuid
+
+from sqlalchemy import delete, update
+
+from app.db_models import ProductDB, ProductInsightCountDB
+from app.db_repository import InsightDBRepository
+from app.maintenance import rebuild_product_insight_counts
+from app.models import Insight
+
+
+def create_product(session, name: str) -> uuid.UUID:
+    product_id = uuid.uuid4()
+    session.add(ProductDB(id=product_id, name=name))
+    session.commit()
+    return product_id
+
+
+def count_of(session, product_id: uuid.UUID) -> int | None:
+    row = session.get(ProductInsightCountDB, str(product_id), populate_existing=True)
+    return row.insight_count if row else None
+
+
+class TestRebuildProductInsightCounts:
+    """Tests for rebuild_product_insight_counts."""
+
+    def test_consistent_counts_are_left_alone(self, session):
+        """Nothing changes when the counts already agree."""
+        product_id = create_product(session, "Sonar")
+        InsightDBRepository(session).create(
+            Insight(title="T", description="D", author_id=uuid.uuid4()),
+            product_ids=[product_id],
+        )
+
+        assert rebuild_product_insight_counts(session) == 0
+        assert count_of(session, product_id) == 1
+
+    def test_corrects_drifted_and_missing_rows(self, session):
+        """Wrong counts are fixed and missing rows are recreated."""
+        drifted = create_product(session, "Drifted")
+        missing = create_product(session, "Missing")
+        for product_id in (drifted, missing):
+            InsightDBRepository(session).create(
+                Insight(title="T", description="D", author_id=uuid.uuid4()),
+                product_ids=[product_id],
+            )
+        session.execute(
+            update(ProductInsightCountDB)
+            .where(ProductInsightCountDB.product_id == str(drifted))
+            .values(insight_count=7)
+        )
+        session.execute(
+            delete(ProductInsightCountDB).where(
+                ProductInsightCountDB.product_id == str(missing)
+            )
+        )
+        session.commit()
+
+        assert rebuild_product_insight_counts(session) == 2
+        assert count_of(session, drifted) == 1
+        assert count_of(session, missing) == 1
+
+    def test_missing_only_skips_existing_rows(self, session):
+        """missing_only backfills absent rows without touching the rest."""
+        drifted = create_product(session, "Drifted")
+        missing = create_product(session, "Missing")
+        session.execute(
+            update(ProductInsightCountDB)
+            .where(ProductInsightCountDB.product_id == str(drifted))
+            .values(insight_count=7)
+        )
+        session.execute(
+            delete(ProductInsightCountDB).where(
+                ProductInsightCountDB.product_id == str(missing)
+            )
+        )
+        session.commit()
+
+        assert rebuild_product_insight_counts(session, missing_only=True) == 1
+        assert count_of(session, drifted) == 7
+        assert count_of(session, missing) == 0
+
+    def test_removes_rows_for_deleted_products(self, session):
+        """Rows whose product no longer exists are dropped."""
+        product_id = create_product(session, "Gone")
+        session.execute(delete(ProductDB).where(ProductDB.id == str(product_id)))
+        session.commit()
+
+        assert rebuild_product_insight_counts(session) == 1
+        assert count_of(session, product_id) is None
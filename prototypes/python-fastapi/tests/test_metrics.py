@@ -0,0 +1,225 @@
+"""Tests for the in-process metrics registry and /metrics endpoint."""
+import pytest
+from sqlalchemy import text
+
+from app.cache import TTLCache, named_caches
+from app.database import db_queries_total, query_operation
+from app.metrics import MetricsRegistry, _Metric
+from app.middleware import UNMATCHED_ROUTE, http_requests_total
+
+# Test constants
+METRICS_ENDPOINT = "/metrics"
+INSIGHTS_ENDPOINT = "/api/v1/insights"
+INSIGHT_ROUTE = "/api/v1/insights/{insight_id}"
+
+
+class TestMetricsRegistry:
+    """Tests for MetricsRegistry and its metric types."""
+
+    def test_counter_renders_labelled_series(self):
+        """Counters render HELP, TYPE and one line per label set."""
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs run.", ("kind",))
+        counter.inc(kind="a")
+        counter.inc(2, kind="a")
+
+        output = registry.render()
+
+        assert "# HELP jobs_total Jobs run." in output
+        assert "# TYPE jobs_total counter" in output
+        assert 'jobs_total{kind="a"} 3' in output
+
+    def test_registering_twice_returns_same_metric(self):
+        """Metrics are registered once and fetched by name afterwards."""
+        registry = MetricsRegistry()
+        first = registry.counter("jobs_total", "Jobs run.")
+
+        assert registry.counter("jobs_total", "Jobs run.") is first
+
+    def test_conflicting_type_raises(self):
+        """Reusing a name for a different metric type is an error."""
+        registry = MetricsRegistry()
+        registry.counter("jobs", "Jobs run.")
+
+        with pytest.raises(ValueError):
+            registry.gauge("jobs", "Jobs running.")
+
+    @pytest.mark.parametrize(
+        "register, conflict",
+        [
+            (lambda r: r.counter("jobs", "Other help."), "help text"),
+            (lambda r: r.counter("jobs", "Jobs run.", ("kind",)), "labels"),
+            (lambda r: r.histogram("latency", "Latency.", buckets=(1.0,)), "buckets"),
+            (lambda r: r.register_callback("jobs", "Jobs run.", list), "type"),
+            (
+                lambda r: r.register_callback(
+                    "jobs", "Other help.", list, type_name="counter"
+                ),
+                "help text",
+            ),
+        ],
+    )
+    def test_conflicting_definition_raises(self, register, conflict):
+        """Reusing a name with other help text, labels or buckets is an error."""
+        registry = MetricsRegistry()
+        registry.counter("jobs", "Jobs run.")
+        registry.histogram("latency", "Latency.")
+
+        with pytest.raises(ValueError, match=f"different {conflict}"):
+            register(registry)
+
+    def test_callback_reregistration_keeps_first(self):
+        """A matching callback registration does not replace the first one."""
+        registry = MetricsRegistry()
+        registry.register_callback("depth", "Queue depth.", lambda: [({}, 1)])
+        registry.register_callback("depth", "Queue depth.", lambda: [({}, 2)])
+
+        assert "depth 1" in registry.render()
+
+    def test_metric_base_class_is_abstract(self):
+        """Metrics must implement samples()."""
+        with pytest.raises(TypeError):
+            _Metric("jobs", "Jobs run.")
+
+    def test_wrong_labels_raise(self):
+        """Observations must supply exactly the declared labels."""
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs run.", ("kind",))
+
+        with pytest.raises(ValueError):
+            counter.inc(other="a")
+
+    def test_gauge_goes_up_and_down(self):
+        """Gauges support inc, dec and set."""
+        registry = MetricsRegistry()
+        gauge = registry.gauge("running", "Jobs running.")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        assert gauge.value() == 1
+
+        gauge.set(7)
+        assert gauge.value() == 7
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Histogram buckets count every observation at or below the bound."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency", "Latency.", buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(3.0)
+
+        output = registry.render()
+
+        assert 'latency_bucket{le="0.1"} 1' in output
+        assert 'latency_bucket{le="1"} 2' in output
+        assert 'latency_bucket{le="+Inf"} 3' in output
+        assert "latency_count 3" in output
+        assert "latency_sum 3.55" in output
+
+    def test_label_values_are_escaped(self):
+        """Quotes and backslashes in label values are escaped."""
+        registry = MetricsRegistry()
+        counter = registry.counter("paths_total", "Paths.", ("path",))
+        counter.inc(path='a"b\\c')
+
+        assert 'paths_total{path="a\\"b\\\\c"} 1' in registry.render()
+
+    def test_callback_metrics_are_read_at_render_time(self):
+        """Callback metrics report the callback's current values."""
+        registry = MetricsRegistry()
+        values = {"depth": 1}
+        registry.register_callback(
+            "queue_depth", "Queue depth.", lambda: [({}, values["depth"])]
+        )
+        values["depth"] = 5
+
+        assert "queue_depth 5" in registry.render()
+
+
+class TestQueryOperation:
+    """Tests for SQL statement classification."""
+
+    @pytest.mark.parametrize(
+        ("statement", "expected"),
+        [
+            ("SELECT 1", "SELECT"),
+            ("  insert into t values (1)", "INSERT"),
+            ("PRAGMA journal_mode", "OTHER"),
+            ("", "OTHER"),
+        ],
+    )
+    def test_classifies_leading_verb(self, statement, expected):
+        """The leading verb is used, unknown verbs become OTHER."""
+        assert query_operation(statement) == expected
+
+    def test_queries_are_counted(self, engine):
+        """Executed statements increment the query counter."""
+        before = db_queries_total.value(operation="SELECT")
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert db_queries_total.value(operation="SELECT") == before + 1
+
+
+class TestNamedCaches:
+    """Tests for cache metrics."""
+
+    def test_named_cache_is_exported(self):
+        """Caches created with a name are listed for metric export."""
+        cache = TTLCache(maxsize=2, ttl=10, name="test-metrics")
+        try:
+            assert named_caches["test-metrics"] is cache
+        finally:
+            named_caches.pop("test-metrics")
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+
+    @pytest.mark.anyio
+    async def test_returns_prometheus_text(self, client):
+        """The endpoint serves the text exposition format."""
+        response = await client.get(METRICS_ENDPOINT)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE insider_http_requests_total counter" in response.text
+        assert 'insider_cache_hits_total{cache="user"}' in response.text
+        assert 'insider_cache_hit_ratio{cache="insight_list"}' in response.text
+        assert 'insider_cache_bytes{cache="insight_list"}' in response.text
+
+    @pytest.mark.anyio
+    async def test_requests_are_labelled_by_route_template(
+        self, client, auth_headers
+    ):
+        """Requests are counted by route template, not raw path."""
+        missing_id = "00000000-0000-0000-0000-000000000000"
+        before = http_requests_total.value(
+            method="GET", route=INSIGHT_ROUTE, status="404"
+        )
+
+        await client.get(f"{INSIGHTS_ENDPOINT}/{missing_id}", headers=auth_headers)
+
+        assert (
+            http_requests_total.value(
+                method="GET", route=INSIGHT_ROUTE, status="404"
+            )
+            == before + 1
+        )
+
+    @pytest.mark.anyio
+    async def test_unmatched_paths_share_one_label(self, client):
+        """Requests that match no route use a single fallback label."""
+        before = http_requests_total.value(
+            method="GET", route=UNMATCHED_ROUTE, status="404"
+        )
+
+        await client.get("/no/such/path")
+
+        assert (
+            http_requests_total.value(
+                method="GET", route=UNMATCHED_ROUTE, status="404"
+            )
+            == before + 1
+        )
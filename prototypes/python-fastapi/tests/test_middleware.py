@@ -1,8 +1,15 @@
 """Tests for request logging middleware."""
+import asyncio
 import logging
 import uuid
 
 import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.middleware import LoggingMiddleware
 
 # Test constants
 CORRELATION_ID_HEADER = "X-Correlation-ID"
@@ -65,3 +72,169 @@ class TestLoggingMiddleware:
         assert "duration" in record.message.lower() or hasattr(
             record, "duration_ms"
         )
+
+
+def streaming_app(**middleware_options) -> LoggingMiddleware:
+    """A bare app with a few routes, wrapped in LoggingMiddleware."""
+
+    async def chunks():
+        for i in range(3):
+            yield f"chunk-{i}\n".encode()
+
+    async def stream(request):
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    async def boom(request):
+        raise RuntimeError("boom")
+
+    async def ok(request):
+        return PlainTextResponse("ok")
+
+    async def missing(request):
+        return PlainTextResponse("missing", status_code=404)
+
+    async def slow(request):
+        await asyncio.sleep(0.02)
+        return PlainTextResponse("slow")
+
+    app = Starlette(
+        routes=[
+            Route("/stream", stream),
+            Route("/boom", boom),
+            Route("/ok", ok),
+            Route("/items/latest", ok),
+            Route("/items/{item_id}", ok),
+            Route("/missing", missing),
+            Route("/slow", slow),
+        ]
+    )
+    return LoggingMiddleware(app, **middleware_options)
+
+
+async def completed_logs(app, paths, caplog) -> list[logging.LogRecord]:
+    """Request each path and return the 'Request completed' records."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        with caplog.at_level(logging.INFO, logger="app.middleware"):
+            for path in paths:
+                await client.get(path)
+    return [r for r in caplog.records if REQUEST_COMPLETED_MSG in r.message]
+
+
+class TestLoggingMiddlewareAsgi:
+    """Tests for the pure ASGI behaviour of LoggingMiddleware."""
+
+    @pytest.mark.anyio
+    async def test_streaming_response_passes_through(self):
+        """Streamed bodies arrive intact with the correlation ID header."""
+        async with AsyncClient(
+            transport=ASGITransport(app=streaming_app()), base_url="http://test"
+        ) as client:
+            response = await client.get("/stream")
+
+        assert response.text == "chunk-0\nchunk-1\nchunk-2\n"
+        assert response.headers.get(CORRELATION_ID_HEADER) is not None
+
+    @pytest.mark.anyio
+    async def test_unhandled_error_is_logged_as_500(self, caplog):
+        """A request that raises still logs completion with status 500."""
+        async with AsyncClient(
+            transport=ASGITransport(app=streaming_app(), raise_app_exceptions=False),
+            base_url="http://test",
+        ) as client:
+            with caplog.at_level(logging.INFO, logger="app.middleware"):
+                await client.get("/boom")
+
+        assert any(
+            REQUEST_COMPLETED_MSG in r.message and "status=500" in r.message
+            for r in caplog.records
+        )
+
+
+class TestLoggingMiddlewareSampling:
+    """Tests for sampled request logging."""
+
+    @pytest.mark.anyio
+    async def test_logs_one_in_n_successes(self, caplog):
+        """Only every Nth successful request is logged."""
+        app = streaming_app(sample_rate=5)
+
+        records = await completed_logs(app, ["/ok"] * 10, caplog)
+
+        assert len(records) == 2
+
+    @pytest.mark.anyio
+    async def test_route_rate_overrides_default(self, caplog):
+        """Per-route rates apply to matching paths only."""
+        app = streaming_app(route_sample_rates={"GET /items/{item_id}": 4})
+
+        items = await completed_logs(
+            app, [f"/items/{i}" for i in range(8)], caplog
+        )
+        caplog.clear()
+        others = await completed_logs(app, ["/ok"] * 3, caplog)
+
+        assert len(items) == 2
+        assert len(others) == 3
+
+    @pytest.mark.anyio
+    async def test_route_rate_matches_route_template(self, caplog):
+        """A rule applies to its route, not to every path its pattern fits."""
+        app = streaming_app(route_sample_rates={"GET /items/{item_id}": 1000})
+
+        records = await completed_logs(app, ["/items/latest"] * 3, caplog)
+
+        assert len(records) == 3
+
+    @pytest.mark.anyio
+    async def test_non_2xx_always_logged(self, caplog):
+        """Non-2xx responses bypass sampling."""
+        app = streaming_app(sample_rate=1000)
+
+        records = await completed_logs(app, ["/ok", "/missing", "/missing"], caplog)
+
+        assert [r.message.split("status=")[1][:3] for r in records] == [
+            "200",
+            "404",
+            "404",
+        ]
+
+    @pytest.mark.anyio
+    async def test_slow_requests_always_logged_as_warning(self, caplog):
+        """Requests over the latency threshold bypass sampling."""
+        app = streaming_app(sample_rate=1000, slow_request_ms=10)
+
+        records = await completed_logs(app, ["/ok", "/slow"], caplog)
+
+        assert len(records) == 2
+        assert records[1].levelno == logging.WARNING
+
+    @pytest.mark.anyio
+    async def test_errors_always_logged(self, caplog):
+        """Unhandled errors bypass sampling and log at ERROR."""
+        app = streaming_app(sample_rate=1000)
+        async with AsyncClient(
+            transport=ASGITransport(app=app, raise_app_exceptions=False),
+            base_url="http://test",
+        ) as client:
+            await client.get("/ok")
+            with caplog.at_level(logging.INFO, logger="app.middleware"):
+                await client.get("/boom")
+
+        errors = [r for r in caplog.records if r.levelno == logging.ERROR]
+        assert len(errors) == 1
+
+    @pytest.mark.anyio
+    async def test_unsampled_requests_keep_correlation_id(self):
+        """Sampling never affects the correlation ID header."""
+        app = streaming_app(sample_rate=1000)
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            await client.get("/ok")
+            response = await client.get(
+                "/ok", headers={CORRELATION_ID_HEADER: "sampled-out"}
+            )
+
+        assert response.headers[CORRELATION_ID_HEADER] == "sampled-out"
@@ -0,0 +1,89 @@
+"""Tests for pagination helpers."""
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.pagination import RowCountCache, decode_cursor, encode_cursor
+
+
+class TestCursor:
+    """Tests for keyset cursor encoding."""
+
+    def test_roundtrip(self):
+        """A cursor decodes back to the position it was built from."""
+        created_at = datetime(2026, 1, 31, 12, 30, 15, 123456, tzinfo=timezone.utc)
+        insight_id = uuid.uuid4()
+
+        cursor = encode_cursor(created_at, insight_id)
+
+        assert decode_cursor(cursor) == (created_at, insight_id)
+
+    def test_cursor_is_url_safe(self):
+        """Cursor can be passed as a query parameter without escaping."""
+        cursor = encode_cursor(datetime.now(timezone.utc), uuid.uuid4())
+
+        assert all(c.isalnum() or c in "-_=" for c in cursor)
+
+    @pytest.mark.parametrize(
+        "cursor",
+        ["not-a-cursor", "", "e30=", "WyJ4IiwieSJd"],
+    )
+    def test_invalid_cursor_raises_value_error(self, cursor):
+        """Malformed cursors raise ValueError."""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+class TestRowCountCache:
+    """Tests for the per-engine row count cache."""
+
+    def test_get_returns_none_until_seeded(self):
+        """An engine without a seeded count has no cached value."""
+        cache = RowCountCache()
+        engine = create_engine("sqlite:///:memory:")
+
+        assert cache.get(engine) is None
+
+    def test_adjust_applies_delta_after_seed(self):
+        """Deltas are applied once a count has been seeded."""
+        cache = RowCountCache()
+        engine = create_engine("sqlite:///:memory:")
+        cache.set(engine, 10)
+
+        cache.adjust(engine, 2)
+        cache.adjust(engine, -1)
+
+        assert cache.get(engine) == 11
+
+    def test_adjust_ignored_before_seed(self):
+        """Deltas before seeding are dropped rather than guessed."""
+        cache = RowCountCache()
+        engine = create_engine("sqlite:///:memory:")
+
+        cache.adjust(engine, 1)
+
+        assert cache.get(engine) is None
+
+    def test_counts_are_per_engine(self):
+        """Each engine keeps its own count."""
+        cache = RowCountCache()
+        first = create_engine("sqlite:///:memory:")
+        second = create_engine("sqlite:///:memory:")
+        cache.set(first, 3)
+
+        assert cache.get(second) is None
+
+    def test_count_expires_after_ttl(self):
+        """A seeded count is dropped once its TTL has passed."""
+        now = [0.0]
+        cache = RowCountCache(ttl=30.0, clock=lambda: now[0])
+        engine = create_engine("sqlite:///:memory:")
+        cache.set(engine, 10)
+        cache.adjust(engine, 1)
+
+        now[0] = 29.0
+        assert cache.get(engine) == 11
+        now[0] = 30.0
+        assert cache.get(engine) is None
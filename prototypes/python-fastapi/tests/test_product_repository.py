@@ -0,0 +1,116 @@
+"""Tests for the product repository and precomputed insight counts."""
+import uuid
+
+import pytest
+
+from app.db_models import ProductInsightCountDB
+from app.db_repository import InsightDBRepository
+from app.models import Insight, Product
+from app.product_repository import (
+    DuplicateProductError,
+    ProductDBRepository,
+    ProductSort,
+)
+
+# Test constants
+TEST_DESCRIPTION = "Test description"
+
+
+@pytest.fixture
+def repository(session):
+    """Create a product repository with test session."""
+    return ProductDBRepository(session)
+
+
+@pytest.fixture
+def insights(session):
+    """Create an insight repository on the same session."""
+    return InsightDBRepository(session)
+
+
+def link(insights, *product_ids):
+    return insights.create(
+        Insight(title="Linked", description=TEST_DESCRIPTION, author_id=uuid.uuid4()),
+        product_ids=product_ids,
+    )
+
+
+def counts(repository):
+    return {product.name: count for product, count in repository.get_all()}
+
+
+class TestProductDBRepository:
+    """Tests for ProductDBRepository."""
+
+    def test_create_starts_with_zero_count(self, repository, session):
+        """New products get a count row set to zero."""
+        product = repository.create(Product(name="Sonar"))
+
+        row = session.get(ProductInsightCountDB, str(product.id))
+        assert row.insight_count == 0
+        assert counts(repository) == {"Sonar": 0}
+
+    def test_duplicate_name_raises(self, repository):
+        """Product names are unique."""
+        repository.create(Product(name="Sonar"))
+
+        with pytest.raises(DuplicateProductError):
+            repository.create(Product(name="Sonar"))
+
+    def test_search_by_name(self, repository):
+        """search matches part of the name, case-insensitively."""
+        repository.create(Product(name="SonarQube"))
+        repository.create(Product(name="IDE plugin"))
+
+        found = repository.get_all(search="qube")
+
+        assert [product.name for product, _ in found] == ["SonarQube"]
+
+
+class TestProductInsightCounts:
+    """Tests for incremental maintenance of product_insight_counts."""
+
+    def test_counts_follow_insight_create(self, repository, insights):
+        """Linking an insight increments each of its products."""
+        sonar = repository.create(Product(name="Sonar"))
+        ide = repository.create(Product(name="IDE"))
+
+        link(insights, sonar.id, ide.id)
+        link(insights, sonar.id)
+
+        assert counts(repository) == {"IDE": 1, "Sonar": 2}
+
+    def test_counts_follow_relinking(self, repository, insights):
+        """Replacing product links moves the count between products."""
+        sonar = repository.create(Product(name="Sonar"))
+        ide = repository.create(Product(name="IDE"))
+        insight = link(insights, sonar.id)
+
+        insights.update(insight.id, product_ids=[ide.id])
+
+        assert counts(repository) == {"IDE": 1, "Sonar": 0}
+
+    def test_counts_follow_insight_delete(self, repository, insights):
+        """Deleting an insight decrements its products."""
+        sonar = repository.create(Product(name="Sonar"))
+        insight = link(insights, sonar.id)
+
+        insights.delete(insight.id)
+
+        assert counts(repository) == {"Sonar": 0}
+
+    def test_sort_by_insight_count(self, repository, insights):
+        """sort=insight_count lists the busiest products first, then by name."""
+        for name in ("Alpha", "Beta", "Gamma"):
+            repository.create(Product(name=name))
+        ids = {product.name: product.id for product, _ in repository.get_all()}
+        link(insights, ids["Gamma"])
+        link(insights, ids["Gamma"], ids["Beta"])
+
+        ordered = repository.get_all(sort=ProductSort.INSIGHT_COUNT)
+
+        assert [(p.name, count) for p, count in ordered] == [
+            ("Gamma", 2),
+            ("Beta", 1),
+            ("Alpha", 0),
+        ]
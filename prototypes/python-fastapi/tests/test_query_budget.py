@@ -0,0 +1,210 @@
+"""Tests for per-request SQL query budgets."""
+import logging
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.middleware import LoggingMiddleware
+from app.query_budget import (
+    QueryBudgetExceeded,
+    QueryBudgetMiddleware,
+    assert_max_queries,
+    track_queries,
+)
+from app.user_repository import user_cache
+
+# Test constants
+CORRELATION_ID_HEADER = "X-Correlation-ID"
+INSIGHTS_ENDPOINT = "/api/v1/insights"
+BUDGET_EXCEEDED_MSG = "Query budget exceeded"
+SELECT_ONE = "SELECT 1"
+
+
+def queries_app(engine, **budget_options) -> LoggingMiddleware:
+    """A bare app whose routes run a given number of SELECTs on ``engine``."""
+
+    def run(statements: list[str]) -> None:
+        with engine.connect() as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+
+    async def repeat(request):
+        run([SELECT_ONE] * int(request.path_params["count"]))
+        return PlainTextResponse("ok")
+
+    async def distinct(request):
+        run([f"SELECT {i}" for i in range(int(request.path_params["count"]))])
+        return PlainTextResponse("ok")
+
+    app = Starlette(
+        routes=[
+            Route("/repeat/{count}", repeat),
+            Route("/distinct/{count}", distinct),
+        ]
+    )
+    return LoggingMiddleware(QueryBudgetMiddleware(app, **budget_options))
+
+
+async def budget_warnings(app, path, caplog) -> list[logging.LogRecord]:
+    """Request ``path`` and return the query budget warnings it logged."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        with caplog.at_level(logging.WARNING, logger="app.query_budget"):
+            await client.get(path, headers={CORRELATION_ID_HEADER: "req-1"})
+    return [r for r in caplog.records if BUDGET_EXCEEDED_MSG in r.message]
+
+
+class TestTrackQueries:
+    """Tests for track_queries and assert_max_queries."""
+
+    def test_counts_statements_in_block(self, engine):
+        """Only statements executed inside the block are counted."""
+        with engine.connect() as conn:
+            conn.execute(text(SELECT_ONE))
+            with track_queries() as tracker:
+                conn.execute(text(SELECT_ONE))
+                conn.execute(text("SELECT  2"))
+            conn.execute(text(SELECT_ONE))
+
+        assert tracker.statements == [SELECT_ONE, "SELECT 2"]
+
+    def test_nested_blocks_both_count(self, engine):
+        """An inner block does not hide statements from an outer one."""
+        with engine.connect() as conn, track_queries() as outer:
+            with track_queries() as inner:
+                conn.execute(text(SELECT_ONE))
+            conn.execute(text(SELECT_ONE))
+
+        assert (outer.count, inner.count) == (2, 1)
+
+    async def test_counts_async_session_statements(self, async_engine):
+        """Statements run by AsyncSession greenlets are counted."""
+        with track_queries() as tracker:
+            async with AsyncSession(async_engine) as session:
+                await session.execute(text(SELECT_ONE))
+
+        assert tracker.count == 1
+
+    def test_repeated_selects(self, engine):
+        """The same SELECT run at least the threshold times is reported."""
+        with engine.connect() as conn, track_queries() as tracker:
+            for _ in range(3):
+                conn.execute(text(SELECT_ONE))
+            conn.execute(text("SELECT 2"))
+
+        assert tracker.repeated_selects(3) == {SELECT_ONE: 3}
+        assert tracker.repeated_selects(4) == {}
+
+    def test_assert_max_queries_raises_over_limit(self, engine):
+        """Going over the limit raises, listing the statements."""
+        with pytest.raises(QueryBudgetExceeded, match="2 SQL statements, budget 1"):
+            with engine.connect() as conn, assert_max_queries(1):
+                conn.execute(text(SELECT_ONE))
+                conn.execute(text(SELECT_ONE))
+
+    def test_assert_max_queries_allows_limit(self, engine):
+        """Running exactly the limit passes."""
+        with engine.connect() as conn, assert_max_queries(1) as tracker:
+            conn.execute(text(SELECT_ONE))
+
+        assert tracker.count == 1
+
+
+class TestQueryBudgetMiddleware:
+    """Tests for QueryBudgetMiddleware."""
+
+    @pytest.mark.anyio
+    async def test_within_budget_logs_nothing(self, engine, caplog):
+        """A request within its route budget is silent."""
+        app = queries_app(engine, route_budgets={"GET /distinct/{count}": 2})
+
+        assert await budget_warnings(app, "/distinct/2", caplog) == []
+
+    @pytest.mark.anyio
+    async def test_over_budget_logs_correlation_id(self, engine, caplog):
+        """Going over budget logs a warning with the correlation ID."""
+        app = queries_app(engine, route_budgets={"GET /distinct/{count}": 2})
+
+        records = await budget_warnings(app, "/distinct/3", caplog)
+
+        assert len(records) == 1
+        assert "GET /distinct/{count}" in records[0].message
+        assert "correlation_id=req-1" in records[0].message
+        assert "3 SQL statements, budget 2" in records[0].message
+
+    @pytest.mark.anyio
+    async def test_repeated_select_reported_as_n_plus_one(self, engine, caplog):
+        """A SELECT repeated per row is flagged even within budget."""
+        app = queries_app(engine, default_budget=100, repeat_threshold=5)
+
+        records = await budget_warnings(app, "/repeat/5", caplog)
+
+        assert len(records) == 1
+        assert "possible N+1, 5 times: SELECT 1" in records[0].message
+
+    @pytest.mark.anyio
+    async def test_routes_without_budget_are_unchecked(self, engine, caplog):
+        """Without a route or default budget nothing is checked."""
+        app = queries_app(engine, route_budgets={"GET /distinct/{count}": 2})
+
+        assert await budget_warnings(app, "/repeat/20", caplog) == []
+
+    @pytest.mark.anyio
+    async def test_strict_raises(self, engine):
+        """In strict mode a request over budget raises."""
+        app = queries_app(engine, default_budget=1, strict=True)
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            with pytest.raises(QueryBudgetExceeded, match="GET /distinct"):
+                await client.get("/distinct/2")
+
+
+class TestInsightRouteBudgets:
+    """Statement counts of individual insight requests."""
+
+    async def _create(self, client, auth_headers) -> str:
+        response = await client.post(
+            INSIGHTS_ENDPOINT,
+            json={"title": "Budgeted", "description": "Counted statements"},
+            headers=auth_headers,
+        )
+        return response.json()["id"]
+
+    @pytest.mark.anyio
+    async def test_update_runs_user_lookup_and_one_update(
+        self, client, auth_headers
+    ):
+        """PUT is a user lookup, one UPDATE, two link loads and a version bump."""
+        insight_id = await self._create(client, auth_headers)
+        user_cache.clear()
+
+        with assert_max_queries(5) as tracker:
+            response = await client.put(
+                f"{INSIGHTS_ENDPOINT}/{insight_id}",
+                json={"title": "Renamed"},
+                headers=auth_headers,
+            )
+
+        assert response.status_code == 200
+        updates = [s for s in tracker.statements if s.startswith("UPDATE insights ")]
+        assert len(updates) == 1
+
+    @pytest.mark.anyio
+    async def test_get_runs_no_extra_lookups(self, client, auth_headers):
+        """GET by id loads the insight and its links, the user is cached."""
+        insight_id = await self._create(client, auth_headers)
+
+        with assert_max_queries(3):
+            response = await client.get(
+                f"{INSIGHTS_ENDPOINT}/{insight_id}", headers=auth_headers
+            )
+
+        assert response.status_code == 200
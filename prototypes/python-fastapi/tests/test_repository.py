@@ -0,0 +1,309 @@
+"""Tests for the in-memory insight repository."""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models import Insight, InsightFilters, Product, Source, Tag
+from app.repository import InsightRepository
+from app.search import InvertedIndex
+
+# Test constants
+TEST_DESCRIPTION = "Test description"
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def repository():
+    """Create an empty in-memory repository."""
+    return InsightRepository()
+
+
+def make_insight(
+    title: str, description: str = TEST_DESCRIPTION, **kwargs
+) -> Insight:
+    return Insight(
+        title=title, description=description, author_id=uuid.uuid4(), **kwargs
+    )
+
+
+class TestInsightRepositoryOrdering:
+    """Tests for the sorted index behind InsightRepository.get_all."""
+
+    def test_newest_first(self, repository):
+        """Insights are listed by created_at descending."""
+        for minutes in (5, 1, 3):
+            repository.create(
+                make_insight(
+                    f"At {minutes}", created_at=BASE_TIME + timedelta(minutes=minutes)
+                )
+            )
+
+        insights, total = repository.get_all()
+
+        assert total == 3
+        assert [i.title for i in insights] == ["At 5", "At 3", "At 1"]
+
+    def test_ties_are_broken_by_id(self, repository):
+        """Insights created at the same instant are ordered by id."""
+        for _ in range(3):
+            repository.create(make_insight("Same time", created_at=BASE_TIME))
+
+        insights, _ = repository.get_all()
+
+        assert [i.id for i in insights] == sorted(i.id for i in insights)
+
+    def test_offset_and_cursor_pages_agree(self, repository):
+        """Paging by offset and by keyset return the same second page."""
+        for minutes in range(5):
+            repository.create(
+                make_insight("Page", created_at=BASE_TIME + timedelta(minutes=minutes))
+            )
+        first_page, _ = repository.get_all(limit=2)
+        last = first_page[-1]
+
+        by_offset, _ = repository.get_all(limit=2, offset=2)
+        by_cursor, _ = repository.get_all(
+            limit=2, offset=99, after=(last.created_at, last.id)
+        )
+
+        assert by_cursor == by_offset
+
+    def test_naive_datetimes_are_treated_as_utc(self, repository):
+        """Naive and aware created_at values sort on one timeline."""
+        repository.create(make_insight("Naive", created_at=datetime(2024, 1, 2)))
+        repository.create(make_insight("Aware", created_at=BASE_TIME))
+
+        insights, _ = repository.get_all()
+
+        assert [i.title for i in insights] == ["Naive", "Aware"]
+
+    def test_delete_removes_from_order(self, repository):
+        """Deleted insights no longer appear in pages."""
+        kept = repository.create(make_insight("Kept"))
+        gone = repository.create(make_insight("Gone"))
+
+        repository.delete(gone.id)
+
+        assert repository.get_all() == ([kept], 1)
+
+    def test_update_keeps_position(self, repository):
+        """Updating an insight replaces it in place."""
+        insight = repository.create(make_insight("Before"))
+
+        repository.update(insight.id, title="After")
+
+        insights, total = repository.get_all()
+        assert total == 1
+        assert insights[0].title == "After"
+
+    def test_recreating_an_id_does_not_duplicate(self, repository):
+        """Creating an existing id replaces the previous entry."""
+        insight = make_insight("Once")
+        repository.create(insight)
+        repository.create(insight)
+
+        assert repository.get_all()[1] == 1
+
+
+class TestInsightRepositoryUpdate:
+    """Tests for InsightRepository.update."""
+
+    def test_update_replaces_tags(self, repository):
+        """Tag names become tags, normalised and shared by name."""
+        first = repository.create(make_insight("First"))
+        second = repository.create(make_insight("Second"))
+
+        updated = repository.update(first.id, tags=["Perf", "perf", " ux "])
+        other = repository.update(second.id, tags=["PERF"])
+
+        assert [tag.name for tag in updated.tags] == ["perf", "ux"]
+        assert other.tags[0].id == updated.tags[0].id
+
+    def test_update_without_tags_keeps_them(self, repository):
+        """Omitting tags, or passing product ids, leaves the tags alone."""
+        insight = repository.create(make_insight("Tagged"))
+        repository.update(insight.id, tags=["perf"])
+
+        updated = repository.update(
+            insight.id, title="Renamed", product_ids=[uuid.uuid4()]
+        )
+
+        assert updated.title == "Renamed"
+        assert [tag.name for tag in updated.tags] == ["perf"]
+
+
+class TestInvertedIndex:
+    """Tests for the BM25 inverted index."""
+
+    def test_every_term_must_match(self):
+        """Documents missing any query term are excluded."""
+        index = InvertedIndex()
+        index.add(1, "slow dashboard", "charts")
+        index.add(2, "dashboard", "colours")
+
+        ranked, total = index.search(["dashboard", "charts"])
+
+        assert total == 1
+        assert [doc_id for doc_id, _ in ranked] == [1]
+
+    def test_title_weight_ranks_title_matches_first(self):
+        """A title match outranks a description match."""
+        index = InvertedIndex()
+        index.add("description", "reports", "please add export")
+        index.add("title", "export missing", "users want it")
+
+        ranked, _ = index.search(["export"])
+
+        assert [doc_id for doc_id, _ in ranked] == ["title", "description"]
+
+    def test_rarer_terms_score_higher(self):
+        """Terms found in fewer documents contribute more to the score."""
+        index = InvertedIndex()
+        index.add(1, "common rare", "")
+        index.add(2, "common other", "")
+        index.add(3, "common other", "")
+
+        (rare_hit,), _ = index.search(["rare"])
+        common_hits, _ = index.search(["common"])
+
+        assert rare_hit[1] > max(score for _, score in common_hits)
+
+    def test_re_adding_replaces_document(self):
+        """Adding an existing id re-indexes it."""
+        index = InvertedIndex()
+        index.add(1, "old title", "")
+        index.add(1, "new title", "")
+
+        assert index.search(["old"]) == ([], 0)
+        assert index.search(["new"])[1] == 1
+        assert len(index) == 1
+
+    def test_remove_drops_postings(self):
+        """Removed documents no longer match."""
+        index = InvertedIndex()
+        index.add(1, "gone", "")
+        index.remove(1)
+        index.remove(1)
+
+        assert index.search(["gone"]) == ([], 0)
+        assert len(index) == 0
+
+    def test_pages_through_results(self):
+        """Limit and offset select a page of the ranking."""
+        index = InvertedIndex()
+        for doc_id in range(5):
+            index.add(doc_id, "match", "")
+
+        ranked, total = index.search(["match"], limit=2, offset=4)
+
+        assert total == 5
+        assert len(ranked) == 1
+
+    def test_pages_match_the_full_ranking(self):
+        """Pruned pages are slices of the exhaustive best-first ranking."""
+        index = InvertedIndex()
+        for doc_id in range(60):
+            filler = " ".join(["pad"] * (doc_id % 7))
+            index.add(doc_id, "match " * (1 + doc_id % 3), f"match {filler}")
+        index.remove(10)
+        index.add(11, "match match match", "")
+
+        full, total = index.search(["match"], limit=100)
+        pages = [
+            index.search(["match"], limit=7, offset=offset)[0]
+            for offset in range(0, total, 7)
+        ]
+
+        assert total == 59
+        assert [hit for page in pages for hit in page] == full
+        scores = [score for _, score in full]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_accept_narrows_matches_and_total(self):
+        """Only accepted documents are ranked and counted."""
+        index = InvertedIndex()
+        for doc_id in range(10):
+            index.add(doc_id, "match", "")
+
+        ranked, total = index.search(["match"], accept=lambda doc_id: doc_id % 2)
+
+        assert total == 5
+        assert sorted(doc_id for doc_id, _ in ranked) == [1, 3, 5, 7, 9]
+
+    def test_wrong_field_count_raises(self):
+        """Documents must supply one value per weighted field."""
+        with pytest.raises(ValueError):
+            InvertedIndex().add(1, "only title")
+
+
+class TestInsightRepositorySearch:
+    """Tests for InsightRepository.search."""
+
+    def test_search_returns_highlighted_hits(self, repository):
+        """Hits carry the insight, a score and highlights."""
+        insight = repository.create(make_insight("Login fails", "Login page hangs"))
+
+        hits, total = repository.search("login")
+
+        assert total == 1
+        assert hits[0].insight == insight
+        assert hits[0].score > 0
+        assert hits[0].title_highlight == "<mark>Login</mark> fails"
+        assert hits[0].snippet == "<mark>Login</mark> page hangs"
+
+    def test_update_reindexes(self, repository):
+        """Updated text is searchable and the old text is not."""
+        insight = repository.create(make_insight("Original wording"))
+
+        repository.update(insight.id, title="Revised wording")
+
+        assert repository.search("original") == ([], 0)
+        assert repository.search("revised")[1] == 1
+
+    def test_delete_and_clear_unindex(self, repository):
+        """Deleted and cleared insights drop out of the index."""
+        first = repository.create(make_insight("Alpha"))
+        repository.create(make_insight("Alpha again"))
+
+        repository.delete(first.id)
+        assert repository.search("alpha")[1] == 1
+
+        repository.clear()
+        assert repository.search("alpha") == ([], 0)
+
+    def test_without_total(self, repository):
+        """with_total=False returns None for the total."""
+        repository.create(make_insight("Alpha"))
+
+        hits, total = repository.search("alpha", with_total=False)
+
+        assert len(hits) == 1
+        assert total is None
+
+    def test_filters_narrow_results(self, repository):
+        """Source, product and tag filters apply before ranking."""
+        product = Product(name="Dashboard")
+        tag = Tag(name="ux")
+        wanted = repository.create(
+            make_insight(
+                "Export wanted",
+                source=Source.CONFERENCE,
+                products=[product],
+                tags=[tag],
+            )
+        )
+        repository.create(make_insight("Export too", source=Source.CONFERENCE))
+        repository.create(
+            make_insight("Export again", products=[product], tags=[tag])
+        )
+
+        hits, total = repository.search(
+            "export",
+            filters=InsightFilters(
+                source=Source.CONFERENCE, product_ids=(product.id,), tags=("UX",)
+            ),
+        )
+
+        assert total == 1
+        assert hits[0].insight == wanted
@@ -0,0 +1,132 @@
+"""Tests for the insight list response cache."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.query_budget import assert_max_queries
+from app.response_cache import insight_list_cache, mark_insights_changed
+
+# Test constants
+INSIGHTS_ENDPOINT = "/api/v1/insights"
+CACHED_BODY = b'{"items":[]}'
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start and end every test with an empty list cache."""
+    insight_list_cache.clear()
+    yield
+    insight_list_cache.clear()
+
+
+class TestCommitInvalidation:
+    """Tests for clearing the cache when insight writes commit."""
+
+    def test_commit_after_insight_write_clears(self, engine):
+        """A committed transaction that changed insights clears the cache."""
+        insight_list_cache.set("page", CACHED_BODY)
+        with Session(engine) as session:
+            mark_insights_changed(session)
+            assert insight_list_cache.get("page") == CACHED_BODY
+
+            session.commit()
+
+        assert len(insight_list_cache) == 0
+
+    def test_other_commits_keep_entries(self, engine):
+        """Commits that did not touch insights leave the cache alone."""
+        insight_list_cache.set("page", CACHED_BODY)
+        with Session(engine) as session:
+            session.commit()
+
+        assert insight_list_cache.get("page") == CACHED_BODY
+
+    def test_rollback_keeps_entries(self, engine):
+        """A rolled back write neither clears now nor on a later commit."""
+        insight_list_cache.set("page", CACHED_BODY)
+        with Session(engine) as session:
+            session.execute(text("SELECT 1"))
+            mark_insights_changed(session)
+            session.rollback()
+            session.commit()
+
+        assert insight_list_cache.get("page") == CACHED_BODY
+
+
+async def _create(client, auth_headers, title="Cached insight") -> str:
+    response = await client.post(
+        INSIGHTS_ENDPOINT,
+        json={"title": title, "description": "Listed from the cache"},
+        headers=auth_headers,
+    )
+    return response.json()["id"]
+
+
+class TestListInsightsCache:
+    """Tests for caching GET /api/v1/insights pages."""
+
+    @pytest.mark.anyio
+    async def test_repeated_page_is_served_from_cache(self, client, auth_headers):
+        """The second request reads only the collection version."""
+        await _create(client, auth_headers)
+        first = await client.get(INSIGHTS_ENDPOINT, headers=auth_headers)
+        hits = insight_list_cache.stats().hits
+
+        with assert_max_queries(1):
+            second = await client.get(INSIGHTS_ENDPOINT, headers=auth_headers)
+
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert second.headers["etag"] == first.headers["etag"]
+        assert second.headers["content-type"] == "application/json"
+        assert insight_list_cache.stats().hits == hits + 1
+
+    @pytest.mark.anyio
+    async def test_query_parameters_are_part_of_the_key(self, client, auth_headers):
+        """Different limits, offsets and filters are cached separately."""
+        await _create(client, auth_headers)
+        hits = insight_list_cache.stats().hits
+
+        for params in ({}, {"limit": 1}, {"offset": 1}, {"tag": "perf"}):
+            await client.get(INSIGHTS_ENDPOINT, params=params, headers=auth_headers)
+
+        assert len(insight_list_cache) == 4
+        assert insight_list_cache.stats().hits == hits
+
+    @pytest.mark.anyio
+    async def test_writes_invalidate(self, client, auth_headers):
+        """Create, update and delete each show up on the next read."""
+        insight_id = await _create(client, auth_headers)
+        url = f"{INSIGHTS_ENDPOINT}/{insight_id}"
+
+        async def titles():
+            response = await client.get(INSIGHTS_ENDPOINT, headers=auth_headers)
+            return [item["title"] for item in response.json()["items"]]
+
+        assert await titles() == ["Cached insight"]
+        await client.put(url, json={"title": "Renamed"}, headers=auth_headers)
+        assert await titles() == ["Renamed"]
+        await _create(client, auth_headers, title="Second")
+        assert await titles() == ["Second", "Renamed"]
+        await client.delete(url, headers=auth_headers)
+        assert await titles() == ["Second"]
+
+    @pytest.mark.anyio
+    async def test_search_is_not_cached(self, client, auth_headers):
+        """Full-text search results bypass the cache."""
+        await _create(client, auth_headers)
+
+        await client.get(
+            INSIGHTS_ENDPOINT, params={"q": "cached"}, headers=auth_headers
+        )
+
+        assert len(insight_list_cache) == 0
+
+    @pytest.mark.anyio
+    async def test_memory_use_is_tracked(self, client, auth_headers):
+        """The cache reports the size of the bodies it holds."""
+        await _create(client, auth_headers)
+
+        response = await client.get(INSIGHTS_ENDPOINT, headers=auth_headers)
+
+        assert insight_list_cache.stats().bytes == len(response.content)
@@ -0,0 +1,160 @@
+"""Tests for primary/replica session routing.
+
+The replica is a second SQLite file that only sees the primary's rows when
+replicate() copies them over, which stands in for replication lag.
+"""
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database import Base
+from app.db_repository import AsyncInsightDBRepository, InsightDBRepository
+from app.models import Insight
+from app.routing import RoutingSession, replica_reads
+
+# Test constants
+TEST_DESCRIPTION = "Test description"
+
+
+@pytest.fixture
+def primary(tmp_path):
+    """Primary database engine."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def replica(tmp_path, primary):
+    """Replica database engine, starting as a copy of the empty primary."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    replicate(primary, engine)
+    yield engine
+    engine.dispose()
+
+
+def replicate(primary, replica):
+    """Bring the replica up to date with the primary."""
+    source = primary.raw_connection()
+    target = replica.raw_connection()
+    try:
+        source.driver_connection.backup(target.driver_connection)
+    finally:
+        source.close()
+        target.close()
+
+
+def _new_insight(title="Routed insight"):
+    return Insight(title=title, description=TEST_DESCRIPTION, author_id=uuid.uuid4())
+
+
+def _engines_used(*engines):
+    """Record which engine runs each statement."""
+    used = []
+    for engine in engines:
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda conn, *args, engine=engine: used.append(engine),
+        )
+    return used
+
+
+class TestRoutingSession:
+    """Tests for RoutingSession and replica_reads."""
+
+    def test_reads_use_lagging_replica(self, primary, replica):
+        """A fresh session reads from the replica, which lags until replicated."""
+        with RoutingSession(bind=primary, replica_bind=replica) as session:
+            created = InsightDBRepository(session).create(_new_insight())
+
+        with RoutingSession(bind=primary, replica_bind=replica) as session:
+            repository = InsightDBRepository(session)
+            assert repository.get_by_id(created.id) is None
+            assert repository.get_all()[1] == 0
+
+        replicate(primary, replica)
+        with RoutingSession(bind=primary, replica_bind=replica) as session:
+            repository = InsightDBRepository(session)
+            assert repository.get_by_id(created.id).title == "Routed insight"
+            assert repository.get_all()[1] == 1
+
+    def test_writes_go_to_primary(self, primary, replica):
+        """Inserts never touch the replica."""
+        used = _engines_used(primary, replica)
+
+        with RoutingSession(bind=primary, replica_bind=replica) as session:
+            InsightDBRepository(session).create(_new_insight())
+
+        assert replica not in used
+        with replica.connect() as conn:
+            assert conn.scalar(text("SELECT COUNT(*) FROM insights")) == 0
+
+    def test_session_sticks_to_primary_after_write(self, primary, replica):
+        """After writing, the same session reads its own writes."""
+        with RoutingSession(bind=primary, replica_bind=replica) as session:
+            repository = InsightDBRepository(session)
+            assert session.reads_from_replica
+            created = repository.create(_new_insight())
+
+            assert not session.reads_from_replica
+            assert repository.get_by_id(created.id) is not None
+
+    def test_bulk_writes_also_stick(self, primary, replica):
+        """Core INSERT/UPDATE statements count as writes, not just flushes."""
+        with RoutingSession(bind=primary, replica_bind=replica) as session:
+            InsightDBRepository(session).create_many([(_new_insight(), [], [])])
+
+            assert not session.reads_from_replica
+
+    def test_unmarked_reads_use_primary(self, primary, replica):
+        """Only reads inside replica_reads() may use the replica."""
+        used = _engines_used(primary, replica)
+
+        with RoutingSession(bind=primary, replica_bind=replica) as session:
+            session.execute(text("SELECT 1"))
+            with replica_reads(session):
+                session.execute(text("SELECT 1"))
+
+        assert used == [primary, primary]
+
+    def test_without_replica_everything_uses_primary(self, primary):
+        """A RoutingSession without a replica is a plain session."""
+        with RoutingSession(bind=primary) as session:
+            repository = InsightDBRepository(session)
+            created = repository.create(_new_insight())
+
+            assert repository.get_by_id(created.id) is not None
+
+    async def test_async_session_routes_reads(self, primary, replica, tmp_path):
+        """AsyncSession with RoutingSession as its sync class routes reads too."""
+        async_primary = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}"
+        )
+        async_replica = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"
+        )
+
+        def session():
+            return AsyncSession(
+                async_primary,
+                sync_session_class=RoutingSession,
+                replica_bind=async_replica,
+                expire_on_commit=False,
+            )
+
+        async with session() as writer:
+            created = await AsyncInsightDBRepository(writer).create(_new_insight())
+        async with session() as reader:
+            lagging = await AsyncInsightDBRepository(reader).get_by_id(created.id)
+        replicate(primary, replica)
+        async with session() as reader:
+            caught_up = await AsyncInsightDBRepository(reader).get_by_id(created.id)
+
+        assert lagging is None
+        assert caught_up is not None
+        await async_primary.dispose()
+        await async_replica.dispose()
@@ -0,0 +1,49 @@
+"""Tests for full-text search helpers."""
+from app.search import ELLIPSIS, highlight, match_expression, search_terms, snippet
+
+
+class TestSearchTerms:
+    """Tests for query parsing."""
+
+    def test_splits_into_lower_case_words(self):
+        """Queries are split on anything that is not a word character."""
+        assert search_terms("Slow, DASHBOARD-load!") == ["slow", "dashboard", "load"]
+
+    def test_match_expression_quotes_every_term(self):
+        """Each term is quoted so FTS5 treats it literally."""
+        assert match_expression(["near", "or"]) == '"near" "or"'
+
+
+class TestHighlight:
+    """Tests for Python-side highlighting."""
+
+    def test_wraps_whole_words_case_insensitively(self):
+        """Whole-word matches are marked, partial words are not."""
+        assert (
+            highlight("Export exports EXPORT", ["export"])
+            == "<mark>Export</mark> exports <mark>EXPORT</mark>"
+        )
+
+    def test_no_terms_returns_text_unchanged(self):
+        """Without terms the text is returned as-is."""
+        assert highlight("Plain text", []) == "Plain text"
+
+
+class TestSnippet:
+    """Tests for snippet extraction."""
+
+    def test_short_text_is_returned_whole(self):
+        """Text within the word limit is only highlighted."""
+        assert snippet("a short note", ["short"]) == "a <mark>short</mark> note"
+
+    def test_long_text_is_windowed_around_first_match(self):
+        """Long text is cut to a window containing the first match."""
+        words = [f"w{i}" for i in range(100)]
+        words[60] = "needle"
+
+        result = snippet(" ".join(words), ["needle"], max_words=10)
+
+        assert result.startswith(ELLIPSIS)
+        assert result.endswith(ELLIPSIS)
+        assert "<mark>needle</mark>" in result
+        assert len(result.strip(ELLIPSIS).split()) == 10
@@ -1,16 +1,23 @@
 """Tests for security utilities - TDD: write tests first."""
+import asyncio
+import threading
 from datetime import timedelta
 
 import pytest
 from jose import jwt
 
+from app import security
 from app.security import (
     ALGORITHM,
     SECRET_KEY,
+    PasswordHashPool,
     create_access_token,
     decode_token,
     get_password_hash,
+    get_password_hash_async,
+    token_cache,
     verify_password,
+    verify_password_async,
 )
 
 
@@ -51,6 +58,104 @@ class TestPasswordHashing:
         assert verify_password(password, hash2) is True
 
 
+class TestPasswordHashPool:
+    """Tests for hashing passwords off the event loop."""
+
+    async def test_verify_password_async(self):
+        """Async verify agrees with the synchronous version."""
+        hashed = await get_password_hash_async("mysecretpassword")
+
+        assert await verify_password_async("mysecretpassword", hashed) is True
+        assert await verify_password_async("wrongpassword", hashed) is False
+
+    async def test_runs_on_worker_thread(self):
+        """Work runs on a pool thread, not the event loop thread."""
+        pool = PasswordHashPool(max_workers=1)
+
+        thread_name = await pool.run(lambda: threading.current_thread().name)
+        pool.shutdown()
+
+        assert thread_name.startswith("bcrypt")
+
+    async def test_concurrency_limit_queues_excess_work(self):
+        """Work beyond max_workers waits and is reported as queued."""
+        pool = PasswordHashPool(max_workers=1)
+        release = threading.Event()
+
+        tasks = [
+            asyncio.ensure_future(pool.run(release.wait)) for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        stats = pool.stats()
+        release.set()
+        await asyncio.gather(*tasks)
+        pool.shutdown()
+
+        assert stats.running == 1
+        assert stats.queued == 2
+        assert pool.stats().completed == 3
+        assert pool.stats().queued == 0
+
+    async def test_cancelled_queued_work_leaves_queue(self):
+        """Cancelling work that has not started removes it from the queue."""
+        pool = PasswordHashPool(max_workers=1)
+        release = threading.Event()
+        calls = []
+
+        running = asyncio.ensure_future(pool.run(release.wait))
+        waiting = asyncio.ensure_future(pool.run(calls.append, "ran"))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        await asyncio.sleep(0)
+        stats = pool.stats()
+        release.set()
+        await running
+        pool.shutdown()
+
+        assert stats.queued == 0
+        assert stats.running == 1
+        assert calls == []
+        assert pool.stats().completed == 1
+
+    async def test_configure_changes_limit(self):
+        """configure() replaces the pool with one of the new size."""
+        pool = PasswordHashPool(max_workers=1)
+        release = threading.Event()
+
+        pool.configure(2)
+        tasks = [
+            asyncio.ensure_future(pool.run(release.wait)) for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        stats = pool.stats()
+        release.set()
+        await asyncio.gather(*tasks)
+        pool.shutdown()
+
+        assert (stats.running, stats.queued) == (2, 1)
+
+    async def test_event_loop_stays_responsive(self):
+        """Other coroutines progress while a hash is running."""
+        pool = PasswordHashPool(max_workers=1)
+        release = threading.Event()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while not release.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.ensure_future(ticker())
+        work = asyncio.ensure_future(pool.run(release.wait, 0.2))
+        await work
+        release.set()
+        await ticker_task
+        pool.shutdown()
+
+        assert ticks > 5
+
+
 class TestJWTTokens:
     """Tests for JWT token utilities."""
 
@@ -108,3 +213,70 @@ class TestJWTTokens:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
 
         assert "exp" in payload
+
+
+class TestTokenCache:
+    """Tests for memoized JWT verification."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        token_cache.clear()
+        yield
+        token_cache.clear()
+
+    @pytest.fixture
+    def decode_calls(self, monkeypatch):
+        """Count calls that reach python-jose."""
+        calls = []
+        real_decode = jwt.decode
+
+        def counting_decode(*args, **kwargs):
+            calls.append(args[0])
+            return real_decode(*args, **kwargs)
+
+        monkeypatch.setattr(security.jwt, "decode", counting_decode)
+        return calls
+
+    def test_repeat_decode_is_served_from_cache(self, decode_calls):
+        """The same token is verified once."""
+        token = create_access_token(data={"sub": "test@example.com"})
+
+        first = decode_token(token)
+        second = decode_token(token)
+
+        assert first == second
+        assert len(decode_calls) == 1
+
+    def test_cache_can_be_bypassed(self, decode_calls):
+        """use_cache=False always verifies."""
+        token = create_access_token(data={"sub": "test@example.com"})
+
+        decode_token(token, use_cache=False)
+        decode_token(token, use_cache=False)
+
+        assert len(decode_calls) == 2
+        assert len(token_cache) == 0
+
+    def test_cached_claims_are_copies(self):
+        """Mutating returned claims does not alter the cache."""
+        token = create_access_token(data={"sub": "test@example.com"})
+
+        decode_token(token)["sub"] = "mallory@example.com"
+
+        assert decode_token(token)["sub"] == "test@example.com"
+
+    def test_token_without_exp_is_not_cached(self, decode_calls):
+        """Tokens without exp are verified every time."""
+        token = jwt.encode({"sub": "test@example.com"}, SECRET_KEY, ALGORITHM)
+
+        decode_token(token)
+        decode_token(token)
+
+        assert len(decode_calls) == 2
+
+    def test_invalid_token_is_not_cached(self):
+        """Failed verification leaves nothing behind."""
+        with pytest.raises(Exception):
+            decode_token("invalid.token.here")
+
+        assert len(token_cache) == 0
@@ -3,13 +3,15 @@ import uuid
 
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 
 from app.database import Base
 from app.db_models import UserDB
 from app.models import Role, User
 from app.security import get_password_hash
-from app.user_repository import UserDBRepository
+from app.user_repository import AsyncUserDBRepository, UserDBRepository
 
 # Test constants
 TEST_EMAIL = "test@example.com"
@@ -133,3 +135,47 @@ class TestUserDBRepository:
         assert user is not None
         assert hashed_password is not None
         assert len(hashed_password) > 0
+
+
+class TestAsyncUserDBRepository:
+    """Tests for the async user repository."""
+
+    @pytest.fixture
+    async def async_repository(self):
+        """Create an async repository seeded with the test user."""
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add(
+                UserDB(
+                    id=uuid.uuid4(),
+                    email=TEST_EMAIL,
+                    name=TEST_NAME,
+                    hashed_password=get_password_hash(TEST_PASSWORD),
+                    role="advocate",
+                )
+            )
+            await session.commit()
+            yield AsyncUserDBRepository(session)
+        await engine.dispose()
+
+    async def test_get_by_email(self, async_repository):
+        """Returns user when email exists."""
+        user = await async_repository.get_by_email(TEST_EMAIL)
+
+        assert user is not None
+        assert user.name == TEST_NAME
+
+    async def test_get_by_id_not_found(self, async_repository):
+        """Returns None when ID doesn't exist."""
+        assert await async_repository.get_by_id(uuid.uuid4()) is None
+
+    async def test_get_by_email_with_password(self, async_repository):
+        """Returns the user together with the stored hash."""
+        user, hashed_password = await async_repository.get_by_email_with_password(
+            TEST_EMAIL
+        )
+
+        assert user is not None
+        assert hashed_password
@@ -1,8 +1,14 @@
 """Tests for user endpoints - TDD: write tests first."""
 import pytest
+from sqlalchemy.orm import Session
+
+from app.db_models import UserDB
+from app.user_repository import user_cache
 
 # Test constants
 USERS_ME_ENDPOINT = "/api/v1/users/me"
+# Stands in for a cached User; only its presence matters
+CACHED_USER = "cached user"
 
 
 class TestGetCurrentUser:
@@ -39,3 +45,74 @@ class TestGetCurrentUser:
         )
 
         assert response.status_code == 401
+
+
+class TestCurrentUserCache:
+    """Tests for caching the authenticated user."""
+
+    @pytest.mark.anyio
+    async def test_repeat_requests_hit_cache(self, client, auth_headers):
+        """Only the first request for a user reaches the database."""
+        before = user_cache.stats()
+
+        for _ in range(3):
+            response = await client.get(USERS_ME_ENDPOINT, headers=auth_headers)
+            assert response.status_code == 200
+
+        after = user_cache.stats()
+        assert after.misses - before.misses == 1
+        assert after.hits - before.hits == 2
+
+    @pytest.mark.anyio
+    async def test_user_change_invalidates_cache(
+        self, client, auth_headers, test_user, engine
+    ):
+        """Updating a user is visible on the next request."""
+        await client.get(USERS_ME_ENDPOINT, headers=auth_headers)
+
+        with Session(engine) as session:
+            db_user = session.get(UserDB, str(test_user["id"]))
+            db_user.name = "Renamed User"
+            session.commit()
+
+        response = await client.get(USERS_ME_ENDPOINT, headers=auth_headers)
+
+        assert response.json()["name"] == "Renamed User"
+
+    def test_cache_is_evicted_on_commit_not_flush(self, test_user, engine):
+        """A flushed change only evicts the user once it commits."""
+        email = test_user["email"]
+        user_cache.set(email, CACHED_USER)
+
+        with Session(engine) as session:
+            session.get(UserDB, str(test_user["id"])).name = "Renamed User"
+            session.flush()
+            assert user_cache.get(email) == CACHED_USER
+
+            session.commit()
+
+        assert user_cache.get(email) is None
+
+    def test_rolled_back_change_keeps_cache(self, test_user, engine):
+        """A rolled back change neither evicts now nor on a later commit."""
+        email = test_user["email"]
+        user_cache.set(email, CACHED_USER)
+
+        with Session(engine) as session:
+            session.get(UserDB, str(test_user["id"])).name = "Renamed User"
+            session.flush()
+            session.rollback()
+            session.commit()
+
+        assert user_cache.get(email) == CACHED_USER
+
+    def test_email_change_evicts_old_email(self, test_user, engine):
+        """Changing the email evicts the user cached under the old one."""
+        email = test_user["email"]
+        user_cache.set(email, CACHED_USER)
+
+        with Session(engine) as session:
+            session.get(UserDB, str(test_user["id"])).email = "new@example.com"
+            session.commit()
+
+        assert user_cache.get(email) is None